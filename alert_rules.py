@@ -0,0 +1,166 @@
+#! python3
+import threading
+import operator
+import json
+import os
+import time
+import logging
+import numpy as np
+from rich import print
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+# Standing alert rules. 1 rule = name + list of (column, op, value) conditions, ANDed.
+# Columns are the combo_state.symbol_frame() columns: Co_name, Cur_price, Prc_change, Pct_change, Mkt_cap,
+# M_B, Hot & in_<source> (True if the symbol is in that source now)
+
+ops = { '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq, '!=': operator.ne,
+        'in': lambda col, v: col.isin(v), 'not in': lambda col, v: ~col.isin(v) }
+
+default_rules = [
+    { 'name': 'uvol_small_cap_under_10', 'when': [ ('in_uvol_up', '==', True), ('in_small_caps_top10', '==', True),
+                                                   ('Pct_change', '>', 5.0), ('Cur_price', '<', 10.0) ] },
+    { 'name': 'new_hot', 'when': [ ('Hot', '==', "*Hot*") ] },
+    ]
+
+def compile_rule(when):
+    """Conditions -> predicate(df) returning a bool numpy mask (1 vectorized compare per condition)"""
+    conds = []
+    for col, op, value in when:
+        if op not in ops:
+            raise ValueError(f"alert_rules: unknown op: {op!r} (use one of {list(ops)})")
+        conds.append((col, ops[op], value))
+    def predicate(df):
+        mask = np.ones(len(df), dtype=bool)
+        for col, fn, value in conds:
+            if col not in df.columns:
+                raise ValueError(f"alert_rules: unknown column: {col!r}")
+            mask &= fn(df[col], value).fillna(False).to_numpy(dtype=bool)
+        return mask
+    return predicate
+
+#####################################################
+
+class alert_rules:
+    """
+    Standing alert rules over the combo data (combo_state), evaluated incrementally.
+    - Rules are compiled once into vectorized predicates
+    - Each cycle only the symbols in the change capture deltas are evaluated, not the whole universe
+    - Edge triggered: a rule fires when a symbol starts matching. It re-arms when the symbol stops matching
+      (or drops out) & a re-fire inside the cooldown is suppressed (de-dupe of flapping symbols)
+    - Fired alerts are appended to a local JSON lines log (~/.aop/alerts.jsonl)
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    log_path = os.path.join(os.path.expanduser("~"), ".aop", "alerts.jsonl")
+    cooldown = 900          # secs. Same rule + symbol wont fire again inside this
+    rules = {}              # { name: predicate }
+    active = {}             # { name: set of symbols matching now }
+    last_fired = {}         # { (name, symbol): time fired }
+
+    def __init__(self, yti, state, rules=None, log_path=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.state = state              # combo_state
+        if log_path is not None:
+            self.log_path = log_path
+        self.lock = threading.Lock()
+        self.rules = {}
+        self.active = {}
+        self.last_fired = {}
+        self.fired = []                 # alerts fired this session (newest last)
+        self.stats = { 'evals': 0, 'rows': 0, 'fired': 0, 'suppressed': 0 }
+        for r in (default_rules if rules is None else rules):
+            self.add_rule(r['name'], r['when'])
+        return
+
+######################################################################
+# method 1
+    def add_rule(self, name, when):
+        self.rules[name] = compile_rule(when)
+        self.active[name] = set()
+        return
+
+######################################################################
+# method 2
+    def load_rules(self, path):
+        """Replace the rules with a JSON file: [ { "name": ..., "when": [ [ col, op, value ], ... ] } ]"""
+        with open(path) as f:
+            rules = json.load(f)
+        self.rules = {}
+        self.active = {}
+        for r in rules:
+            self.add_rule(r['name'], [ tuple(c) for c in r['when'] ])
+        return len(self.rules)
+
+######################################################################
+# method 3
+    def on_delta(self, delta):
+        """cdc_stream subscriber (subscribe after combo_state, so the state already holds the change). Returns the alerts fired"""
+        if delta.source not in self.state.sources:
+            return []
+        return self.evaluate(delta.symbols())
+
+######################################################################
+# method 4
+    def evaluate(self, symbols, now=None):
+        """Evaluate every rule on these symbols only. Returns the alerts fired"""
+        cmi_debug = __name__+"::"+self.evaluate.__name__+".#"+str(self.yti)
+        now = time.time() if now is None else now
+        df = self.state.symbol_frame(symbols)
+        gone = set(symbols) - set(df.index)             # dropped out of every source
+        new_alerts = []
+        with self.lock:
+            self.stats['evals'] += 1
+            self.stats['rows'] += len(df)
+            for name, predicate in self.rules.items():
+                mask = predicate(df) if len(df) else np.zeros(0, dtype=bool)
+                hits = set(df.index[mask])
+                misses = (set(df.index) - hits) | gone
+                was = self.active[name]
+                for sym in sorted(hits - was):          # rising edge
+                    last = self.last_fired.get((name, sym))
+                    if last is not None and now - last < self.cooldown:
+                        self.stats['suppressed'] += 1
+                        continue
+                    self.last_fired[(name, sym)] = now
+                    new_alerts.append(self.alert(name, sym, df.loc[sym], now))
+                self.active[name] = (was | hits) - misses
+            self.fired.extend(new_alerts)
+            self.stats['fired'] += len(new_alerts)
+        if new_alerts:
+            self.write_log(new_alerts)
+            logging.info( f'%s - {len(new_alerts)} alerts fired' % cmi_debug )
+        return new_alerts
+
+######################################################################
+# method 5
+    def print_stats(self):
+        s = self.stats
+        print ( f"========== Alerts / {len(self.rules)} rules / log: {self.log_path} ==========" )
+        print ( f"Evaluations: {s['evals']} / rows evaluated: {s['rows']} / fired: {s['fired']} / suppressed: {s['suppressed']}" )
+        return
+
+######################################################################
+# private helpers
+
+    def alert(self, name, sym, row, now):
+        vals = { k: (v.item() if hasattr(v, 'item') else v) for k, v in row.items() if not k.startswith('in_') }
+        vals = { k: (None if isinstance(v, float) and v != v else v) for k, v in vals.items() }    # NaN -> null
+        return { 'ts': now, 'rule': name, 'symbol': sym,
+                 'sources': [ s for s in self.state.sources if row['in_' + s] ], 'values': vals }
+
+    def write_log(self, alerts):
+        cmi_debug = __name__+"::"+self.write_log.__name__+".#"+str(self.yti)
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a") as f:
+                for a in alerts:
+                    f.write(json.dumps(a, default=str) + "\n")
+        except OSError as e:
+            logging.info( f'%s - cant write alert log: {e}' % cmi_debug )
+        return
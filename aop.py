@@ -19,6 +19,12 @@ from y_smallcaps import smallcap_screen
 from nasdaq_uvoljs import un_volumes
 from nasdaq_quotes import nquote
 from shallow_logic import combo_logic
+from deep_logic import deep_logic
+from rank_engine import rank_engine
+from screen_query import screen_query
+from combo_schema import display_df
+from aop_daemon import aop_daemon
+from market_calendar import get_market_calendar
 from bigcharts_md import bc_quote
 from ml_urlhinter import url_hinter
 from ml_nlpreader import ml_nlpreader
@@ -27,6 +33,14 @@ from nasdaq_wrangler import nq_wrangler
 from y_cookiemonster import y_cookiemonster
 from ml_sentiment import ml_sentiment
 from db_graph import db_graph
+from render_pool import get_render_pool
+from net_fetcher import get_fetcher
+from page_archive import page_archive
+from snapshot_store import get_snapshot_store
+from cdc_stream import get_cdc_stream
+from nasdaq_aclient import get_nasdaq_client
+from html_backend import get_html_backend
+from parse_pool import get_parse_pool
 
 # Globals
 work_inst = 0
@@ -45,9 +59,20 @@ parser.add_argument('-t','--tops', help='show top ganers/losers', action='store_
 parser.add_argument('-u','--unusual', help='unusual up & down volume', action='store_true', dest='bool_uvol', required=False, default=False)
 parser.add_argument('-v','--verbose', help='verbose error logging', action='store_true', dest='bool_verbose', required=False, default=False)
 parser.add_argument('-x','--xray', help='dump detailed debug data structures', action='store_true', dest='bool_xray', required=False, default=False)
+parser.add_argument('--alerts', help='daemon alert rules JSON file (default: built-in rules)', action='store', dest='alert_rules', required=False, default=False)
+parser.add_argument('--archive', help='raw page archive dir (default ~/.aop/archive)', action='store', dest='archive_dir', required=False, default=False)
+parser.add_argument('--daemon', help='long running mode. Every collector runs on its own schedule', action='store_true', dest='bool_daemon', required=False, default=False)
+parser.add_argument('--deadline', help='run deadline budget (secs). Fetches past it are cancelled', action='store', dest='deadline', type=float, required=False, default=None)
+parser.add_argument('--query', help='screen expression. Runs on the deep list (-d) or on today\'s snapshots', action='store', dest='screen_query', required=False, default=False)
+parser.add_argument('--parser', help='HTML parser backend: lxml (default) | html.parser', action='store', dest='html_parser', required=False, default=None)
+parser.add_argument('--window', help='10x10x60 history window (cycles kept per symbol)', action='store', dest='ts_window', type=int, required=False, default=60)
+parser.add_argument('--snapshots', help='Parquet snapshot history dir (default ~/.aop/snapshots)', action='store', dest='snap_dir', required=False, default=False)
+parser.add_argument('--replay', help='offline replay. Serve pages from archive dir, NO network', action='store', dest='replay_dir', required=False, default=False)
 
 # Threading globals
 extract_done = threading.Event()
+tenten60_cycles = 4     # bkgrnd_worker() refetch cycles
+tenten60_pause = 30     # secs between cycles. Set by main() from the market calendar (slower outside market hours)
 yti = 1
 uh = url_hinter(1, args)        # anyone needs to be able to get hints on a URL from anywhere
 
@@ -84,15 +109,20 @@ def bkgrnd_worker():
     global work_inst
     logging.info('main::bkgrnd_worker() IN Thread - bkgrnd_worker()' )
     logging.info('main::bkgrnd_worker() Ref -> inst #: %s' % work_inst.yti )
-    for r in range(4):
-        logging.info('main::bkgrnd_worker():: Loop: %s' % r )
-        time.sleep(30)    # wait immediatley to let remote update
-        work_inst.build_tg_df0()
-        work_inst.build_top10()
-        work_inst.build_tenten60(r)
-
-    logging.info('main::bkgrnd_worker() EMIT exit trigger' )
-    extract_done.set()
+    try:
+        for r in range(tenten60_cycles):
+            logging.info('main::bkgrnd_worker():: Loop: %s' % r )
+            time.sleep(tenten60_pause)      # wait to let remote update
+            work_inst.ext_req = y_cookiemonster(3).get_html_data('finance.yahoo.com/markets/stocks/most-active/')   # live refetch each cycle
+            work_inst.ext_get_data(2, js_render="auto")
+            work_inst.build_tg_df0()
+            work_inst.build_top10()
+            work_inst.build_tenten60(r)
+    except Exception as e:              # deadline_exceeded, network errors... keep the cycles done so far
+        logging.warning( f'main::bkgrnd_worker() - cycle failed / stopping early: {type(e).__name__}: {e}' )
+    finally:
+        logging.info('main::bkgrnd_worker() EMIT exit trigger' )
+        extract_done.set()              # allways. main() waits on it
     logging.info('main::bkgrnd_worker() EXIT thread inst #: %s' % work_inst.yti )
     return      # dont know if this this requireed or good semantics?
 
@@ -113,6 +143,27 @@ def main():
     else:
         logging.disable(20)                 # Log lvel = INFO
 
+    if args['replay_dir'] is not False:     # Offline replay. Every collector is served from the archive
+        print ( f"REPLAY mode / offline from archive: {args['replay_dir']}" )
+        get_fetcher().set_archive(page_archive(1, args['replay_dir']), replay=True)
+        get_snapshot_store().set_dir(enabled=False)      # replayed pages are not new history
+    else:                                   # Live. Record every raw page body into the archive
+        get_fetcher().set_archive(page_archive(1, args['archive_dir'] or None))
+        get_snapshot_store().set_dir(args['snap_dir'] or None)
+    if args['html_parser'] is not None:
+        get_html_backend().set_parser(args['html_parser'])
+
+    if args['bool_daemon'] is True:         # long running. --deadline = how long the daemon runs (None = until Ctrl-C)
+        get_parse_pool().start()            # fork the parse workers before any fetch threads start
+        daemon = aop_daemon(1, args)
+        daemon.setup()
+        daemon.run(args['deadline'])
+        service_stats()
+        return
+
+    policy = get_fetcher().policy
+    policy.set_run_deadline(args['deadline'])       # None = no run deadline (stage budgets still apply)
+
     if args['newsymbol'] is not False:
         print ( " " )
         print ( f"Scanning news for symbol: {args['newsymbol']}" )
@@ -124,34 +175,36 @@ def main():
 ########### 1 - TOP GAINERS ################
     if args['bool_tops'] is True:
         print ( "========== Large Cap / Top Gainers ===============================" )
-        ## new JS data extractor
-        tg_url_reader = y_cookiemonster(1)         # instantiate class of cookiemonster
-        mlx_top_dataset = y_topgainers(1)          # instantiate class
-        mlx_top_dataset.init_dummy_session(1)      # setup cookie jar and headers
+        with policy.stage("tops"):
+            ## new JS data extractor
+            tg_url_reader = y_cookiemonster(1)         # instantiate class of cookiemonster
+            mlx_top_dataset = y_topgainers(1)          # instantiate class
+            mlx_top_dataset.init_dummy_session(1)      # setup cookie jar and headers
  
-        #mlx_top_dataset.ext_req = topgainer_reader.get_js_data('finance.yahoo.com/markets/stocks/most-active/')
-        mlx_top_dataset.ext_req = tg_url_reader.get_html_data('finance.yahoo.com/markets/stocks/most-active/')
-        mlx_top_dataset.ext_get_data(1, js_render=False)
+            #mlx_top_dataset.ext_req = topgainer_reader.get_js_data('finance.yahoo.com/markets/stocks/most-active/')
+            mlx_top_dataset.ext_req = tg_url_reader.get_html_data('finance.yahoo.com/markets/stocks/most-active/')
+            mlx_top_dataset.ext_get_data(1, js_render="auto")     # JS render only if <tbody> is missing (learned per URL)
 
-        x = mlx_top_dataset.build_tg_df0()     # build full dataframe
-        mlx_top_dataset.build_top10()          # show top 10
-        mlx_top_dataset.print_top10()          # print it
-        print ( " " )
+            x = mlx_top_dataset.build_tg_df0()     # build full dataframe
+            mlx_top_dataset.build_top10()          # show top 10
+            mlx_top_dataset.print_top10()          # print it
+            print ( " " )
 
 ########### 2 - TOP LOSERS ################
         print ( "========== Large Cap / Top Loosers ================================" )
-        ## new JS data extractor
-        tl_url_reader = y_cookiemonster(2)         # instantiate class of cookiemonster
-        mlx_loser_dataset = y_daylosers(1)         # instantiate class
-        mlx_loser_dataset.init_dummy_session(1)     # setup cookie jar and headers
+        with policy.stage("losers"):
+            ## new JS data extractor
+            tl_url_reader = y_cookiemonster(2)         # instantiate class of cookiemonster
+            mlx_loser_dataset = y_daylosers(1)         # instantiate class
+            mlx_loser_dataset.init_dummy_session(1)     # setup cookie jar and headers
  
-        mlx_loser_dataset.ext_req = tl_url_reader.get_js_data('finance.yahoo.com/markets/stocks/losers/')
-        mlx_loser_dataset.ext_get_data(1, js_render=False)
+            mlx_loser_dataset.ext_req = tl_url_reader.get_js_data('finance.yahoo.com/markets/stocks/losers/')
+            mlx_loser_dataset.ext_get_data(1, js_render="auto")   # JS render only if <tbody> is missing (learned per URL)
 
-        x = mlx_loser_dataset.build_tl_df0()     # build full dataframe
-        mlx_loser_dataset.build_top10()          # show top 10
-        mlx_loser_dataset.print_top10()          # print it
-        print ( " " )
+            x = mlx_loser_dataset.build_tl_df0()     # build full dataframe
+            mlx_loser_dataset.build_top10()          # show top 10
+            mlx_loser_dataset.print_top10()          # print it
+            print ( " " )
 
 ########### 3 10x10x60 ################
 # **THREAD** waiter
@@ -159,19 +212,22 @@ def main():
     # currently fails to produce a unique data set each threat cycle. Don't know why
     if args['bool_tenten60'] is True:
         print ( "Doing 10x10x60 Gainers loop cycle" )
-        logging.info('main() - Doing 10x10x60 thread cycle' )
-        global work_inst
-        work_inst = y_topgainers(2)
-        thread = threading.Thread(target=bkgrnd_worker)    # thread target passes class instance
-        logging.info('main() - START thread #1 > 10x10x60 cycler' )
-        print ( "Thread loop cycle: ", end="" )
-        thread.start()
-        while not extract_done.wait(timeout=5):     # wait on thread completd trigger
-            print ( ".", end="", flush=True )
+        global tenten60_pause, work_inst
+        tenten60_pause = min(get_market_calendar().poll_interval(30), 120)
+        # budget = the sleeps + the usual fetch allowance
+        with policy.stage("tenten60", tenten60_cycles * tenten60_pause + policy.stage_budgets['tenten60']):
+            logging.info('main() - Doing 10x10x60 thread cycle' )
+            work_inst = y_topgainers(2, args['ts_window'])
+            thread = threading.Thread(target=bkgrnd_worker)    # thread target passes class instance
+            logging.info('main() - START thread #1 > 10x10x60 cycler' )
+            print ( "Thread loop cycle: ", end="" )
+            thread.start()
+            while not extract_done.wait(timeout=5):     # wait on thread completd trigger
+                print ( ".", end="", flush=True )
 
-        print ( " " )
-        # print ( work_inst.tg_df2.sort_values(by=['Symbol','Time'], ascending=True ) )
-        print ( work_inst.tg_df2.sort_values(by=['ERank','Time'] ) )
+            print ( " " )
+            # print ( work_inst.tg_df2.sort_values(by=['Symbol','Time'], ascending=True ) )
+            work_inst.print_tenten60()
 
     else:
         print ( " " )
@@ -180,51 +236,53 @@ def main():
 # small caps are isolated outside the regular dataset by yahoo.com
     if args['bool_scr'] is True:
         print ( "========== Small Cap / Top Gainers / +5% with Mkt-cap > $299M ==========" )
-        scap_reader = y_cookiemonster(2)             # instantiate class of cookiemonster
-        small_cap_dataset = smallcap_screen(1)       # instantiate class of a Small Scap Screener
-        small_cap_dataset.init_dummy_session()       # setup cookie jar and headers
+        with policy.stage("screen"):
+            scap_reader = y_cookiemonster(2)             # instantiate class of cookiemonster
+            small_cap_dataset = smallcap_screen(1)       # instantiate class of a Small Scap Screener
+            small_cap_dataset.init_dummy_session()       # setup cookie jar and headers
 
-        small_cap_dataset.ext_req = scap_reader.get_js_data('finance.yahoo.com/research-hub/screener/small_cap_gainers/')
-        small_cap_dataset.ext_get_data(1)
+            small_cap_dataset.ext_req = scap_reader.get_js_data('finance.yahoo.com/research-hub/screener/small_cap_gainers/')
+            small_cap_dataset.ext_get_data(1)
         
-        x = small_cap_dataset.build_df0()         # build full dataframe
-        small_cap_dataset.build_top10()           # show top 10
-        small_cap_dataset.print_top10()           # print it
+            x = small_cap_dataset.build_df0()         # build full dataframe
+            small_cap_dataset.build_top10()           # show top 10
+            small_cap_dataset.print_top10()           # print it
 
-        # Recommendation #1 - Best small cap % gainer with lowest buy-in price
-        recommended.update(small_cap_dataset.screener_logic())
-        print ( " ")
+            # Recommendation #1 - Best small cap % gainer with lowest buy-in price
+            recommended.update(small_cap_dataset.screener_logic())
+            print ( " ")
 
 # process Nasdaq.com unusual_vol ################
     if args['bool_uvol'] is True:
         print ( "========== Unusually high Volume / Up =======================================================" )
-        un_vol_activity = un_volumes(1, args)       # instantiate NEW nasdaq data class, args = global var
-        un_vol_activity.get_un_vol_data()           # extract JSON data (Up & DOWN) from api.nasdaq.com
+        with policy.stage("uvol"):
+            un_vol_activity = un_volumes(1, args)       # instantiate NEW nasdaq data class, args = global var
+            un_vol_activity.get_un_vol_data()           # extract JSON data (Up & DOWN) from api.nasdaq.com
 
-        # should test success of extract before attempting DF population
-        un_vol_activity.build_df(0)           # 0 = UP Unusual volume
-        un_vol_activity.build_df(1)           # 1 = DOWN unusual volume
+            # should test success of extract before attempting DF population
+            un_vol_activity.build_df(0)           # 0 = UP Unusual volume
+            un_vol_activity.build_df(1)           # 1 = DOWN unusual volume
 
-        # find lowest price stock in unusuall UP volume list
-        up_unvols = un_vol_activity.up_unvol_listall()      # temp DF, nicely ordered & indexed of unusual UP vol activity
-        ulp = up_unvols['Cur_price'].min()                  # find lowest price row in DF
-        uminv = up_unvols['Cur_price'].idxmin()             # get index ID of lowest price row
-        u_got_it = up_unvols.loc[uminv]
+            # find lowest price stock in unusuall UP volume list
+            up_unvols = un_vol_activity.up_unvol_listall()      # temp DF, nicely ordered & indexed of unusual UP vol activity
+            ulp = up_unvols['Cur_price'].min()                  # find lowest price row in DF
+            uminv = up_unvols['Cur_price'].idxmin()             # get index ID of lowest price row
+            u_got_it = up_unvols.loc[uminv]
 
-        ulsym = u_got_it.at['Symbol']              # get symbol of lowest price item @ index_id
-        ulname = u_got_it.at['Co_name']            # get name of lowest price item @ index_id
-        upct = u_got_it.at['Pct_change']           # get %change of lowest price item @ index_id
+            ulsym = u_got_it.at['Symbol']              # get symbol of lowest price item @ index_id
+            ulname = u_got_it.at['Co_name']            # get name of lowest price item @ index_id
+            upct = u_got_it.at['Pct_change']           # get %change of lowest price item @ index_id
 
-        print ( f"Best low-buy OPPTY: #{uminv} - {ulname.rstrip()} ({ulsym.rstrip()}) @ ${ulp} / {upct}% gain" )
-        print ( " " )
-        print ( f"{un_vol_activity.up_unvol_listall()} " )
-        print ( " ")
-        print ( "========== Unusually high Volume / Down =====================================================" )
-        print ( f"{un_vol_activity.down_unvol_listall()} " )
-        print ( " ")
-        # Add unusual vol into recommendations list []
-        #recommended['2'] = ('Unusual vol:', ulsym.rstrip(), '$'+str(ulp), ulname.rstrip(), '+%'+str(un_vol_activity.up_df0.loc[uminv, ['Pct_change']][0]) )
-        recommended['2'] = ('Unusual vol:', ulsym.rstrip(), '$'+str(ulp), ulname.rstrip(), '+%'+str(upct) )
+            print ( f"Best low-buy OPPTY: #{uminv} - {ulname.rstrip()} ({ulsym.rstrip()}) @ ${ulp} / {upct}% gain" )
+            print ( " " )
+            print ( f"{un_vol_activity.up_unvol_listall()} " )
+            print ( " ")
+            print ( "========== Unusually high Volume / Down =====================================================" )
+            print ( f"{un_vol_activity.down_unvol_listall()} " )
+            print ( " ")
+            # Add unusual vol into recommendations list []
+            #recommended['2'] = ('Unusual vol:', ulsym.rstrip(), '$'+str(ulp), ulname.rstrip(), '+%'+str(un_vol_activity.up_df0.loc[uminv, ['Pct_change']][0]) )
+            recommended['2'] = ('Unusual vol:', ulsym.rstrip(), '$'+str(ulp), ulname.rstrip(), '+%'+str(upct) )
 
 
 # Get the Bull/Bear Technical performance Sentiment for all stocks in combo DF ######################
@@ -233,44 +291,101 @@ def main():
     Yahoo.com data is inconsistent and randomly unreliable (for Bull/Bear/Neutral state).
     Yahoo wants you to PAY for this info, so they make it difficult to extract.
     """
-    if args['bool_te'] is True:
+    if args['bool_te'] is True and not all(policy.stage_ok(s) for s in ('tops', 'screen', 'uvol')):
+        print ( "========== Tech events skipped / an input stage was cancelled ==========" )
+        policy.cancelled.append("perf")             # no te / combo data this run
+    elif args['bool_te'] is True:
         cmi_debug = __name__+"::Tech_events_all.#1"
-        te = y_techevents(1)
-
-        ssot_te = combo_logic(1, mlx_top_dataset, small_cap_dataset, un_vol_activity, args )
-        ssot_te.polish_combo_df(1)
-        ssot_te.tag_dupes()
-        ssot_te.tag_uniques()
-        #x.rank_hot()
-        #x.rank_unvol()
-        #x.rank_caps()
-        ssot_te.combo_df.sort_values(by=['Symbol'])         # sort by sumbol name (so dupes are linearly grouped)
-        ssot_te.reindex_combo_df()                          # re-order a new index (PERMENANT write)
-
-        print ( f"DEBUG: dump combo_df - {ssot_te}" )
-        te.build_te_summary(ssot_te, 1)                     # x = main INSTANCE:: combo_logic
-        #
-        # TODO: populate build_te_summary with symbol co_name, Cur_price  Prc_change  Pct_change, volume
-        # would be good to check if this symbol is also in the UNUSUAL UP table also.
-        #     If it is, then add Vol_pct to table also
-        #     Also add Index # from main Full Combo table  (make visual lookup quicker/easier)
-        #  te_uniques = x.list_uniques()
-        print ( f"\n\n" )
-        print ( f"========== Hottest stocks Bullish status =============" )
-        print ( f"{te.te_df0[['Symbol', 'Today', 'Short', 'Mid', 'Long', 'Bullcount', 'Senti']].sort_values(by=['Bullcount', 'Senti'], ascending=False)}" )
-        print ( f"------------------------------------------------------" )
-        #
-        # HACKING : show uniques from COMBO def
-        print ( f"***** Hacking ***** " )
-        # might not be necessary now, since I've changed the logic surrounding COMBO DF dupes.
-        # c_uniques = x.unique_symbols()
-        c_uniques = ssot_te.combo_listall_nodupes()
-        te.te_df0.merge(c_uniques, left_on='Symbol', right_on='Symbol')
-        # x.combo_listall_nodupes
-        print ( f"{te.te_df0}" )
+        with policy.stage("perf"):
+            te = y_techevents(1)
+
+            ssot_te = combo_logic(1, mlx_top_dataset, small_cap_dataset, un_vol_activity, args )
+            ssot_te.polish_combo_df(1)
+            ssot_te.tag_dupes()
+            ssot_te.tag_uniques()
+            ssot_te.rank_hot()                                  # 1xx
+            ssot_te.rank_unvol()                                # 3xx
+            ssot_te.rank_caps()                                 # 2xx. Must be last
+            ssot_te.combo_df.sort_values(by=['Symbol'])         # sort by sumbol name (so dupes are linearly grouped)
+            ssot_te.reindex_combo_df()                          # re-order a new index (PERMENANT write)
+
+            print ( f"DEBUG: dump combo_df - {ssot_te}" )
+            te.build_te_summary(ssot_te, 1)                     # x = main INSTANCE:: combo_logic
+            #
+            # TODO: populate build_te_summary with symbol co_name, Cur_price  Prc_change  Pct_change, volume
+            # would be good to check if this symbol is also in the UNUSUAL UP table also.
+            #     If it is, then add Vol_pct to table also
+            #     Also add Index # from main Full Combo table  (make visual lookup quicker/easier)
+            #  te_uniques = x.list_uniques()
+            print ( f"\n\n" )
+            print ( f"========== Hottest stocks Bullish status =============" )
+            print ( f"{te.te_df0[['Symbol', 'Today', 'Short', 'Mid', 'Long', 'Bullcount', 'Senti']].sort_values(by=['Bullcount', 'Senti'], ascending=False)}" )
+            print ( f"------------------------------------------------------" )
+            #
+            # HACKING : show uniques from COMBO def
+            print ( f"***** Hacking ***** " )
+            # might not be necessary now, since I've changed the logic surrounding COMBO DF dupes.
+            # c_uniques = x.unique_symbols()
+            c_uniques = ssot_te.combo_listall_nodupes()
+            te.te_df0.merge(c_uniques, left_on='Symbol', right_on='Symbol')
+            # x.combo_listall_nodupes
+            print ( f"{te.te_df0}" )
     else:
         pass
 
+# Deep converged view. 1 row per symbol across every data source collected in this run ###############
+    if args['bool_deep'] is True:
+        print ( "========== Deep converged multi data list ===================================================" )
+        deep_view = deep_logic(1, args)
+        if args['bool_tops'] is True and policy.stage_ok('tops'):
+            deep_view.add_source('gainers', mlx_top_dataset.tg_df0)
+        if args['bool_tops'] is True and policy.stage_ok('losers'):
+            deep_view.add_source('losers', mlx_loser_dataset.tl_df0)
+        if args['bool_scr'] is True and policy.stage_ok('screen'):
+            deep_view.add_source('small_caps', small_cap_dataset.dg1_df0)
+        if args['bool_uvol'] is True and policy.stage_ok('uvol'):
+            deep_view.add_source('uvol_up', un_vol_activity.up_df0)
+            deep_view.add_source('uvol_down', un_vol_activity.down_df1)
+        if args['bool_te'] is True and policy.stage_ok('perf'):
+            deep_view.add_source('tech_events', te.te_df0)
+        deep_view.converge()
+        print ( f"{deep_view.deep_listall()}" )
+        print ( " " )
+        print ( "========== Deep converged / *Hot* ===========================================================" )
+        print ( f"{deep_view.hottest()}" )
+        print ( " " )
+        print ( "========== Deep converged / Top 10 multi factor ranking =====================================" )
+        ranked = rank_engine(1).top(deep_view.wide_df, 10)
+        print ( f"{display_df(ranked[['Rank', 'Symbol', 'Co_name', 'Cur_price', 'M_B', 'Hot', 'Nsrc', 'Score']])}" )
+        print ( " " )
+
+# Snapshot history. Every frame built in this run is appended to the Parquet store ###############
+    snaps = get_snapshot_store()           # only frames from stages that completed (cancelled = partial data)
+    if args['bool_tops'] is True and policy.stage_ok('tops'):
+        snaps.write('gainers', mlx_top_dataset.tg_df0)
+        snaps.write('gainers_top10', mlx_top_dataset.tg_df1)
+    if args['bool_tops'] is True and policy.stage_ok('losers'):
+        snaps.write('losers', mlx_loser_dataset.tl_df0)
+    if args['bool_scr'] is True and policy.stage_ok('screen'):
+        snaps.write('small_caps', small_cap_dataset.dg1_df0)
+    if args['bool_uvol'] is True and policy.stage_ok('uvol'):
+        snaps.write('uvol_up', un_vol_activity.up_df0)
+        snaps.write('uvol_down', un_vol_activity.down_df1)
+    if args['bool_te'] is True and policy.stage_ok('perf'):
+        snaps.write('tech_events', te.te_df0)
+        snaps.write('combo', ssot_te.combo_df)
+
+# Screen query. Live deep converged list if we have one, else today's snapshot history ###############
+    if args['screen_query'] is not False:
+        screen = screen_query(1, args['screen_query'])
+        if args['bool_deep'] is True:
+            screen.print_screen(deep_view.wide_df, cols=[ 'Symbol', 'Co_name', 'Cur_price', 'Mkt_cap', 'M_B', 'Hot', 'Srcs', 'Nsrc' ])
+        else:
+            hits = screen.run_snapshots(snaps)
+            print ( f"========== Screen: {screen.text} / today's snapshots / {len(hits)} rows ==========" )
+            print ( hits )
+        print ( " " )
+
 # ##### M/L AI News Reader  #########################################################
 # ##### Currently read all news or ONE stock
 # ###################################################################################
@@ -278,82 +393,85 @@ def main():
     if args['newsymbol'] is not False:
             cmi_debug = __name__+"::_args_newsymbol.#1"
             news_symbol = str(args['newsymbol'])       # symbol provided on CMDLine
-            print ( " " )
-            print ( f"M/L news reader for Stock [ {news_symbol} ] =========================" )
-            news_ai = ml_nlpreader(1, args)
-            sent_ai = ml_sentiment(1, args)
-            news_ai.nlp_read_one(news_symbol, args)
-            kgraphdb = db_graph(1, args)    # inst a class 
-            kgraphdb.con_aopkgdb(1)         # connect to neo4j db
-
-            # check to see if this ticker stmbol exists in KGdb as a Graph node
-            # if not, create it
-            try:
-                found_sym = kgraphdb.check_node_exists(1, news_symbol)
-                if found_sym['present'] is True:    # True = symbol already exists
-                    created = False
-                    pass    # do nothing is Ticker Symbol exists
-            except TypeError:
-                # Type:class 'NoneType' is discovered here...
-                kg_node_id = kgraphdb.create_sym_node(news_symbol)
-                created = True
-
-            ttc = 0     # article specific stats : total tokens
-            twc = 0     # article specific stats : total words
-            tsc = 0     # article specific stats : total scentences / paragra[phs]
-            ttkz = 0    # Cumulative : Total Tokens genertaed
-            twcz = 0    # Cumulative : Total words read
-            tscz = 0    # Cumulative : Total scentences / Paragraphs read
-
-            for sn_idx, sn_row in news_ai.yfn.ml_ingest.items():
-                # TESTING code only - to make testing complete quicker (only test 4 docs)
-                thint = news_ai.nlp_summary(3, sn_idx)       # what News article TYPE in ml_ingest to look for
-                if thint == 0.0:    # only compute type 0.0 prepared and validated new articles in ML_ingest
-                    ttc, twc, tsc = news_ai.yfn.extract_article_data(sn_idx, sent_ai)
-                    ttkz += ttc
-                    twcz += twc
-                    tscz += tsc
-
-            print (f"\n\n==================================== Stats ====================================" )
-            print (f"Total tokens generated: {ttkz} - Total words read: {twcz} - Total scent/paras read {tscz}" )
-            print (f"Human read time: {(twcz / 237):.2f} mins - Total Human processing time: {(twcz / 237) + tscz + (tscz / 2):.2f} mins" )
-            pd.set_option('display.max_rows', None)
-            pd.set_option('display.max_columns', None)
-            print (f" ==================================== Stats ====================================\n" )
-
-            news_ai.yfn.dump_ml_ingest()
-
-            print (f"{sent_ai.sen_df0}")
-
-            sent_ai.sen_df1 = sent_ai.sen_df0.groupby('Sent').agg(['count'])
-            sent_ai.sen_df2 = sent_ai.sen_df0.groupby('Sent')['Rank'].mean()
-            sent_ai.sen_df1['Sentiment'] = sent_ai.sen_df2
-            sent_ai.sen_df1.loc['Total'] = sent_ai.sen_df1[['Row']].sum()
-            print (f"\n")
-
-            neutral_t = sent_ai.sen_df1.loc['Total']['Row']
-            sent_ai.sen_df1['Percetage'] = sent_ai.sen_df1['Row'] / neutral_t * 100
-            sent_ai.sen_df1 = sent_ai.sen_df1.drop(['Symbol', 'Article', 'Chunk', 'Rank'], axis=1)
+            with policy.stage("news"):
+                get_parse_pool().start()                   # fork the parse workers before the news fetch threads start
+                print ( " " )
+                print ( f"M/L news reader for Stock [ {news_symbol} ] =========================" )
+                news_ai = ml_nlpreader(1, args)
+                sent_ai = ml_sentiment(1, args)
+                news_ai.nlp_read_one(news_symbol, args)
+                kgraphdb = db_graph(1, args)    # inst a class 
+                kgraphdb.con_aopkgdb(1)         # connect to neo4j db
+
+                # check to see if this ticker stmbol exists in KGdb as a Graph node
+                # if not, create it
+                try:
+                    found_sym = kgraphdb.check_node_exists(1, news_symbol)
+                    if found_sym['present'] is True:    # True = symbol already exists
+                        created = False
+                        pass    # do nothing is Ticker Symbol exists
+                except TypeError:
+                    # Type:class 'NoneType' is discovered here...
+                    kg_node_id = kgraphdb.create_sym_node(news_symbol)
+                    created = True
+
+                ttc = 0     # article specific stats : total tokens
+                twc = 0     # article specific stats : total words
+                tsc = 0     # article specific stats : total scentences / paragra[phs]
+                ttkz = 0    # Cumulative : Total Tokens genertaed
+                twcz = 0    # Cumulative : Total words read
+                tscz = 0    # Cumulative : Total scentences / Paragraphs read
+
+                for sn_idx, sn_row in news_ai.yfn.ml_ingest.items():
+                    # TESTING code only - to make testing complete quicker (only test 4 docs)
+                    thint = news_ai.nlp_summary(3, sn_idx)       # what News article TYPE in ml_ingest to look for
+                    if thint == 0.0:    # only compute type 0.0 prepared and validated new articles in ML_ingest
+                        ttc, twc, tsc = news_ai.yfn.extract_article_data(sn_idx, sent_ai)
+                        ttkz += ttc
+                        twcz += twc
+                        tscz += tsc
+
+                print (f"\n\n==================================== Stats ====================================" )
+                print (f"Total tokens generated: {ttkz} - Total words read: {twcz} - Total scent/paras read {tscz}" )
+                print (f"Human read time: {(twcz / 237):.2f} mins - Total Human processing time: {(twcz / 237) + tscz + (tscz / 2):.2f} mins" )
+                pd.set_option('display.max_rows', None)
+                pd.set_option('display.max_columns', None)
+                print (f" ==================================== Stats ====================================\n" )
+
+                news_ai.yfn.dump_ml_ingest()
+
+                sent_ai.build_sen_df()                     # 1 DataFrame from all buffered sentiment chunks
+                print (f"{sent_ai.sen_df0}")
+
+                sent_ai.sen_df1 = sent_ai.sen_df0.groupby('Sent').agg(['count'])
+                sent_ai.sen_df2 = sent_ai.sen_df0.groupby('Sent')['Rank'].mean()
+                sent_ai.sen_df1['Sentiment'] = sent_ai.sen_df2
+                sent_ai.sen_df1.loc['Total'] = sent_ai.sen_df1[['Row']].sum()
+                print (f"\n")
+
+                neutral_t = sent_ai.sen_df1.loc['Total']['Row']
+                sent_ai.sen_df1['Percetage'] = sent_ai.sen_df1['Row'] / neutral_t * 100
+                sent_ai.sen_df1 = sent_ai.sen_df1.drop(['Symbol', 'Article', 'Chunk', 'Rank'], axis=1)
             
-            #neutral_tt = sent_ai.sen_df1.iloc[3, 0]
-            #print ( f"### DEBUG: {neutral_tt}" )
-
-            # number = int(df1.loc[:,'randomcolumn'])
-            #sent_ai.sen_df1['Total'] = sent_ai.sen_df0.groupby('Sent').agg(['count']).sum()
-            #print ( f"{sent_ai.sen_df0.groupby(['Article', 'Sent'])['Rank'].mean()}" )
-            #print ( f"{sent_ai.sen_df0.groupby('Sent').agg(['count'])}" )
-            #print ( f"{sent_ai.sen_df0.groupby('Sent')['Rank'].mean()}" )
-            #print ( f"### DEBUG 2:\n{neutral_t}" )
-
-            # KGdb stats
-            print ( f"{sent_ai.sen_df1}" )
-            if created is True:    # True = symbol already exists
-                print ( f"Created new KG node_id: {kg_node_id}" )
-            else:
-                print ( f"Symbol allready exist - New node NOT created !" )
+                #neutral_tt = sent_ai.sen_df1.iloc[3, 0]
+                #print ( f"### DEBUG: {neutral_tt}" )
+
+                # number = int(df1.loc[:,'randomcolumn'])
+                #sent_ai.sen_df1['Total'] = sent_ai.sen_df0.groupby('Sent').agg(['count']).sum()
+                #print ( f"{sent_ai.sen_df0.groupby(['Article', 'Sent'])['Rank'].mean()}" )
+                #print ( f"{sent_ai.sen_df0.groupby('Sent').agg(['count'])}" )
+                #print ( f"{sent_ai.sen_df0.groupby('Sent')['Rank'].mean()}" )
+                #print ( f"### DEBUG 2:\n{neutral_t}" )
+
+                # KGdb stats
+                print ( f"{sent_ai.sen_df1}" )
+                if created is True:    # True = symbol already exists
+                    print ( f"Created new KG node_id: {kg_node_id}" )
+                else:
+                    print ( f"Symbol allready exist - New node NOT created !" )
             
-            res = kgraphdb.dump_symbols(1)
-            kgraphdb.close_aopkgdb(1, kgraphdb.driver)
+                res = kgraphdb.dump_symbols(1)
+                kgraphdb.close_aopkgdb(1, kgraphdb.driver)
 
 #################################################################################
 # 3 differnt methods to get a live quote ########################################
@@ -368,62 +486,63 @@ def main():
     """
 
     if args['qsymbol'] is not False:
-        nq = nquote(1, args)                          # Nasdqa quote instance from nasdqa_quotes.py
-        nq.init_dummy_session()                       # note: this will set nasdaq magic cookie
-        nq_symbol = args['qsymbol'].upper()
-        logging.info( f"%s - Get Nasdaq.com quote for symbol {nq_symbol}" % cmi_debug )
-        nq.update_headers(nq_symbol, "stocks")        # set path: header object. doesnt touch secret nasdaq cookies
-        nq.form_api_endpoint(nq_symbol, "stocks")     # set API endpoint url - default GUESS asset_class=stocks
-        ac = nq.learn_aclass(nq_symbol)
-
-        if ac != "stocks":
-            logging.info( f"%s - re-shape asset class endpoint to: {ac}" % cmi_debug )
-            nq.form_api_endpoint(nq_symbol, ac)       # re-form API endpoint if default asset_class guess was wrong)
-            nq.get_nquote(nq_symbol.upper())          # get a live quote
-            wq = nq_wrangler(1, args)                 # instantiate a class for Quote Data Wrangeling
-            wq.asset_class = ac
-        else:
-            nq.get_nquote(nq_symbol.rstrip())
-            wq = nq_wrangler(1, args)                 # instantiate a class for Quote Data Wrangeling
-            wq.asset_class = ac                       # wrangeler class MUST know the class of asset its working on
-
-        logging.info( f"============ Getting nasdaq quote data for asset class: {ac} ==========" )
-        wq.setup_zones(1, nq.quote_json1, nq.quote_json2, nq.quote_json3)
-        wq.do_wrangle()
-        wq.clean_cast()
-        wq.build_data_sets()
-        # add Tech Events Sentiment to quote dict{}
-        te_nq_quote = wq.qd_quote
-        """
-        te = y_techevents(2)
-        te.form_api_endpoints(nq_symbol)
-        success = te.get_te_zones(2)
-        if success == 0:
-            te.build_te_data(2)
-            te.te_into_nquote(te_nq_quote)
-            #nq.quote.update({"today_only": te.te_sentiment[0][2]} )
-            #nq.quote.update({"short_term": te.te_sentiment[1][2]} )
-            #nq.quote.update({"med_term": te.te_sentiment[2][2]} )
-            #nq.quote.update({"long_term": te.te_sentiment[3][2]} )
-        else:
-            te.te_is_bad()                     # FORCE Tech Events to be N/A
-            te.te_into_nquote(te_nq_quote)     # NOTE: needs to be the point to new refactored class nasdqa_wrangler::nq_wrangler qd_quote{}
-        """
-
-        print ( f"===================== Nasdaq quote data =======================" )
-        print ( f"                          {nq_symbol}" )
-        print ( f"===============================================================" )
-        c = 1
-        for k, v in wq.qd_quote.items():
-            print ( f"{c} - {k} : {v}" )
-            c += 1
-        """
-        print ( f"===================== Technial Events =========================" )
-        te.build_te_df(1)
-        te.reset_te_df0()
-        print ( f"{te.te_df0}" )
-        print ( f"===============================================================" )
-        """
+        with policy.stage("quote"):
+            nq = nquote(1, args)                          # Nasdqa quote instance from nasdqa_quotes.py
+            nq.init_dummy_session()                       # note: this will set nasdaq magic cookie
+            nq_symbol = args['qsymbol'].upper()
+            logging.info( f"%s - Get Nasdaq.com quote for symbol {nq_symbol}" % cmi_debug )
+            nq.update_headers(nq_symbol, "stocks")        # set path: header object. doesnt touch secret nasdaq cookies
+            nq.form_api_endpoint(nq_symbol, "stocks")     # set API endpoint url - default GUESS asset_class=stocks
+            ac = nq.learn_aclass(nq_symbol)
+
+            if ac != "stocks":
+                logging.info( f"%s - re-shape asset class endpoint to: {ac}" % cmi_debug )
+                nq.form_api_endpoint(nq_symbol, ac)       # re-form API endpoint if default asset_class guess was wrong)
+                nq.get_nquote(nq_symbol.upper())          # get a live quote
+                wq = nq_wrangler(1, args)                 # instantiate a class for Quote Data Wrangeling
+                wq.asset_class = ac
+            else:
+                nq.get_nquote(nq_symbol.rstrip())
+                wq = nq_wrangler(1, args)                 # instantiate a class for Quote Data Wrangeling
+                wq.asset_class = ac                       # wrangeler class MUST know the class of asset its working on
+
+            logging.info( f"============ Getting nasdaq quote data for asset class: {ac} ==========" )
+            wq.setup_zones(1, nq.quote_json1, nq.quote_json2, nq.quote_json3)
+            wq.do_wrangle()
+            wq.clean_cast()
+            wq.build_data_sets()
+            # add Tech Events Sentiment to quote dict{}
+            te_nq_quote = wq.qd_quote
+            """
+            te = y_techevents(2)
+            te.form_api_endpoints(nq_symbol)
+            success = te.get_te_zones(2)
+            if success == 0:
+                te.build_te_data(2)
+                te.te_into_nquote(te_nq_quote)
+                #nq.quote.update({"today_only": te.te_sentiment[0][2]} )
+                #nq.quote.update({"short_term": te.te_sentiment[1][2]} )
+                #nq.quote.update({"med_term": te.te_sentiment[2][2]} )
+                #nq.quote.update({"long_term": te.te_sentiment[3][2]} )
+            else:
+                te.te_is_bad()                     # FORCE Tech Events to be N/A
+                te.te_into_nquote(te_nq_quote)     # NOTE: needs to be the point to new refactored class nasdqa_wrangler::nq_wrangler qd_quote{}
+            """
+
+            print ( f"===================== Nasdaq quote data =======================" )
+            print ( f"                          {nq_symbol}" )
+            print ( f"===============================================================" )
+            c = 1
+            for k, v in wq.qd_quote.items():
+                print ( f"{c} - {k} : {v}" )
+                c += 1
+            """
+            print ( f"===================== Technial Events =========================" )
+            te.build_te_df(1)
+            te.reset_te_df0()
+            print ( f"{te.te_df0}" )
+            print ( f"===============================================================" )
+            """
 
     """
     EXAMPLE #2
@@ -432,18 +551,19 @@ def main():
     10 data fields provided
     """
     if args['qsymbol'] is not False:
-        bc = bc_quote(5, args)                  # setup an emphemerial dict
-        bc_symbol = args['qsymbol'].upper()     # what symbol are we getting a quote for?
-        bc.get_basicquote(bc_symbol)            # get the quote
-        print ( " " )
-        print ( f"Get BIGCharts.com BasicQuote for: {bc_symbol}" )
-        print ( f"================= basicquote data =======================" )
-        c = 1
-        for k, v in bc.quote.items():
-            print ( f"{c} - {k} : {v}" )
-            c += 1
-        print ( f"========================================================" )
-        print ( " " )
+        with policy.stage("quote"):
+            bc = bc_quote(5, args)                  # setup an emphemerial dict
+            bc_symbol = args['qsymbol'].upper()     # what symbol are we getting a quote for?
+            bc.get_basicquote(bc_symbol)            # get the quote
+            print ( " " )
+            print ( f"Get BIGCharts.com BasicQuote for: {bc_symbol}" )
+            print ( f"================= basicquote data =======================" )
+            c = 1
+            for k, v in bc.quote.items():
+                print ( f"{c} - {k} : {v}" )
+                c += 1
+            print ( f"========================================================" )
+            print ( " " )
 
     """
     EXAMPLE #3
@@ -452,19 +572,52 @@ def main():
     40 data fields provided
     """
     if args['qsymbol'] is not False:
-        bc = bc_quote(5, args)                  # setup an emphemerial dict
-        bc_symbol = args['qsymbol'].upper()     # what symbol are we getting a quote for?
-        bc.get_quickquote(bc_symbol)            # get the quote
-        bc.q_polish()                           # wrangel the data elements
-        print ( " " )
-        print ( f"Get BIGCharts.com QuickQuote for: {bc_symbol}" )
-        print ( f"================= quickquote data =======================" )
-        c = 1
-        for k, v in bc.quote.items():
-            print ( f"{c} - {k} : {v}" )
-            c += 1
-        print ( f"========================================================" )
-        print ( " " )
+        with policy.stage("quote"):
+            bc = bc_quote(5, args)                  # setup an emphemerial dict
+            bc_symbol = args['qsymbol'].upper()     # what symbol are we getting a quote for?
+            bc.get_quickquote(bc_symbol)            # get the quote
+            bc.q_polish()                           # wrangel the data elements
+            print ( " " )
+            print ( f"Get BIGCharts.com QuickQuote for: {bc_symbol}" )
+            print ( f"================= quickquote data =======================" )
+            c = 1
+            for k, v in bc.quote.items():
+                print ( f"{c} - {k} : {v}" )
+                c += 1
+            print ( f"========================================================" )
+            print ( " " )
+
+    service_stats()
+    return
+
+#################################################################################
+# Shared services - report stats & shut down
+
+def service_stats():
+    # JS render pool - report render latency & browser memory (only if anything was rendered)
+    js_pool = get_render_pool()
+    if js_pool.loop is not None:
+        js_pool.print_stats()
+        js_pool.shutdown()
+
+# Shared fetch path - report HTTP cache effectiveness
+    get_fetcher().print_stats()
+    get_html_backend().print_stats()
+    p_pool = get_parse_pool()
+    if p_pool.executor is not None:
+        p_pool.print_stats()
+        p_pool.shutdown()
+    nq_client = get_nasdaq_client()
+    if nq_client.loop is not None:
+        nq_client.print_stats()
+        nq_client.shutdown()
+    snaps = get_snapshot_store()
+    if snaps.written > 0:
+        snaps.print_stats()
+    cdc = get_cdc_stream()
+    if cdc.stats['frames'] > 0:
+        cdc.print_stats()
+    return
 
 
 if __name__ == '__main__':
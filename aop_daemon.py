@@ -0,0 +1,234 @@
+#! python3
+import time
+import threading
+import logging
+from rich import print
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+# my private classes & methods
+from y_topgainers import y_topgainers
+from y_daylosers import y_daylosers
+from y_smallcaps import smallcap_screen
+from nasdaq_uvoljs import un_volumes
+from shallow_logic import combo_logic
+from y_techevents import y_techevents
+from y_cookiemonster import y_cookiemonster
+from ml_nlpreader import ml_nlpreader
+from ml_sentiment import ml_sentiment
+from job_scheduler import job_scheduler
+from market_calendar import get_market_calendar
+from snapshot_store import get_snapshot_store
+from cdc_stream import get_cdc_stream
+from combo_state import combo_state
+from alert_rules import alert_rules
+from screen_query import screen_query
+
+#####################################################
+# CLASS
+class aop_daemon:
+    """
+    Long running mode (aop --daemon). Every collector is a scheduled job on its own interval.
+    Collector instances (cookie jars, sessions, learned render hints, HTTP cache, NLP models) are built
+    once & reused by every cycle, instead of being rebuilt per CLI invocation.
+    Tech events & news are derived jobs. They work on whatever the collectors last produced.
+    Every collector frame goes through change capture (cdc_stream). Unchanged frames are not snapshotted
+    & tech events only reruns when 1 of its inputs changed.
+    combo_df is kept current from the deltas (combo_state) instead of being rebuilt by every tech events run.
+    Standing alert rules (alert_rules) are evaluated on the changed symbols of every delta.
+    """
+
+    # global accessors
+    inst_uid = 0
+    args = []               # class dict to hold global args being passed in from main() methods
+    sched = None            # job_scheduler
+
+    # { job: (base interval secs, deadline secs, 1st run delay secs, market sessions it polls in) }
+    # base interval = regular hours. Halved at the open & close bursts, x4 pre/after market. Closed = no polling
+    schedule = { 'gainers':     (60,  45,  0,   ('pre', 'regular', 'after')),
+                 'losers':      (60,  45,  5,   ('pre', 'regular', 'after')),
+                 'small_caps':  (120, 90,  10,  ('regular',)),
+                 'uvol':        (60,  45,  15,  ('regular',)),
+                 'tech_events': (600, 300, 90,  ('regular',)),
+                 'news':        (900, 600, 120, ('pre', 'regular', 'after')),
+                 }
+
+    def __init__(self, yti, global_args, workers=2):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info('%s - INST_class' % cmi_debug )
+        self.inst_uid = yti
+        self.args = global_args
+        self.sched = job_scheduler(yti, workers)
+        self.sched.calendar = get_market_calendar()     # market hours drive every collector's poll rate
+        self.gainers = None
+        self.losers = None
+        self.small_caps = None
+        self.uvol = None
+        self.news_ai = None
+        self.sent_ai = None
+        self.dirty = set()                  # sources changed since tech events last ran
+        self.dirty_lock = threading.Lock()  # collector threads add, tech events takes
+        self.combo = combo_state(1, combo_logic.cx)
+        get_cdc_stream().subscribe('*', self.mark_dirty)
+        self.alerts = alert_rules(1, self.combo)
+        if global_args.get('alert_rules'):
+            self.alerts.load_rules(global_args['alert_rules'])
+        get_cdc_stream().subscribe('*', self.combo.apply)
+        get_cdc_stream().subscribe('*', self.on_delta)        # after combo_state. Rules see the updated rows
+        return
+
+    def __repr__(self):
+        return ( f'{self.__class__.__name__}(' f'{self.inst_uid!r})' )
+
+#############################################################################
+# method #1
+
+    def setup(self):
+        """Register every collector job on the scheduler"""
+        for name, (interval, deadline, delay, sessions) in self.schedule.items():
+            self.sched.add_job(name, getattr(self, "job_"+name), interval, jitter=0.1, deadline=deadline, first_delay=delay, sessions=sessions)
+        return
+
+#############################################################################
+# method #2
+
+    def run(self, duration=None):
+        """Run until Ctrl-C, or duration secs"""
+        print ( f"========== Daemon mode / {len(self.sched.jobs)} jobs / market: {self.sched.calendar.phase()} / Ctrl-C to stop ==========" )
+        try:
+            self.sched.run(duration)
+        except KeyboardInterrupt:
+            print ( " " )
+            print ( "Daemon stop requested / waiting on running jobs..." )
+            self.sched.stop()
+        self.sched.print_stats()
+        self.combo.print_stats()
+        self.alerts.print_stats()
+        return
+
+#############################################################################
+# collector jobs. 1 run each. Instances are created on the 1st run & reused
+
+    def job_gainers(self):
+        if self.gainers is None:
+            self.gainers = y_topgainers(1, self.args['ts_window'])
+            self.gainers.init_dummy_session(1)
+        self.gainers.ext_req = y_cookiemonster(1).get_html_data('finance.yahoo.com/markets/stocks/most-active/')
+        self.gainers.ext_get_data(1, js_render="auto")
+        self.gainers.build_tg_df0()
+        self.gainers.build_top10()
+        self.gainers.build_tenten60(self.gainers.tg_ts.cycles)      # history persists across cycles
+        self.collected('gainers', 'gainers', self.gainers.tg_df0)
+        self.collected('gainers', 'gainers_top10', self.gainers.tg_df1)
+        return
+
+    def job_losers(self):
+        if self.losers is None:
+            self.losers = y_daylosers(1)
+            self.losers.init_dummy_session(1)
+        self.losers.ext_req = y_cookiemonster(2).get_js_data('finance.yahoo.com/markets/stocks/losers/')
+        self.losers.ext_get_data(1, js_render="auto")
+        self.losers.build_tl_df0()
+        self.losers.build_top10()
+        self.collected('losers', 'losers', self.losers.tl_df0)
+        return
+
+    def job_small_caps(self):
+        if self.small_caps is None:
+            self.small_caps = smallcap_screen(1)
+            self.small_caps.init_dummy_session()
+        self.small_caps.ext_req = y_cookiemonster(3).get_js_data('finance.yahoo.com/research-hub/screener/small_cap_gainers/')
+        self.small_caps.ext_get_data(1)
+        self.small_caps.build_df0()
+        self.small_caps.build_top10()
+        # same screen as the CLI (screener_logic). combo_state, alerts & tech events get the screened list
+        self.small_caps.dg1_df1 = screen_query(1, self.small_caps.screen).run(self.small_caps.dg1_df0)
+        self.collected('small_caps', 'small_caps', self.small_caps.dg1_df0)
+        self.collected('small_caps', 'small_caps_top10', self.small_caps.dg1_df1)
+        return
+
+    def job_uvol(self):
+        if self.uvol is None:
+            self.uvol = un_volumes(1, self.args)
+        self.uvol.get_un_vol_data()
+        self.uvol.build_df(0)
+        self.uvol.build_df(1)
+        self.collected('uvol', 'uvol_up', self.uvol.up_df0)
+        self.collected('uvol', 'uvol_down', self.uvol.down_df1)
+        return
+
+    def job_tech_events(self):
+        """Needs gainers, small caps & unusual vol. Skipped until all 3 have run once"""
+        if None in (self.gainers, self.small_caps, self.uvol):
+            self.status("tech_events", "waiting on gainers / small caps / uvol")
+            return
+        inputs = set(self.combo.sources)
+        with self.dirty_lock:               # test & take in 1 step. A delta landing now is kept for the next run
+            changed = self.dirty & inputs
+            self.dirty = self.dirty - inputs
+        if not changed:
+            self.status("tech_events", "inputs unchanged / skipped")
+            return
+        ssot = combo_logic(1, None, None, None, self.args)
+        self.combo.repair(ssot)                 # nasdaq.com quotes only for new symbols missing Mkt_cap
+        ssot.load_state(self.combo)             # already tagged & sorted
+        te = y_techevents(1)                    # fresh per run. Its row buffer holds 1 summary
+        te.build_te_summary(ssot, 1)
+        self.collected('tech_events', 'tech_events', te.te_df0)
+        self.collected('tech_events', 'combo', ssot.combo_df)
+        return
+
+    def job_news(self):
+        """News sentiment for --newsai SYMBOL, else the current #1 top gainer. NLP models stay loaded"""
+        symbol = self.args['newsymbol']
+        if symbol is False:
+            if self.gainers is None or len(self.gainers.tg_df1) == 0:
+                self.status("news", "waiting on gainers")
+                return
+            symbol = str(self.gainers.tg_df1['Symbol'].iloc[0]).strip()
+        if self.news_ai is None:
+            self.news_ai = ml_nlpreader(1, self.args)
+            self.sent_ai = ml_sentiment(1, self.args)
+        # 1 run = 1 fresh article set. The buffers must not grow for the life of the daemon
+        self.sent_ai.sen_rows.clear()
+        if self.news_ai.yfn is not None:
+            self.news_ai.yfn.ml_ingest.clear()          # class level dict. Shared by every news reader instance
+        self.news_ai.nlp_read_one(symbol, dict(self.args, newsymbol=symbol))
+        articles = 0
+        for sn_idx in list(self.news_ai.yfn.ml_ingest.keys()):
+            if self.news_ai.nlp_summary(3, sn_idx) == 0.0:
+                self.news_ai.yfn.extract_article_data(sn_idx, self.sent_ai)
+                articles += 1
+        self.news_ai.yfn.ml_ingest.clear()
+        sen = self.sent_ai.build_sen_df()               # 1 row per sentiment chunk
+        get_snapshot_store().write('news_sentiment', sen)      # chunks repeat symbols. No change capture (keyed by symbol)
+        counts = sen['Sent'].value_counts().to_dict() if len(sen) else {}
+        self.status("news", f"{symbol}: {articles} articles / {len(sen)} chunks / " + " ".join(f"{k}: {v}" for k, v in counts.items()))
+        return
+
+#############################################################################
+# private helpers
+
+    def mark_dirty(self, delta):
+        with self.dirty_lock:
+            self.dirty.add(delta.source)
+        return
+
+    def on_delta(self, delta):
+        for a in self.alerts.on_delta(delta):
+            v = a['values']
+            print ( f"[{time.strftime('%H:%M:%S', time.localtime(a['ts']))}] ALERT {a['rule']}: {a['symbol']} ${v['Cur_price']} / {v['Pct_change']}% / in: {', '.join(a['sources'])}" )
+        return
+
+    def collected(self, job, source, df):
+        """Change capture for 1 new frame. Snapshot it only if something changed"""
+        delta = get_cdc_stream().diff(source, df)
+        if not delta.empty():
+            get_snapshot_store().write(source, df)
+        self.status(job, f"{source}: {len(df)} rows / +{len(delta.inserted)} -{len(delta.removed)} ~{len(delta.updated)}")
+        return delta
+
+    def status(self, job, msg):
+        print ( f"[{time.strftime('%H:%M:%S', time.localtime())}] {job:<12} {msg} / next in {self.sched.next_wait(self.sched.jobs[job]):.0f}s" )
+        return
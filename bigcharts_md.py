@@ -1,9 +1,10 @@
 #! python3
-from bs4 import BeautifulSoup
-import urllib
 import re
 import logging
 
+from net_fetcher import get_fetcher
+from html_backend import get_html_backend
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 
@@ -66,10 +67,10 @@ class bc_quote:
         url_queryopts = "&insttype=Stock&freq=9&show=True&time=1"
 
         logging.info('%s - Read request : Basic quote URL endpoint' % cmi_debug )
-        with urllib.request.urlopen( f"{url_endpoint}{ticker}{url_queryopts}" ) as url:
-            s = url.read()
+        with get_fetcher().get( f"{url_endpoint}{ticker}{url_queryopts}" ) as url:
+            s = url.content
             logging.info('%s - setup data scrape pointers' % cmi_debug )
-            data_soup = BeautifulSoup(s, "html.parser")
+            data_soup = get_html_backend().soup(s, attrs={"id": "quote"} )      # only build the quote zone
             quote_section = data_soup.find(attrs={"id": "quote"} )
             quote_data = quote_section.find_all("tr")
             quote1 = quote_data[2]
@@ -157,9 +158,9 @@ class bc_quote:
         url_endpoint = "https://bigcharts.marketwatch.com/quickchart/qsymbinfo.asp?symb="
         url_queryopts = "&time=9&freq=1"
 
-        with urllib.request.urlopen( f"{url_endpoint}{ticker}" ) as url:
-            s = url.read()
-            data_soup = BeautifulSoup(s, "html.parser")
+        with get_fetcher().get( f"{url_endpoint}{ticker}" ) as url:
+            s = url.content
+            data_soup = get_html_backend().soup(s, ["h1", "table"] )          # zones: h1.quote, table#quote, table.financials
             qq_head = data_soup.find("h1", attrs={"class": "quote"} )
             qq_head_co = qq_head.find_all('div')[0]
             qq_head_data = qq_head.find_all('div')[3]
@@ -0,0 +1,168 @@
+#! python3
+import threading
+import time
+import logging
+import numpy as np
+import pandas as pd
+from rich import print
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class cdc_delta:
+    """What changed in 1 source between 2 collection cycles (keyed by Symbol)"""
+
+    def __init__(self, source, cycle, inserted, removed, updated, changed):
+        self.source = source
+        self.cycle = cycle              # cycles diffed for this source so far (1 = 1st frame, everything is an insert)
+        self.inserted = inserted        # new rows. Symbols not in the previous frame
+        self.removed = removed          # previous rows of symbols that dropped out
+        self.updated = updated          # new rows of symbols whose values changed
+        self.changed = changed          # { symbol: [ changed columns ] } for the updated rows
+        self.ts = time.time()
+        return
+
+    def __repr__(self):
+        return ( f'{self.__class__.__name__}({self.source!r} #{self.cycle} +{len(self.inserted)} -{len(self.removed)} ~{len(self.updated)})' )
+
+    def empty(self):
+        return len(self.inserted) == 0 and len(self.removed) == 0 and len(self.updated) == 0
+
+    def symbols(self):
+        """Every symbol touched by this delta"""
+        return set(self.inserted.index) | set(self.removed.index) | set(self.updated.index)
+
+#####################################################
+
+class cdc_stream:
+    """
+    Change data capture between collection cycles.
+    diff() compares a collector's new frame with its previous one by Symbol (vectorized, no row loops)
+    & publishes a cdc_delta: inserted / removed / updated rows + the columns that changed.
+    Downstream stages subscribe() to a source (or '*' = all) & only work on the deltas.
+    Delta frames are indexed by the stripped Symbol.
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    key = 'Symbol'          # row identity across cycles
+    ignore = ('Row', 'ERank', 'Time')   # position & timestamp columns. Change every cycle, not data changes
+    prev = {}               # { source: last frame seen, indexed by key }
+    cycles = {}             # { source: frames diffed }
+    subs = {}               # { source | '*': [ callbacks(delta) ] }
+
+    def __init__(self, yti):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.lock = threading.Lock()
+        self.prev = {}
+        self.cycles = {}
+        self.subs = {}
+        self.stats = { 'frames': 0, 'rows': 0, 'inserted': 0, 'removed': 0, 'updated': 0, 'unchanged': 0 }
+        return
+
+######################################################################
+# method 1
+    def subscribe(self, source, fn):
+        """fn(delta) is called after every diff of source. source = '*' for every source"""
+        with self.lock:
+            self.subs.setdefault(source, []).append(fn)
+        return
+
+######################################################################
+# method 2
+    def diff(self, source, df, publish=True):
+        """
+        Diff 1 collector frame against the previous one of the same source & publish the delta.
+        Empty deltas are not published (nothing downstream to do). Returns the cdc_delta
+        """
+        cmi_debug = __name__+"::"+self.diff.__name__+".#"+str(self.yti)
+        new = self.keyed(df)
+        with self.lock:
+            old = self.prev.get(source)
+            self.prev[source] = new
+            self.cycles[source] = self.cycles.get(source, 0) + 1
+            cycle = self.cycles[source]
+        if old is None:
+            delta = cdc_delta(source, cycle, new, new.iloc[0:0], new.iloc[0:0], {})
+        else:
+            delta = self.compare(source, cycle, old, new)
+        with self.lock:
+            self.stats['frames'] += 1
+            self.stats['rows'] += len(new)
+            self.stats['inserted'] += len(delta.inserted)
+            self.stats['removed'] += len(delta.removed)
+            self.stats['updated'] += len(delta.updated)
+            self.stats['unchanged'] += len(new) - len(delta.inserted) - len(delta.updated)
+            subs = self.subs.get(source, []) + self.subs.get('*', [])
+        logging.info( f'%s - {delta}' % cmi_debug )
+        if publish and not delta.empty():
+            for fn in subs:
+                try:
+                    fn(delta)
+                except Exception as e:
+                    logging.warning( f'%s - {source} subscriber failed: {e}' % cmi_debug )
+        return delta
+
+######################################################################
+# method 3
+    def compare(self, source, cycle, old, new):
+        """Vectorized row diff of 2 keyed frames"""
+        pos = old.index.get_indexer(new.index)      # new row -> old row position (-1 = inserted). 1 hash lookup pass
+        ins = pos < 0
+        rem = new.index.get_indexer(old.index) < 0
+        ni = np.flatnonzero(~ins)                   # row positions of the common symbols
+        oi = pos[ni]
+        both = new.index[ni]
+        cols = [ c for c in new.columns if c in old.columns and c not in self.ignore ]
+        same = np.ones((len(both), len(cols)), dtype=bool)
+        for i, c in enumerate(cols):                # per column. Keeps numeric compares typed (categoricals compare as values)
+            x = old[c].to_numpy()[oi]
+            y = new[c].to_numpy()[ni]
+            same[:, i] = (x == y) | (pd.isna(x) & pd.isna(y))
+        dirty = ~same.all(axis=1)
+        changed = {}
+        if dirty.any():
+            cols_arr = np.array(cols, dtype=object)
+            for sym, row in zip(both[dirty], ~same[dirty]):
+                changed[sym] = list(cols_arr[row])
+        return cdc_delta(source, cycle, new[ins], old[rem], new.iloc[ni[dirty]], changed)
+
+######################################################################
+# method 4
+    def last(self, source):
+        """Last frame seen for source (keyed by Symbol). None if never diffed"""
+        return self.prev.get(source)
+
+######################################################################
+# method 5
+    def print_stats(self):
+        s = self.stats
+        pct = 100.0 * s['unchanged'] / s['rows'] if s['rows'] else 0.0
+        print ( f"========== Change capture / {len(self.prev)} sources ==========" )
+        print ( f"Frames: {s['frames']} / rows: {s['rows']} / +{s['inserted']} -{s['removed']} ~{s['updated']} / unchanged: {s['unchanged']} ({pct:.0f}%)" )
+        return
+
+######################################################################
+# private helpers
+
+    def keyed(self, df):
+        """Copy indexed by the stripped key. Display padding & dupes removed (last wins)"""
+        out = df.copy()
+        out.index = pd.Index(out[self.key].astype(str).str.strip(), name=None)
+        return out[~out.index.duplicated(keep='last')]
+
+######################################################################
+# Shared stream
+
+shared_stream = None
+
+def get_cdc_stream():
+    """Return the process wide change capture stream (created on 1st use)"""
+    global shared_stream
+    if shared_stream is None:
+        shared_stream = cdc_stream(1)
+    return shared_stream
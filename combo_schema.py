@@ -0,0 +1,95 @@
+#! python3
+import logging
+import pandas as pd
+import numpy as np
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+# Typed schema for combo_df (the combo_logic Single Source of Truth)
+# Producers (top gainers, small caps, unusual vol) hand over padded object columns. Every producer
+# frame is conformed at the combo boundary: validated, unpadded & cast to compact dtypes.
+# - Symbol = category (rebuilt after each merge). M_B & Insights = fixed category sets
+# - Numerics = float32. Strings are stored unpadded. Padding is a display concern only (see display_df())
+
+# Market cap scale tags. Producers emit prefix (L/S) + scale (T/B/M/Z). polish_combo_df() adds the rest
+mb_codes = [ 'LT', 'LB', 'LM', 'LZ', 'ST', 'SB', 'SM', 'SZ', 'MT', 'TM', 'EF', 'UZ' ]
+mb_dtype = pd.CategoricalDtype(mb_codes)
+
+combo_cols = [ 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap', 'M_B' ]
+required_cols = [ 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change' ]   # Mkt_cap & M_B are optional (unusual vol has neither)
+float_cols = [ 'Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap' ]
+display_pad = { 'Symbol': 6, 'Co_name': 60 }
+cap_units = { 'T': 1e12, 'B': 1e9, 'M': 1e6 }          # M_B scale letter -> Mkt_cap unit in USD
+
+def insights_dtype(cx):
+    """Fixed Insights category set, built from the combo_logic scale tag descriptions (cx)"""
+    tags = [ "" ] + list(cx.values()) + [ v + " + ^Un vol" for v in cx.values() ] + [ "^ Un vol only", "!No logic!" ]
+    return pd.CategoricalDtype(list(dict.fromkeys(tags)))
+
+#####################################################
+
+def conform(df, source):
+    """
+    Validate 1 producer frame & return it in combo schema (combo_cols, typed, unpadded).
+    source: producer name for the error message.
+    Raises ValueError if a required column is missing, a numeric column holds non numbers
+    or M_B holds an unknown scale tag. Extra producer columns are dropped.
+    """
+    cmi_debug = __name__+"::"+conform.__name__+"."+source
+    missing = [ c for c in required_cols if c not in df.columns ]
+    if missing:
+        raise ValueError(f"combo_schema: {source} frame is missing columns: {missing}")
+
+    out = pd.DataFrame(index=df.index)
+    for col in combo_cols:
+        if col not in df.columns:
+            out[col] = pd.Series(index=df.index, dtype=object)        # absent optional column -> all NaN
+        elif col in float_cols:
+            try:
+                out[col] = pd.to_numeric(df[col], errors='raise')
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"combo_schema: {source} column {col} is not numeric: {e}") from None
+        elif col == 'M_B':
+            bad = set(df[col].dropna()) - set(mb_codes)
+            if bad:
+                raise ValueError(f"combo_schema: {source} M_B has unknown scale tags: {sorted(bad)}")
+            out[col] = df[col]
+        else:
+            out[col] = df[col].astype(str).str.strip()
+    logging.info( f'%s - {len(out)} rows conformed' % cmi_debug )
+    return cast(out)
+
+def cast(df):
+    """Apply the combo dtypes. Call again after a concat (Symbol categories differ per producer frame)"""
+    types = { c: 'float32' for c in float_cols if c in df.columns }
+    if 'Symbol' in df.columns:
+        types['Symbol'] = 'category'
+    if 'Co_name' in df.columns:
+        types['Co_name'] = 'string'
+    if 'M_B' in df.columns:
+        types['M_B'] = mb_dtype
+    return df.astype(types)
+
+def mkt_cap_usd(df):
+    """
+    Normalized market cap in USD. Mkt_cap is in the unit of its M_B scale letter (2nd char: T / B / M).
+    Z (zero) scale, funds (EF) & missing values = NaN
+    """
+    codes, tags = pd.factorize(df['M_B'])                 # scale looked up once per distinct tag, not per row
+    lut = np.array([ cap_units.get(str(t)[1:2], np.nan) for t in tags ] + [ np.nan ])
+    scale = lut[codes]                                      # code -1 (NaN) -> last
+    return pd.to_numeric(df['Mkt_cap'], errors='coerce').to_numpy(dtype='float64') * scale
+
+def display_df(df):
+    """Copy of df with the classic fixed width Symbol / Co_name padding. For printing only"""
+    view = df.copy()
+    for col, width in display_pad.items():
+        if col in view.columns:
+            view[col] = view[col].astype(object).where(view[col].isna(), view[col].astype(str).str.ljust(width))
+    return view
+
+def memory_kb(df):
+    """Deep memory footprint of df in KB (object strings included)"""
+    return df.memory_usage(deep=True).sum() / 1024
@@ -0,0 +1,229 @@
+#! python3
+import threading
+import bisect
+import math
+import logging
+import pandas as pd
+from rich import print
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+# my private classes & methods
+from combo_schema import combo_cols, conform, cast, insights_dtype
+
+#####################################################
+
+class combo_state:
+    """
+    Incrementally maintained combo_df (the combo_logic Single Source of Truth) for long running mode.
+    Instead of rebuilding combo_df from full producer frames every cycle, apply() takes per source
+    row deltas (cdc_stream) & upserts / removes only the symbols that changed.
+    - Rows are held per (source, symbol). Only the symbol groups a delta touches are retagged
+      (same *Hot* / Insights rules as combo_logic.tag_dupes + tag_uniques)
+    - Sort order (Pct_change desc) is kept in a bisect ordered key list. No full sort per cycle
+    - Missing Mkt_cap repairs (nasdaq.com quotes) are remembered per symbol. Only new symbols are looked up
+    view() renders the current combo_df (cached until the next change).
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    # { cdc source: (combo_schema producer name, concat position) }. Same inputs as combo_logic
+    sources = { 'gainers_top10': ('top_gainers', 0), 'small_caps_top10': ('small_caps', 1), 'uvol_up': ('unusual_vol', 2) }
+    rows = {}               # { (source, symbol): { combo column: value } }
+    groups = {}             # { symbol: set of sources holding it }
+    tags = {}               # { (source, symbol): (Hot, Insights, dropped) }
+    fixes = {}              # { symbol: (Mkt_cap, M_B) } repaired by polish_combo_df()
+    order = []              # sorted [ (-Pct_change, source position, symbol, source) ]
+
+    def __init__(self, yti, cx):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.cx = cx                    # scale tag descriptions (combo_logic.cx)
+        self.lock = threading.Lock()
+        self.rows = {}
+        self.groups = {}
+        self.tags = {}
+        self.fixes = {}
+        self.order = []
+        self.sort_keys = {}             # { (source, symbol): its entry in order }
+        self.cached = None
+        self.stats = { 'deltas': 0, 'upserts': 0, 'removes': 0, 'retagged': 0, 'views': 0 }
+        return
+
+######################################################################
+# method 1
+    def apply(self, delta):
+        """cdc_stream subscriber. Applies 1 source delta. Deltas of other sources are ignored"""
+        cmi_debug = __name__+"::"+self.apply.__name__+".#"+str(self.yti)
+        if delta.source not in self.sources:
+            return
+        name = self.sources[delta.source][0]
+        upserts = pd.concat([ delta.inserted, delta.updated ])
+        new_rows = conform(upserts, name) if len(upserts) else None     # validated at the combo boundary
+        with self.lock:
+            touched = set()
+            for sym in delta.removed.index:
+                self.remove_row(delta.source, sym)
+                touched.add(sym)
+            if new_rows is not None:
+                for rec in new_rows[combo_cols].astype(object).to_dict('records'):
+                    rec['Symbol'] = str(rec['Symbol'])
+                    self.upsert_row(delta.source, rec)
+                    touched.add(rec['Symbol'])
+            for sym in touched:
+                self.retag(sym)
+            self.cached = None
+            self.stats['deltas'] += 1
+        logging.info( f'%s - {delta.source}: {len(touched)} symbols retagged / {len(self.rows)} rows' % cmi_debug )
+        return
+
+######################################################################
+# method 2
+    def view(self):
+        """Current tagged combo_df (Pct_change desc, linear index). Dropped dupe rows are excluded"""
+        with self.lock:
+            if self.cached is None:
+                recs = []
+                for *_, sym, src in self.order:
+                    hot, insights, dropped = self.tags[(src, sym)]
+                    if not dropped:
+                        recs.append(dict(self.rows[(src, sym)], Hot=hot, Insights=insights))
+                df = pd.DataFrame.from_records(recs, columns=combo_cols + [ 'Hot', 'Insights' ])
+                self.cached = cast(df).astype({'Insights': insights_dtype(self.cx)})
+                self.stats['views'] += 1
+            return self.cached
+
+######################################################################
+# method 3
+    def unrepaired(self):
+        """Untagged combo rows of symbols that are missing Mkt_cap & have no repair yet (polish_combo_df input)"""
+        with self.lock:
+            keys = [ (src, sym) for *_, sym, src in self.order
+                     if sym not in self.fixes and self.is_nan(self.rows[(src, sym)]['Mkt_cap']) ]
+            recs = [ self.rows[k] for k in keys ]
+        return cast(pd.DataFrame.from_records(recs, columns=combo_cols))
+
+######################################################################
+# method 4
+    def repair(self, ssot):
+        """
+        Run combo_logic.polish_combo_df() over only the symbols still missing Mkt_cap (network per symbol).
+        The repaired Mkt_cap / M_B are remembered & applied to every later upsert of that symbol.
+        Returns the number of symbols repaired
+        """
+        todo = self.unrepaired()
+        if todo.empty:
+            return 0
+        ssot.combo_df = todo
+        ssot.polish_combo_df(1, prepared=True)
+        fixed = ssot.combo_df.drop_duplicates(subset=['Symbol'], keep='first')
+        with self.lock:
+            for sym, cap, scale in fixed[['Symbol', 'Mkt_cap', 'M_B']].astype(object).itertuples(index=False):
+                sym = str(sym)
+                self.fixes[sym] = (cap, scale)
+                for src in self.groups.get(sym, ()):
+                    self.apply_fix(self.rows[(src, sym)])
+                self.retag(sym)
+            self.cached = None
+        return len(fixed)
+
+######################################################################
+# method 5
+    def symbol_frame(self, symbols):
+        """
+        1 row per symbol (index = Symbol) for rule evaluation. Values of its highest Pct_change row,
+        Hot = *Hot* in any source & 1 bool column per source: in_<source>. Unknown symbols are left out
+        """
+        cols = [ c for c in combo_cols if c != 'Symbol' ]
+        with self.lock:
+            recs = []
+            for sym in symbols:
+                srcs = self.groups.get(sym)
+                if not srcs:
+                    continue
+                best = min(srcs, key=lambda src: self.sort_keys[(src, sym)])
+                rec = { c: self.rows[(best, sym)][c] for c in cols }
+                rec['Hot'] = "*Hot*" if any(self.tags[(src, sym)][0] for src in srcs) else ""
+                for src in self.sources:
+                    rec['in_' + src] = src in srcs
+                rec['Symbol'] = sym
+                recs.append(rec)
+        df = pd.DataFrame.from_records(recs, columns=[ 'Symbol' ] + cols + [ 'Hot' ] + [ 'in_' + s for s in self.sources ])
+        return df.set_index('Symbol').astype({ c: 'float64' for c in ('Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap') })
+
+######################################################################
+# method 6
+    def print_stats(self):
+        s = self.stats
+        print ( f"========== Combo state / {len(self.rows)} rows / {len(self.groups)} symbols ==========" )
+        print ( f"Deltas: {s['deltas']} / upserts: {s['upserts']} / removes: {s['removes']} / retagged: {s['retagged']} / views built: {s['views']}" )
+        return
+
+######################################################################
+# private helpers. Caller holds the lock
+
+    def upsert_row(self, src, rec):
+        key = (src, rec['Symbol'])
+        if key in self.rows:
+            self.unorder(key)
+        self.apply_fix(rec)
+        self.rows[key] = rec
+        self.groups.setdefault(rec['Symbol'], set()).add(src)
+        pct = rec['Pct_change']
+        entry = (-pct if not self.is_nan(pct) else math.inf, self.sources[src][1], rec['Symbol'], src)    # NaN % sorts last
+        bisect.insort(self.order, entry)
+        self.sort_keys[key] = entry
+        self.stats['upserts'] += 1
+        return
+
+    def remove_row(self, src, sym):
+        key = (src, sym)
+        if key not in self.rows:
+            return
+        self.unorder(key)
+        del self.rows[key]
+        self.tags.pop(key, None)
+        self.groups[sym].discard(src)
+        if not self.groups[sym]:
+            del self.groups[sym]
+            self.fixes.pop(sym, None)
+        self.stats['removes'] += 1
+        return
+
+    def unorder(self, key):
+        entry = self.sort_keys.pop(key)
+        i = bisect.bisect_left(self.order, entry)
+        del self.order[i]
+        return
+
+    def apply_fix(self, rec):
+        fix = self.fixes.get(rec['Symbol'])
+        if fix is not None and self.is_nan(rec['Mkt_cap']):
+            rec['Mkt_cap'] = fix[0]
+            if self.is_nan(rec['M_B']):
+                rec['M_B'] = fix[1]
+        return
+
+    def retag(self, sym):
+        """Tag 1 symbol group. Rules of combo_logic.tag_dupes() then tag_uniques()"""
+        srcs = self.groups.get(sym, ())
+        dupe = len(srcs) > 1
+        for src in srcs:
+            rec = self.rows[(src, sym)]
+            has_cap = not self.is_nan(rec['Mkt_cap'])
+            has_scale = not self.is_nan(rec['M_B'])
+            if has_cap and has_scale:
+                insights = self.cx.get(rec['M_B'])
+                tag = ("*Hot*", insights + " + ^Un vol" if insights is not None else None, False) if dupe else ("", insights, False)
+            elif not has_cap and not has_scale:
+                tag = ("", "", True) if dupe else ("", "^ Un vol only", False)
+            else:
+                tag = ("", "!No logic!", False)
+            self.tags[(src, sym)] = tag
+            self.stats['retagged'] += 1
+        return
+
+    def is_nan(self, v):
+        return v is None or bool(pd.isna(v))
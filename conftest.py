@@ -0,0 +1,63 @@
+#! python3
+"""
+Shared test builders, as pytest fixtures. Producer frames built with the real screener DataFrame builder,
+a prepared combo_logic, the change capture feed & the deep_logic wide table. No network access needed.
+"""
+
+import types
+import numpy as np
+import pandas as pd
+import pytest
+from y_screenerdata import y_screenerdata
+from shallow_logic import combo_logic
+
+def quotes(syms, prices, pct):
+    """pct(row, price) -> % change"""
+    return [ {"symbol": s, "shortName": f"{s} Corp", "regularMarketPrice": p, "regularMarketChange": 0.5,
+              "regularMarketChangePercent": pct(i, p), "marketCap": 2.5e9} for i, (s, p) in enumerate(zip(syms, prices)) ]
+
+def producer_frames(top, small, uvol, pct):
+    """top/small/uvol = { symbol: price } -> producer frames, as the collectors build them"""
+    tg = y_screenerdata(1, "L").build_json_df(quotes(top, top.values(), pct), "09:30:00").rename(columns={'Row': 'ERank'})
+    sc = y_screenerdata(1, "S").build_json_df(quotes(small, small.values(), pct), "09:30:00")
+    uv = y_screenerdata(1, "L").build_json_df(quotes(uvol, uvol.values(), pct), "09:30:00").drop(columns=['Mkt_cap', 'M_B'])
+    return tg, sc, uv.assign(Vol=1000, Vol_pct=12.5)
+
+@pytest.fixture
+def frames():
+    """frames(top, small, uvol) -> (tg, sc, uv). % change = price / 7 (so a price move is a % change move)"""
+    return lambda top, small, uvol: producer_frames(top, small, uvol, lambda i, p: p / 7.0)
+
+@pytest.fixture
+def feed():
+    """feed(cdc, tg, sc, uv). Push 1 cycle of producer frames through the change capture stream"""
+    def push(cdc, tg, sc, uv):
+        cdc.diff('gainers_top10', tg)
+        cdc.diff('small_caps_top10', sc)
+        cdc.diff('uvol_up', uv)
+    return push
+
+@pytest.fixture
+def combo():
+    """combo(top, small, uvol) -> combo_logic with combo_df prepared. % change = 1.0 + row / 1000"""
+    def build(top, small, uvol):
+        tg, sc, uv = producer_frames(top, small, uvol, lambda i, p: 1.0 + i / 1000)
+        x = combo_logic(1, types.SimpleNamespace(tg_df1=tg), types.SimpleNamespace(dg1_df1=sc), types.SimpleNamespace(up_df0=uv), {'bool_xray': False})
+        x.prepare_combo_df()
+        return x
+    return build
+
+@pytest.fixture
+def wide():
+    """wide(n, seed) -> deep_logic style wide table (per source suffixed columns)"""
+    def build(n, seed=1):
+        rng = np.random.default_rng(seed)
+        pct_tg = rng.normal(3, 2, n)
+        pct_tg[rng.random(n) < 0.5] = np.nan
+        return pd.DataFrame({ 'Symbol': [ f"S{i}" for i in range(n) ], 'Cur_price': rng.uniform(1, 300, n).astype('float32'),
+                              'Pct_change_tg': pct_tg, 'Pct_change_sc': rng.normal(4, 2, n),
+                              'Vol_pct_uu': np.where(rng.random(n) < 0.3, rng.uniform(0, 500, n), np.nan),
+                              'M_B': pd.Categorical(rng.choice([ 'LT', 'SB', 'SM', None ], n)),
+                              'Hot': np.where(rng.random(n) < 0.1, "*Hot*", ""),
+                              'Bullcount_te': rng.integers(0, 4, n).astype(float), 'Senti_te': rng.normal(0, 1, n) })
+    return build
@@ -0,0 +1,140 @@
+#! python3
+import numpy as np
+import pandas as pd
+import logging
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+# my private classes & methods
+from combo_schema import conform, cast, display_df
+
+#####################################################
+# CLASS
+class deep_logic:
+    """
+    Deep converged view (aop -d/--deep).
+    1 row per symbol (wide table) across every data source collected in this run: gainers, losers,
+    small caps, unusual up/down vol & tech events. Sources are hash joined on the Symbol index.
+    - Shared facts (Co_name, Cur_price, Mkt_cap, M_B) are coalesced. 1st source that has them wins
+    - Per source metrics are kept side by side with a source suffix (e.g. Pct_change_tg, Vol_uu)
+    - Srcs = source presence bitmask (see sources). Nsrc = popcount(Srcs)
+    - Hot = in 2+ of gainers / small caps / unusual up vol (same rule as combo_logic.tag_dupes)
+    """
+
+    # global accessors
+    inst_uid = 0
+    args = []               # class dict to hold global args being passed in from main() methods
+    frames = {}             # { source: symbol indexed frame } staged by add_source()
+    wide_df = None          # DataFrame - the converged wide table (1 row per symbol)
+
+    # { source: (presence bit, column suffix, per source columns) }. Dict order = coalesce priority
+    sources = { 'gainers':     (1,  'tg', [ 'Pct_change', 'Prc_change' ]),
+                'small_caps':  (2,  'sc', [ 'Pct_change', 'Prc_change' ]),
+                'uvol_up':     (4,  'uu', [ 'Pct_change', 'Vol', 'Vol_pct' ]),
+                'losers':      (8,  'tl', [ 'Pct_change', 'Prc_change' ]),
+                'uvol_down':   (16, 'ud', [ 'Pct_change', 'Vol', 'Vol_pct' ]),
+                'tech_events': (32, 'te', [ 'Bullcount', 'Senti' ]),
+                }
+    shared_cols = [ 'Co_name', 'Cur_price', 'Mkt_cap', 'M_B' ]
+    hot_mask = 1 | 2 | 4    # gainers | small caps | unusual up vol
+
+    def __init__(self, yti, global_args):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info('%s - INST_class' % cmi_debug )
+        self.inst_uid = yti
+        self.args = global_args
+        self.frames = {}
+        return
+
+    def __repr__(self):
+        return ( f'{self.__class__.__name__}(' f'{self.inst_uid!r})' )
+
+#############################################################################
+# method #1
+
+    def add_source(self, source, df):
+        """
+        Stage 1 source frame. Validated at the producer boundary & reduced to 1 row per Symbol.
+        Price sources go through the combo schema (combo_schema.conform). Tech events only need Symbol.
+        """
+        cmi_debug = __name__+"::"+self.add_source.__name__+".#"+str(self.inst_uid)
+        if source not in self.sources:
+            raise ValueError(f"deep_logic: unknown source {source}. Expected one of: {list(self.sources)}")
+        bit, tag, cols = self.sources[source]
+        if source == 'tech_events':
+            frame = df[[ 'Symbol' ] + cols].assign(Symbol=df['Symbol'].astype(str).str.strip())
+        else:
+            typed = conform(df, source)
+            frame = typed[[ 'Symbol' ] + self.shared_cols + [ c for c in cols if c in typed.columns ]].copy()
+            for c in cols:
+                if c not in frame.columns:
+                    frame[c] = df[c]                                    # source only metric (e.g. Vol)
+            frame['Symbol'] = frame['Symbol'].astype(str)
+        frame = frame.drop_duplicates(subset=['Symbol'], keep='first').set_index('Symbol')
+        frame['Bit'] = bit
+        self.frames[source] = frame.add_suffix("_"+tag)
+        logging.info( f'%s - {source}: {len(frame)} symbols' % cmi_debug )
+        return
+
+#############################################################################
+# method #2
+
+    def converge(self):
+        """
+        Hash join all staged sources on Symbol (outer) into wide_df.
+        Returns wide_df sorted by Nsrc (most converged first), then Symbol
+        """
+        cmi_debug = __name__+"::"+self.converge.__name__+".#"+str(self.inst_uid)
+        logging.info('%s - IN' % cmi_debug )
+        staged = [ s for s in self.sources if s in self.frames ]         # coalesce priority order
+        if not staged:
+            self.wide_df = pd.DataFrame(columns=[ 'Symbol' ] + self.shared_cols + [ 'Srcs', 'Nsrc', 'Hot' ])
+            return self.wide_df
+
+        wide = pd.concat([ self.frames[s] for s in staged ], axis=1, join='outer', sort=False)
+        out = pd.DataFrame(index=wide.index)
+        for col in self.shared_cols:
+            cands = [ f"{col}_{self.sources[s][1]}" for s in staged if f"{col}_{self.sources[s][1]}" in wide.columns ]
+            out[col] = wide[cands].astype(object).bfill(axis=1).iloc[:, 0] if cands else np.nan
+        for s in staged:
+            tag = self.sources[s][1]
+            for c in self.sources[s][2]:
+                out[f"{c}_{tag}"] = wide[f"{c}_{tag}"]
+
+        bits = wide[[ "Bit_"+self.sources[s][1] for s in staged ]].fillna(0).astype('int64').sum(axis=1).to_numpy()
+        out['Srcs'] = bits.astype('int32')
+        out['Nsrc'] = np.bitwise_count(bits).astype('int32')
+        out['Hot'] = np.where(np.bitwise_count(bits & self.hot_mask) >= 2, "*Hot*", "")
+
+        out = cast(out.rename_axis('Symbol').reset_index())
+        self.wide_df = out.sort_values(by=['Nsrc', 'Symbol'], ascending=[False, True], ignore_index=True)
+        logging.info( f'%s - {len(self.wide_df)} symbols from {len(staged)} sources' % cmi_debug )
+        return self.wide_df
+
+#############################################################################
+# method #3
+
+    def in_sources(self, *sources):
+        """Rows present in ALL the named sources (bitmask test, no scans)"""
+        want = 0
+        for s in sources:
+            want |= self.sources[s][0]
+        return self.wide_df[(self.wide_df['Srcs'] & want) == want]
+
+#############################################################################
+# method #4
+
+    def hottest(self):
+        """*Hot* rows. Most converged first, then the cheapest"""
+        hot = self.wide_df[self.wide_df['Hot'] == "*Hot*"]
+        return hot.sort_values(by=['Nsrc', 'Cur_price'], ascending=[False, True])
+
+#############################################################################
+# method #5
+
+    def deep_listall(self):
+        """Print ready copy of the full wide table (padded names)"""
+        pd.set_option('display.max_rows', None)
+        pd.set_option('max_colwidth', 40)
+        return display_df(self.wide_df)
@@ -0,0 +1,135 @@
+#! python3
+import threading
+import time
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from rich import print
+
+try:
+    import lxml                     # optional: C parser. Falls back to the pure python html.parser
+except ImportError:
+    lxml = None
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class html_backend:
+    """
+    Pluggable HTML parser backend for all BS4 consumers (bigcharts, marketwatch, tech events, news, screener fallbacks)
+    - Default parser is lxml (C tokenizer). Falls back to the pure python html.parser if lxml isnt installed
+    - Zone targeting: most consumers only need 1 zone of a big page (id="quote", <tbody>, mainContent, article body).
+      soup(markup, name, attrs) builds the tree for those zones only (SoupStrainer). Everything else is skipped
+    - The returned object is a normal BeautifulSoup doc, so existing find() / find_all() code runs unchanged
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    parser = "lxml" if lxml is not None else "html.parser"
+    strainers = {}          # { (name, attrs): SoupStrainer } built once, reused for every page
+    stats = {}              # { parser: [ docs, bytes, secs ] }
+
+    def __init__(self, yti, parser=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        if parser is not None:
+            self.set_parser(parser)
+        self.lock = threading.Lock()
+        self.strainers = {}
+        self.stats = {}
+        return
+
+######################################################################
+# method 1
+    def set_parser(self, parser):
+        """Select the parser: lxml | html.parser | html5lib. lxml silently degrades to html.parser if not installed"""
+        cmi_debug = __name__+"::"+self.set_parser.__name__+".#"+str(self.yti)
+        if parser == "lxml" and lxml is None:
+            logging.warning( f'%s - lxml not installed / using html.parser' % cmi_debug )
+            parser = "html.parser"
+        self.parser = parser
+        return parser
+
+######################################################################
+# method 2
+    def soup(self, markup, name=None, attrs=None, parser=None):
+        """
+        Parse markup (str or bytes) into a BeautifulSoup doc.
+        name/attrs: only build the zones that match (same args as find()). None = whole document.
+        A zone keeps all its descendants. Nested matches are kept inside the outer zone.
+        """
+        parser = self.parser if parser is None else parser
+        t0 = time.perf_counter()
+        if name is None and attrs is None:
+            doc = BeautifulSoup(markup, parser)
+        else:
+            doc = BeautifulSoup(markup, parser, parse_only=self.strainer(name, attrs))
+        self.record(parser, len(markup), time.perf_counter() - t0)
+        return doc
+
+######################################################################
+# method 3
+    def strainer(self, name=None, attrs=None):
+        key = (repr(name), repr(attrs))
+        s = self.strainers.get(key)
+        if s is None:
+            s = SoupStrainer(name, attrs or {})
+            self.strainers[key] = s
+        return s
+
+######################################################################
+# method 4
+    def record(self, parser, nbytes, secs):
+        with self.lock:
+            s = self.stats.setdefault(parser, [0, 0, 0.0])
+            s[0] += 1
+            s[1] += nbytes
+            s[2] += secs
+        return
+
+######################################################################
+# method 5
+    def benchmark(self, markup, name=None, attrs=None, rounds=5):
+        """
+        Time 1 page with each backend. Returns { backend: best secs }
+        html.parser = the original full page parse. lxml = full page. lxml+zone = zone targeted
+        """
+        runs = { 'html.parser': ("html.parser", None, None) }
+        if lxml is not None:
+            runs['lxml'] = ("lxml", None, None)
+            if name is not None or attrs is not None:
+                runs['lxml+zone'] = ("lxml", name, attrs)
+        results = {}
+        for k, (parser, n, a) in runs.items():
+            best = None
+            for _ in range(rounds):
+                t0 = time.perf_counter()
+                if n is None and a is None:
+                    BeautifulSoup(markup, parser)
+                else:
+                    BeautifulSoup(markup, parser, parse_only=self.strainer(n, a))
+                t = time.perf_counter() - t0
+                best = t if best is None else min(best, t)
+            results[k] = best
+        return results
+
+######################################################################
+# method 6
+    def print_stats(self):
+        for parser, (docs, nbytes, secs) in self.stats.items():
+            print ( f"HTML parser: {parser:<12} docs: {docs} / {nbytes/1024:.0f} KB / {secs:.2f}s" )
+        return
+
+######################################################################
+# Shared backend. All BS4 consumers parse through 1 backend (1 parser choice, shared strainers & stats)
+
+shared_backend = None
+
+def get_html_backend():
+    """Return the process wide HTML parser backend (created on 1st use)"""
+    global shared_backend
+    if shared_backend is None:
+        shared_backend = html_backend(1)
+    return shared_backend
@@ -0,0 +1,180 @@
+#! python3
+import concurrent.futures
+import threading
+import random
+import heapq
+import time
+import logging
+from rich import print
+
+from net_fetcher import get_fetcher
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class sched_job:
+    """1 scheduled job & its run stats"""
+
+    def __init__(self, name, fn, interval, jitter, deadline, sessions=None):
+        self.name = name
+        self.fn = fn                    # no args. Raises on failure
+        self.interval = interval        # secs between planned starts (fixed rate). Base interval if market aware
+        self.sessions = sessions        # market sessions the job polls in (see market_calendar). None = always, fixed rate
+        self.jitter = jitter            # +/- fraction of interval added to each start
+        self.deadline = deadline        # secs budget per run (None = no budget)
+        self.planned = 0.0              # monotonic time of the next planned start (before jitter)
+        self.running = False
+        self.runs = 0
+        self.fails = 0
+        self.skips = 0                  # starts skipped b/c the previous run was still going
+        self.overruns = 0               # runs that went past their deadline
+        self.last_secs = 0.0
+        self.total_secs = 0.0
+        return
+
+#####################################################
+
+class job_scheduler:
+    """
+    Interval scheduler for long running (daemon) mode. Runs each collector job on its own interval.
+    - Fixed rate starts + jitter. A slow run doesnt shift the schedule & jobs dont all fire in lock step
+    - Overlap prevention: a job is never started while its previous run is still going (counted as a skip)
+    - Per job deadline: the run's blocking fetches are clipped to it (net_policy.begin_job). Overruns are counted
+    - Jobs run on a bounded worker pool. The scheduler thread itself never runs job code
+    - Market aware (calendar set + job sessions): the interval follows the market session. Burst at the open
+      & close, slower pre/after market, no polling while the market is closed (see market_calendar)
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    workers = 2             # worker pool size (max jobs running at once)
+    jobs = {}               # { name: sched_job }
+    executor = None         # concurrent.futures.ThreadPoolExecutor
+    calendar = None         # market_calendar. None = fixed intervals for every job
+
+    def __init__(self, yti, workers=2, seed=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.workers = workers
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.rng = random.Random(seed)
+        return
+
+######################################################################
+# method 1
+    def add_job(self, name, fn, interval, jitter=0.1, deadline=None, first_delay=0.0, sessions=None):
+        """
+        Register a job. first_delay = secs before its 1st run (stagger jobs at start up)
+        sessions = market sessions the job polls in e.g. ('pre', 'regular', 'after'). None = fixed interval
+        """
+        job = sched_job(name, fn, interval, jitter, deadline, sessions)
+        job.planned = time.monotonic() + first_delay
+        self.jobs[name] = job
+        return job
+
+######################################################################
+# method 2
+    def run(self, duration=None):
+        """
+        Scheduler loop. Blocks until stop() or duration secs have passed. Running jobs are waited on
+        """
+        cmi_debug = __name__+"::"+self.run.__name__+".#"+str(self.yti)
+        logging.info( f'%s - Start {len(self.jobs)} jobs / {self.workers} workers' % cmi_debug )
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="aop_job")
+        end = None if duration is None else time.monotonic() + duration
+        queue = [ (self.start_time(j), j.name) for j in self.jobs.values() ]
+        heapq.heapify(queue)
+        try:
+            while queue and not self.stop_event.is_set():
+                due, name = queue[0]
+                now = time.monotonic()
+                if end is not None and now >= end:
+                    break
+                if due > now:
+                    self.stop_event.wait((due if end is None else min(due, end)) - now)
+                    continue
+                heapq.heappop(queue)
+                job = self.jobs[name]
+                self.dispatch(job)
+                wait = self.next_wait(job)
+                job.planned += wait
+                if job.planned < now:                       # fell behind (long overrun / host asleep). Dont burst
+                    job.planned = now + wait
+                heapq.heappush(queue, (self.start_time(job), name))
+        finally:
+            self.executor.shutdown(wait=True)
+            logging.info( f'%s - Scheduler stopped' % cmi_debug )
+        return
+
+######################################################################
+# method 3
+    def dispatch(self, job):
+        """Start 1 run on the worker pool, unless the previous run is still going"""
+        cmi_debug = __name__+"::"+self.dispatch.__name__+".#"+str(self.yti)
+        with self.lock:
+            if job.running:
+                job.skips += 1
+                logging.info( f'%s - {job.name} still running / start skipped' % cmi_debug )
+                return False
+            job.running = True
+        self.executor.submit(self.run_job, job)
+        return True
+
+######################################################################
+# method 4
+    def run_job(self, job):
+        """Worker side. 1 run under the job's deadline budget"""
+        cmi_debug = __name__+"::"+self.run_job.__name__+".#"+str(self.yti)
+        policy = get_fetcher().policy
+        policy.begin_job(job.name, job.deadline)
+        t0 = time.monotonic()
+        try:
+            job.fn()
+        except Exception as e:
+            job.fails += 1
+            logging.warning( f'%s - {job.name} failed: {e}' % cmi_debug )
+        finally:
+            policy.end_job()
+            secs = time.monotonic() - t0
+            with self.lock:
+                job.running = False
+                job.runs += 1
+                job.last_secs = secs
+                job.total_secs += secs
+                if job.deadline is not None and secs > job.deadline:
+                    job.overruns += 1
+        return
+
+######################################################################
+# method 5
+    def stop(self):
+        self.stop_event.set()
+        return
+
+######################################################################
+# method 6
+    def print_stats(self):
+        print ( f"========== Scheduler / {len(self.jobs)} jobs / {self.workers} workers ==========" )
+        for j in self.jobs.values():
+            avg = j.total_secs / j.runs if j.runs else 0.0
+            print ( f"{j.name:<12} every {j.interval:>5}s / runs: {j.runs} / fails: {j.fails} / skipped: {j.skips} / overruns: {j.overruns} / avg: {avg:.1f}s" )
+        return
+
+######################################################################
+# private helpers
+
+    def next_wait(self, job):
+        """Secs from this start to the next planned one. Market aware jobs ask the calendar"""
+        if self.calendar is None or job.sessions is None:
+            return job.interval
+        return self.calendar.poll_interval(job.interval, job.sessions)
+
+    def start_time(self, job):
+        """Planned start + jitter (+/- jitter x interval). Never before now"""
+        j = job.interval * job.jitter
+        return max(time.monotonic(), job.planned + self.rng.uniform(-j, j))
@@ -0,0 +1,156 @@
+#! python3
+import datetime
+import logging
+
+try:
+    from zoneinfo import ZoneInfo                   # needs the system tz database (or the tzdata package)
+    market_tz = ZoneInfo("America/New_York")
+except Exception:
+    market_tz = None
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+# US equity market holidays (NYSE/Nasdaq). Full closures & early (13:00 ET) closes.
+# Local table. Extend it each year from the exchange calendar.
+
+holidays = { '2025-01-01', '2025-01-09', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26', '2025-06-19',
+             '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25',
+             '2026-01-01', '2026-01-19', '2026-02-16', '2026-04-03', '2026-05-25', '2026-06-19', '2026-07-03',
+             '2026-09-07', '2026-11-26', '2026-12-25',
+             '2027-01-01', '2027-01-18', '2027-02-15', '2027-03-26', '2027-05-31', '2027-06-18', '2027-07-05',
+             '2027-09-06', '2027-11-25', '2027-12-24' }
+
+early_closes = { '2025-07-03', '2025-11-28', '2025-12-24',
+                 '2026-11-27', '2026-12-24',
+                 '2027-11-26' }
+
+#####################################################
+
+class market_calendar:
+    """
+    Market session clock (US equities, America/New_York).
+    Sessions: pre (04:00-09:30) / regular (09:30-16:00, 13:00 on early close days) / after (close-20:00) / closed.
+    The regular session has 2 burst phases: open_burst (1st 30 mins) & close_burst (last 30 mins), when the lists churn fastest.
+    poll_interval() turns a collector's base interval into a market aware one:
+    - faster in the bursts, normal in regular hours, slower pre/after market
+    - closed (nights, weekends, holidays) = wait until the next session the collector cares about
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    pre_open = datetime.time(4, 0)
+    regular_open = datetime.time(9, 30)
+    regular_close = datetime.time(16, 0)
+    early_close = datetime.time(13, 0)
+    after_close = datetime.time(20, 0)
+    burst_mins = 30         # open_burst / close_burst length
+    # poll interval multiplier per phase
+    factors = { 'open_burst': 0.5, 'regular': 1.0, 'close_burst': 0.5, 'pre': 4.0, 'after': 4.0 }
+    coarse = { 'open_burst': 'regular', 'regular': 'regular', 'close_burst': 'regular', 'pre': 'pre', 'after': 'after', 'closed': 'closed' }
+
+    def __init__(self, yti):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        if market_tz is None:
+            logging.warning( f'%s - No tz database / market times assume the local clock is US/Eastern' % cmi_debug )
+        return
+
+######################################################################
+# method 1
+    def now(self):
+        """Current market time (tz aware if the tz database is available)"""
+        return datetime.datetime.now(market_tz)
+
+    def market_time(self, now):
+        """None = now. tz aware times are converted to market time. Naive times are taken as market time"""
+        if now is None:
+            return self.now()
+        if now.tzinfo is not None and market_tz is not None:
+            return now.astimezone(market_tz)
+        return now
+
+######################################################################
+# method 2
+    def is_trading_day(self, day):
+        return day.weekday() < 5 and day.isoformat() not in holidays
+
+######################################################################
+# method 3
+    def hours(self, day):
+        """{ session: (start, end) } market times for 1 trading day"""
+        close = self.early_close if day.isoformat() in early_closes else self.regular_close
+        return { 'pre': (self.pre_open, self.regular_open),
+                 'regular': (self.regular_open, close),
+                 'after': (close, self.after_close) }
+
+######################################################################
+# method 4
+    def phase(self, now=None):
+        """closed | pre | open_burst | regular | close_burst | after"""
+        now = self.market_time(now)
+        day, t = now.date(), now.time()
+        if not self.is_trading_day(day):
+            return 'closed'
+        for session, (start, end) in self.hours(day).items():
+            if start <= t < end:
+                if session != 'regular':
+                    return session
+                mins_in = (now - now.replace(hour=start.hour, minute=start.minute, second=0, microsecond=0)).total_seconds() / 60
+                mins_left = (now.replace(hour=end.hour, minute=end.minute, second=0, microsecond=0) - now).total_seconds() / 60
+                if mins_in < self.burst_mins:
+                    return 'open_burst'
+                if mins_left <= self.burst_mins:
+                    return 'close_burst'
+                return 'regular'
+        return 'closed'
+
+    def session(self, now=None):
+        """closed | pre | regular | after"""
+        return self.coarse[self.phase(now)]
+
+######################################################################
+# method 5
+    def next_start(self, sessions, now=None):
+        """Market time when the next of these sessions starts (after now). None if none in the next 2 weeks"""
+        now = self.market_time(now)
+        for d in range(15):
+            day = now.date() + datetime.timedelta(days=d)
+            if not self.is_trading_day(day):
+                continue
+            starts = sorted(start for s, (start, end) in self.hours(day).items() if s in sessions)
+            for start in starts:
+                at = now.replace(year=day.year, month=day.month, day=day.day, hour=start.hour, minute=start.minute, second=0, microsecond=0)
+                if at > now:
+                    return at
+        return None
+
+######################################################################
+# method 6
+    def poll_interval(self, base, sessions=('pre', 'regular', 'after'), now=None):
+        """
+        Secs until a collector with this base interval should poll again.
+        sessions = the sessions the collector's data changes in. Outside them = secs until the next one starts
+        """
+        now = self.market_time(now)
+        phase = self.phase(now)
+        if self.coarse[phase] in sessions:
+            return base * self.factors[phase]
+        nxt = self.next_start(sessions, now)
+        if nxt is None:
+            return base * 60
+        return max(nxt.timestamp() - now.timestamp(), 1.0)        # via UTC. Correct across a DST switch
+
+######################################################################
+# Shared calendar
+
+shared_calendar = None
+
+def get_market_calendar():
+    """Return the process wide market calendar (created on 1st use)"""
+    global shared_calendar
+    if shared_calendar is None:
+        shared_calendar = market_calendar(1)
+    return shared_calendar
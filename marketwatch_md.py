@@ -1,9 +1,10 @@
 #! python3
-from bs4 import BeautifulSoup
 import urllib
 import re
 import logging
 
+from html_backend import get_html_backend
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 
@@ -97,7 +98,7 @@ class mw_quote:
             #s = url.text
             #data_soup = BeautifulSoup(resp.text, "html.parser")
             print ( f" ------------------ BS4.html.parse ---------------------" )
-            data_soup = BeautifulSoup(s, "html.parser")
+            data_soup = get_html_backend().soup(s)
             print ( data_soup )
 
         """
@@ -175,7 +176,7 @@ class mw_quote:
 
         with urllib.request.urlopen( f"{url_endpoint}{ticker}" ) as url:
             s = url.read()
-            data_soup = BeautifulSoup(s, "html.parser")
+            data_soup = get_html_backend().soup(s, ["h1", "table"] )          # zones: h1.quote, table#quote, table.financials
             qq_head = data_soup.find("h1", attrs={"class": "quote"} )
             qq_head_co = qq_head.find_all('div')[0]
             qq_head_data = qq_head.find_all('div')[3]
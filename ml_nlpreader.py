@@ -93,7 +93,7 @@ class ml_nlpreader:
         hpath = '/quote/' + news_symbol + '/news?p=' + news_symbol
         self.yfn.update_headers(hpath)
         self.yfn.form_url_endpoint(news_symbol)
-        hash_state = self.yfn.do_js_get(0)           # get() & process the page html/JS data
+        hash_state = self.yfn.do_auto_get(0)         # get() & process the page html (JS render only if needed)
         self.mlnlp_uh = url_hinter(1, self.args)     # create instance of urh hinter
         self.yfn.yfn_uh = self.mlnlp_uh              # send it outside to our YFN News reader instance
        
@@ -0,0 +1,167 @@
+#! python3
+from urllib.parse import urlparse
+from requests_html import HTML
+import threading
+import json
+import os
+import re
+import logging
+
+from render_pool import get_render_pool
+from net_fetcher import get_fetcher
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class render_hinter:
+    """
+    Adaptive fetch mode. Learns (per URL pattern) if a page needs the JAVAScript render engine.
+    1. Try the cheap plain HTML response first & look for the expected data zones (e.g. tbody, .mainContent)
+    2. Escalate to a JS render (shared render pool) only when those zones are missing
+    3. Remember the outcome per URL pattern, so later fetches skip the failed cheap attempt
+    Hints are persisted to disk & survive across runs.
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    hints = {}              # { url_pattern: {'html_ok': n, 'html_miss': n, 'js_ok': n, 'js_miss': n} }
+    reprobe_every = 25      # re-try cheap HTML every N fetches of a JS-learned pattern (pages do change)
+    hint_file = os.path.join(os.path.expanduser("~"), ".aop", "render_hints.json")
+
+    # path segments that are ticker symbols (e.g. /quote/IBM/news) or article slugs (.../some-story-123.html)
+    ticker_rx = re.compile(r'^(?=.*[A-Z])[A-Z0-9\.\^=\-]{1,12}$')
+    article_rx = re.compile(r'^.+\.html?$')
+
+    def __init__(self, yti, hint_file=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        if hint_file is not None:
+            self.hint_file = hint_file
+        self.lock = threading.Lock()
+        self.hints = {}
+        self.load_hints()
+        return
+
+# method #1
+    def url_pattern(self, url):
+        """
+        Reduce a URL to its pattern. Ticker symbols & article slugs are wildcarded, query string is dropped.
+        e.g. https://finance.yahoo.com/quote/IBM/news?p=IBM  ->  finance.yahoo.com/quote/*/news
+        """
+        u = urlparse(url)
+        segs = []
+        for s in u.path.split('/'):
+            if self.ticker_rx.match(s):
+                segs.append('*')
+            elif self.article_rx.match(s):
+                segs.append('*.html')
+            else:
+                segs.append(s)
+        return u.netloc + '/'.join(segs)
+
+# method #2
+    def decide(self, pattern):
+        """
+        Return the learned fetch mode for this URL pattern: html | js
+        Unknown patterns always start with the cheap html attempt.
+        """
+        h = self.hints.get(pattern)
+        if h is None:
+            return "html"
+        if h['html_miss'] > h['html_ok']:
+            if (h['js_ok'] + h['js_miss']) % self.reprobe_every == 0:
+                return "html"                   # periodic re-probe. Page may not need JS anymore
+            return "js"
+        return "html"
+
+# method #3
+    def learn(self, pattern, outcome):
+        """Record an outcome (html_ok | html_miss | js_ok | js_miss) for this URL pattern & persist it"""
+        cmi_debug = __name__+"::"+self.learn.__name__+".#"+str(self.yti)
+        with self.lock:
+            h = self.hints.setdefault(pattern, {'html_ok': 0, 'html_miss': 0, 'js_ok': 0, 'js_miss': 0})
+            h[outcome] += 1
+            logging.info( f'%s - {pattern} : {outcome} / {h}' % cmi_debug )
+            self.save_hints()
+        return
+
+# method #4
+    def zones_found(self, html, zones):
+        """True if ANY of the expected data zones (CSS selectors) exist in the page"""
+        for z in zones:
+            if html.find(z, first=True) is not None:
+                return True
+        return False
+
+# method #5
+    def adapt(self, resp, zones):
+        """
+        Make sure a response has its data zones, rendering the page with JS only if we must.
+        resp.html is rendered IN PLACE (same as requests_html html.render()), resp is returned.
+        """
+        cmi_debug = __name__+"::"+self.adapt.__name__+".#"+str(self.yti)
+        pattern = self.url_pattern(resp.url)
+        if not hasattr(resp, 'html'):                   # plain requests Response -> give it a requests_html view
+            resp.html = HTML(html=resp.text, url=resp.url)
+
+        mode = self.decide(pattern)
+        logging.info( f'%s - {pattern} / learned mode: {mode}' % cmi_debug )
+        if mode == "html":
+            if self.zones_found(resp.html, zones):
+                self.learn(pattern, 'html_ok')
+                return resp
+            self.learn(pattern, 'html_miss')
+            logging.info( f'%s - Zones {zones} missing in plain HTML / escalate to JS render' % cmi_debug )
+
+        try:
+            get_render_pool().render(resp.html)
+        except Exception as e:
+            logging.warning( f'%s - JS render failed: {e} / use plain HTML' % cmi_debug )
+            return resp
+
+        self.learn(pattern, 'js_ok' if self.zones_found(resp.html, zones) else 'js_miss')
+        return resp
+
+# method #6
+    def fetch(self, session, url, zones, **kwargs):
+        """Adaptive get(): plain HTML first, JS render only if the data zones are missing"""
+        resp = get_fetcher().get(url, session=session, **kwargs)
+        return self.adapt(resp, zones)
+
+# method #7
+    def load_hints(self):
+        cmi_debug = __name__+"::"+self.load_hints.__name__+".#"+str(self.yti)
+        try:
+            with open(self.hint_file) as f:
+                self.hints = json.load(f)
+            logging.info( f'%s - Loaded {len(self.hints)} render hints' % cmi_debug )
+        except (OSError, ValueError):
+            self.hints = {}
+        return
+
+# method #8
+    def save_hints(self):
+        try:
+            os.makedirs(os.path.dirname(self.hint_file), exist_ok=True)
+            tmp = self.hint_file + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.hints, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.hint_file)     # atomic swap. Never leave a half written hints file
+        except OSError as e:
+            logging.info( f'render_hinter::save_hints - cant persist hints: {e}' )
+        return
+
+######################################################################
+# Shared hinter. All fetchers learn into (and benefit from) the same hints
+
+shared_hinter = None
+
+def get_render_hinter():
+    """Return the process wide render hinter (created on 1st use)"""
+    global shared_hinter
+    if shared_hinter is None:
+        shared_hinter = render_hinter(1)
+    return shared_hinter
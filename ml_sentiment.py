@@ -8,6 +8,7 @@ import argparse
 from rich import print
 
 from ml_cvbow import ml_cvbow
+from row_buffer import row_buffer
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from transformers import pipeline
@@ -38,6 +39,7 @@ class ml_sentiment:
 
         self.args = global_args                            # Only set once per INIT. all methods are set globally
         self.yti = yti
+        self.sen_rows = row_buffer(yti, [ 'Row', 'Symbol', 'Article', 'Chunk', 'Sent', 'Rank' ] )  # 1 row per sentiment chunk
         #yfn = yfnews_reader(1, "IBM", global_args )        # instantiate a class of fyn with dummy info
         return
 
@@ -63,16 +65,15 @@ class ml_sentiment:
         # now construct our list for concatinating to the dataframe 
         logging.info( f"%s ============= Data prepared for DF =============" % cmi_debug )
         # sen_package = dict(sym=symbol, article=item_idx, chunk=i, sent=sen_result['label'], rank=raw_score )
-        self.sen_data = [[ \
+        self.sen_data = [ \
                     x, \
                     sym, \
                     art, \
                     chk, \
                     snt, \
-                    rnk ]]
+                    rnk ]
         
-        self.df0_row = pd.DataFrame(self.sen_data, columns=[ 'Row', 'Symbol', 'Article', 'Chunk', 'Sent', 'Rank' ], index=[x] )
-        self.sen_df0 = pd.concat([self.sen_df0, self.df0_row])
+        self.sen_rows.append(self.sen_data)         # sen_df0 is built once by build_sen_df()
 
         self.df0_row_count = x
 
@@ -82,7 +83,7 @@ class ml_sentiment:
     def compute_sentiment(self, symbol, item_idx, scentxt):
         """
         Tokenize and compute scentcen chunk sentiment
-        scentxtx = BS4 all <p> zones that look/feel like scentence/paragraph text
+        scentxt = TEXT of all <p> zones that look/feel like scentence/paragraph text (extracted by the parse pool)
         """
         self.yti = item_idx
         cmi_debug = __name__+"::"+self.compute_sentiment.__name__+".#"+str(self.yti)
@@ -98,18 +99,19 @@ class ml_sentiment:
         self.twc = 0
         print ( f"==== M/L NLP transformer @ max tokens: {tokenizer_mml} : for News article [ {item_idx} ] ====================")
         for i in range(0, len(scentxt)):    # cycle through all scentenses/paragraphs sent to us
-            ngram_count = len(re.findall(r'\w+', scentxt[i].text))
-            ngram_tkzed = word_tokenize(scentxt[i].text)
+            chunk = scentxt[i]
+            ngram_count = len(re.findall(r'\w+', chunk))
+            ngram_tkzed = word_tokenize(chunk)
             self.ttc += int(len(ngram_tkzed))           # total vectroized tokensgenrated by tokenizer 
-            if vectorz.is_scentence(scentxt[i].text):
+            if vectorz.is_scentence(chunk):
                 chunk_type = "Scent"
-            elif vectorz.is_paragraph(scentxt[i].text):
+            elif vectorz.is_paragraph(chunk):
                 chunk_type = "Parag"
             else:
                 chunk_type = "Randm"
-            p_sentiment = classifier(scentxt[i].text, truncation=True)      # WARN: truncating long scentences !!!
+            p_sentiment = classifier(chunk, truncation=True)      # WARN: truncating long scentences !!!
 
-            print ( f"Chunk: {i:03} / {chunk_type} / [ n-grams: {ngram_count:03} / tokens: {len(ngram_tkzed):03} / alphas: {len(scentxt[i].text):03} ]", end="" )
+            print ( f"Chunk: {i:03} / {chunk_type} / [ n-grams: {ngram_count:03} / tokens: {len(ngram_tkzed):03} / alphas: {len(chunk):03} ]", end="" )
             ngram_sw_remv = [word for word in ngram_tkzed if word.lower() not in stop_words]    # remove stopwords
             ngram_final = ' '.join(ngram_sw_remv)   # reform the scentence
 
@@ -141,4 +143,15 @@ class ml_sentiment:
             except ValueError:
                 print ( f"Empty vocabulary !!")
 
-        return self.ttc, self.twc, i
\ No newline at end of file
+        return self.ttc, self.twc, i
+
+##################################### 3 ####################################
+    def build_sen_df(self):
+        """
+        Build the global sentiment DataFrame (sen_df0) from all the chunks saved so far.
+        Index = Row (starts at 1)
+        """
+        cmi_debug = __name__+"::"+self.build_sen_df.__name__+".#"+str(self.yti)
+        logging.info( f'%s - Build sentiment DF from {len(self.sen_rows)} chunks' % cmi_debug )
+        self.sen_df0 = self.sen_rows.to_df(index=1)
+        return self.sen_df0
@@ -1,6 +1,5 @@
 #! python3
 from requests_html import HTMLSession
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 from datetime import datetime, date
 import hashlib
@@ -11,6 +10,11 @@ import time
 from rich import print
 from rich.markup import escape
 
+from render_pool import get_render_pool
+from ml_renderhinter import get_render_hinter
+from net_fetcher import get_fetcher
+from parse_pool import get_parse_pool, extract_news_feed, extract_news_page
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 
@@ -34,12 +38,11 @@ class yfnews_reader:
     ml_brief = []           # ML TXT matrix for Naieve Bayes Classifier pre Count Vectorizer
     ml_ingest = {}          # ML ingested NLP candidate articles
     ml_sent = None
-    ul_tag_dataset = None   # BS4 handle of the <tr> extracted data
-    li_superclass = None    # all possible News articles
+    news_feed = None        # news feed page extracted by the parse pool (news zone stats + all possible News articles)
     yti = 0                 # Unique instance identifier
     cycle = 0               # class thread loop counter
     nlp_x = 0
-    nsoup = None            # BS4 shared handle between UP & DOWN (1 URL, 2 embeded data sets in HTML doc)
+    npage = None            # news page extracted by the parse pool. Shared between UP & DOWN (interpret_page() / extract_article_data())
     args = []               # class dict to hold global args being passed in from main() methods
     yfn_uh = None           # global url hinter class
     url_netloc = None
@@ -144,7 +147,7 @@ class yfnews_reader:
         Overwrites js_resp0 - initial session handle, *NOT* the main data session handle (js_resp2)
         """
 
-        with self.js_session.get(id_url, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp0:
+        with get_fetcher().get(id_url, session=self.js_session, cache=False, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp0:
             logging.info('%s - extract & update GOOD cookie  ' % cmi_debug )
             # self.js_session.cookies.update({'B': self.js_resp0.cookies['B']} )    # yahoo cookie hack
             # if the get() succeds, the response handle is automatically saved in Class Global accessor -> self.js_resp0
@@ -162,10 +165,10 @@ class yfnews_reader:
         cmi_debug = __name__+"::"+self.do_js_get.__name__+".#"+str(self.yti)+"."+str(idx_x)
         logging.info( f'ml_yahoofinews::do_js_get.#{self.yti}.#{idx_x}   - URL: %s', self.yfqnews_url )
 
-        with self.js_session.get(self.yfqnews_url, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp2:
+        with get_fetcher().get(self.yfqnews_url, session=self.js_session, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp2:
             logging.info('%s    - Javascript engine processing...' % cmi_debug )
             # on scussess, raw HTML (non-JS) response is saved in Class Global accessor -> self.js_resp2
-            self.js_resp2.html.render()
+            get_render_pool().render(self.js_resp2.html)     # borrow a warm page from the shared pool
             # TODO: should do some get() failure testing here
             logging.info( f'%s    - JS rendered! - store JS dataset [ {idx_x} ]' % cmi_debug )
             self.yfn_jsdata = self.js_resp2.text                # store Full JAVAScript dataset TEXT page
@@ -183,6 +186,29 @@ class yfnews_reader:
 
         return aurl_hash
 
+###################################### 7 ###########################################
+# method 8.1
+    def do_auto_get(self, idx_x):
+        """
+        ADAPTIVE version of do_js_get()
+        Plain HTML is tried 1st & the JAVAScript engine is only used if the news zone (mainContent) is missing.
+        The outcome is learned per URL pattern by the render hinter (so later news pages skip the failed cheap attempt)
+        ALLWAYS create a CACHE entry in js cache DB
+        Return hash of url that was read
+        """
+        cmi_debug = __name__+"::"+self.do_auto_get.__name__+".#"+str(self.yti)+"."+str(idx_x)
+        logging.info( f'ml_yahoofinews::do_auto_get.#{self.yti}.#{idx_x} - URL: %s', self.yfqnews_url )
+
+        with get_render_hinter().fetch(self.js_session, self.yfqnews_url, ['.mainContent'], headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp2:
+            logging.info( f'%s  - Adaptive get() done - store dataset [ {idx_x} ]' % cmi_debug )
+            self.yfn_jsdata = self.js_resp2.text                # store Full dataset TEXT page
+            auh = hashlib.sha256(self.yfqnews_url.encode())     # hash the url
+            aurl_hash = auh.hexdigest()
+            logging.info( f'%s  - CREATED cache entry: [ {aurl_hash} ]' % cmi_debug )
+            self.yfn_jsdb[aurl_hash] = self.js_resp2            # create CACHE entry in jsdb !! just response, not full page TEXT data !!
+
+        return aurl_hash
+
 ###################################### 7 ###########################################
 # Possibly DEPRICATED - Delete me ?
     def do_simple_get(self, url):
@@ -194,7 +220,7 @@ class yfnews_reader:
         cmi_debug = __name__+"::"+self.do_simple_get.__name__+".#"+str(self.yti)+" - ">url
         logging.info( f'%s' % cmi_debug )
 
-        with self.js_session.get(url, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp0:
+        with get_fetcher().get(url, session=self.js_session, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 ) as self.js_resp0:
             logging.info('%s - Simple HTML Request get()...' % cmi_debug )
             logging.info( f'%s - Store basic HTML dataset' % cmi_debug )
             self.yfn_htmldata = self.js_resp0.text
@@ -234,49 +260,26 @@ class yfnews_reader:
             self.yfn_jsdb[hash_state]
             logging.info( f'%s - URL EXISTS in cache: {hash_state}' % cmi_debug )
             cx_soup = self.yfn_jsdb[hash_state]
-            self.nsoup = BeautifulSoup(cx_soup.text, "html.parser")   # !!!! this was soup = but I have no idea where "soup" gets set
-            logging.info( f'%s - set BS4 data objects' % cmi_debug )
-            self.ul_tag_dataset = self.nsoup.find(attrs={"class": "mainContent yf-tnbau3"} )        # produces : list iterator
-            print (f"#################################################################" )
-            print (f"{self.ul_tag_dataset}" )
-            print (f"#################################################################" )
-            self.li_superclass = self.ul_tag_dataset.find_all(attrs={"stream-item story-item yf-1drgw51"} )
+            logging.info( f'%s - extract news zone in parse pool' % cmi_debug )
+            self.news_feed = get_parse_pool().run(extract_news_feed, cx_soup.content, "mainContent yf-tnbau3", "stream-item story-item yf-1drgw51")
         except KeyError as error:
             logging.info( f'%s - MISSING in cache: Must read JS page' % cmi_debug )
             logging.info( f'%s - Force read news url: {self.yfqnews_url}' % cmi_debug )
             hx = self.do_js_get(bs4_obj_idx)
             logging.info( f'%s - FRESH JS page in use: [ {bs4_obj_idx} ]' % cmi_debug )
-            nsoup = BeautifulSoup(self.yfn_jsdata.text, "html.parser")    # store gloabl. dont use cache object 
-            logging.info( f'%s - set BS4 data objects' % cmi_debug )
+            logging.info( f'%s - extract news zone in parse pool' % cmi_debug )
+            self.news_feed = get_parse_pool().run(extract_news_feed, self.js_resp2.html.raw_html, "container yf-1ce4p3e", "stream-item story-item yf-1usaaz9")
 
-            self.ul_tag_dataset = self.nsoup.find(attrs={"class": "container yf-1ce4p3e"} )        # produces : list iterator
-            print ( f"#################################################################" )
-            print ( f"### DEBUG: {self.ul_tag_dataset}" )
-            self.li_superclass = self.ul_tag_dataset.find_all(attrs={"stream-item story-item yf-1usaaz9"} )
+        logging.info( f'%s - Depth: 0 / Found News container:  {self.news_feed["zone"]}' % cmi_debug )
+        logging.info( f'%s - Depth: 0 / Found Sub cotainers:   {self.news_feed["children"]} / Tags: {self.news_feed["tags"]}' % cmi_debug )
+        logging.info( f'%s - Depth: 0 / Found News Articles:   {self.news_feed["items"]}' % cmi_debug)
 
-        logging.info( f'%s - Depth: 0 / Found News containers: {len(self.ul_tag_dataset)}' % cmi_debug )
-        logging.info( f'%s - Depth: 0 / Found Sub cotainers:   {len(list(self.ul_tag_dataset.children))} / Tags: {len(list(self.ul_tag_dataset.descendants))}' % cmi_debug )
-        logging.info( f'%s - Depth: 0 / Found News Articles:   {len(self.li_superclass)}' % cmi_debug)
- 
         # >>Xray DEBUG<<
         if self.args['bool_xray'] is True:
             print ( f" " )
-            x = y = 1
-            print ( f"=============== <li> zone : {x} children+descendants ====================" )
-            for child in self.li_superclass:
-                if child.name is not None:
-                    print ( f"Zone: {x}: {child.h3.text} / (potential News article)" )
-                    y += 1
-                    """
-                    for element in child.descendants:
-                        print ( f"{y}: {element.name} ", end="" )
-                        y += 1
-                    """
-                    print ( f"==================== End <li> zone : {x} =========================" )
-                    x += 1
-                else:
-                    print ( f"Zone: {x}: Empty no article data" )
-                    print ( f"\n==================== End <li> zone : {x} =========================" )
+            for article in self.news_feed['articles']:
+                print ( f"Zone: {article['item']}: {article['headline']} / (potential News article)" )
+                print ( f"==================== End <li> zone : {article['item']} =========================" )
  
         return
 
@@ -302,10 +305,6 @@ class yfnews_reader:
         logging.info('%s - IN \n' % cmi_debug )
         time_now = time.strftime("%H:%M:%S", time.localtime() )
         symbol = symbol.upper()
-        li_superclass_all = self.ul_tag_dataset.find_all(attrs={"class": "js-stream-content Pos(r)"} )
-        mini_headline_all = self.ul_tag_dataset.div.find_all(attrs={'class': 'C(#959595)'})
-        li_subset_all = self.ul_tag_dataset.find_all('li')
-
         h3_counter = a_counter = 0
         x = 1
         y = 0
@@ -320,26 +319,16 @@ class yfnews_reader:
         # # soup.find_all("a", attrs={"class": "sister"})
         # ('a[href]')
 
-        ## GENERATOR: Scan & find critical tags
-        def atag_gen():                         #  extract <h3>, agency, author, publish date
-            a_counter = 0
-            for li_tag in self.li_superclass:   # BS4 object set from scan_news_feed()
-                self.nlp_x += 1
-                for element in li_tag.descendants:
-                    if element.name == "a":
-                        a_counter += 1
-                        if element.h3 is not None:
-                            yield ( f"{a_counter}")
-                            yield ( f"{element.h3.text}" )
-                            if element.has_attr('href') is True:
-                                #yield ( f'ZONE : {a_counter} : H3URL : {element.get("href")}' )
-                                yield ( f'{element.get("href")}' )
-                                news_ag = li_tag.find(attrs={'class': 'publishing yf-1weyqlp'}) 
-                                if news_ag is not None:
-                                    news_ag = news_ag.text.split("•")
-                                    yield ( f"{news_ag[0]}")
-                                else:
-                                    yield ( f"Failed to extract News Agency" )
+        ## GENERATOR: walk the articles extracted by the parse pool in scan_news_feed()
+        def atag_gen():                         #  <a> zone, <h3>, url, agency
+            nlp_base = self.nlp_x
+            for article in self.news_feed['articles']:
+                self.nlp_x = nlp_base + article['item']     # 1 ml_ingest slot per <li> story item
+                yield ( f"{article['a_zone']}" )
+                yield ( f"{article['headline']}" )
+                yield ( f"{article['url']}" )
+                yield ( f"{article['agency']}" )
+            self.nlp_x = nlp_base + self.news_feed['items']
 
         ########## end Generatior
 
@@ -471,7 +460,7 @@ class yfnews_reader:
             cx_soup = self.yfn_jsdb[cached_state]
             logging.info( f'%s - Cached object FOUND: {cached_state}' % cmi_debug )
             dataset_1 = self.yfn_jsdata     # processed data from request.get() response
-            self.nsoup = BeautifulSoup(escape(dataset_1), "html.parser")
+            self.npage = get_parse_pool().run(extract_news_page, escape(dataset_1))
             logging.info( f'%s - Cache BS4 object:   {type(cx_soup)}' % cmi_debug )
             logging.info( f'%s - Dataset object    : {type(dataset_1)}' % cmi_debug )
             logging.info( f'%s - Cache URL object  : {type(durl)}' % cmi_debug )
@@ -502,53 +491,31 @@ class yfnews_reader:
                 logging.info ( f'%s - cache url:     {type(durl)}' % cmi_debug )
                 logging.info ( f'%s - cache request: {type(cy_soup)}' % cmi_debug )
                 logging.info ( f'%s - Cache dataset: {type(self.yfn_jsdata)}' % cmi_debug )
-                self.nsoup = BeautifulSoup(escape(dataset_2), "html.parser")
+                self.npage = get_parse_pool().run(extract_news_page, escape(dataset_2))
             else:
                 logging.info( f'%s - FAILED to read JS doc and set BS4 obejcts' % cmi_debug )
                 return 10, 10.0, "ERROR_unknown_state!"
 
         
-        logging.info( f'%s - set BS4 data zones for Article: [ {idx} ]' % cmi_debug )
-        local_news = self.nsoup.find(attrs={"class": "body yf-3qln1o"})   # full news article - locally hosted
-        #local_news = self.nsoup.find(attrs={"class": "body yf-tsvcyu"})   # full news article - locally hosted
-        local_news_meta = self.nsoup.find(attrs={"class": "main yf-cfn520"})   # comes above/before article
-        local_stub_news = self.nsoup.find_all(attrs={"class": "article yf-l7apfj"})
-        local_story = self.nsoup.find(attrs={"class": "body yf-tsvcyu"})  # Op-Ed article - locally hosted
-        local_video = self.nsoup.find(attrs={"class": "body yf-tsvcyu"})  # Video story (minimal supporting text) stub - locally hosted
-        full_page = self.nsoup()  # full news article - locally hosted
-        #rem_news = nsoup.find(attrs={"class": "caas-readmore"} )           # stub news article - remotely hosted
+        logging.info( f'%s - data zones for Article: [ {idx} ] extracted by parse pool' % cmi_debug )
+        page = self.npage
 
 
         # Depth 2.0 :Local news article / Hosted in YFN
         if uhint == 0:
                 logging.info ( f"%s - Depth: 2.0 / Local Full artice / [ u: {uhint} h: {thint} ]" % cmi_debug )
-                logging.info ( f'%s - Depth: 2.0 / BS4 processed doc length: {len(self.nsoup)}' % cmi_debug )
-                logging.info ( f'%s - Depth: 2.0 / nsoup type is: {type(self.nsoup)}' % cmi_debug )
-                
-                author_zone = local_news_meta.find("div", attrs={"class": "byline-attr-author yf-1k5w6kz"} )                    
-                pubdate_zone = local_news_meta.find("div", attrs={"class": "byline-attr-time-style"} )
-                try:
-                    author = author_zone.a.string
-                except AttributeError:
-                    logging.info ( f"%s - Depth: 2.0 / Author zone error:  No <A> zone - trying basic..." % cmi_debug )
-                    try:
-                        author = author_zone.string
-                    except AttributeError:
-                        logging.info ( f"%s - Depth: 2.0 / Author zone error:  No <A> zone - trying basic..." % cmi_debug )
-                        author = "ERROR_author_zone"
-
-                pubdate = pubdate_zone.time.string
+                logging.info ( f'%s - Depth: 2.0 / BS4 processed doc length: {page["doc_len"]}' % cmi_debug )
+
+                author = page['author']
+                if author is None:
+                    logging.info ( f"%s - Depth: 2.0 / Author zone error:  No <A> zone & no basic zone" % cmi_debug )
+                    author = "ERROR_author_zone"
+                pubdate = page['pubdate']
 
                 print( f"Publish INFO:  [ Author: {author} / Published: {pubdate} ]" )
-                if local_news.find_all("p" ) is not None:
-                #if article_zone is not None:
-                    #article = article_zone
+                if page['p']:
                     logging.info ( f"%s - Depth: 2.0 / GOOD <p> zone / Local full TEXT article" % cmi_debug )
                     logging.info ( f"%s - Depth: 2.0 / NLP candidate is ready" % cmi_debug )
-                    #print ( f"############################ rem news #############################" )
-                    #print ( f"### DEBUG:{full_page.prettify()}" )
-                    #print ( f"### DEBUG:{self.nsoup.text}" )
-                    #print ( f"############################ rem news #############################" )
                 data_row.update({"viable": 1})                       # cab not extra text data from this article
                 self.ml_ingest[idx] = data_row                       # now PERMENTALY update the ml_ingest record @ index = id
                 return uhint, thint, durl
@@ -556,73 +523,27 @@ class yfnews_reader:
         # Depth 2.1 : Fake local news stub / Micro article links out to externally hosted article
         if uhint == 1:
             logging.info ( f"%s - Depth: 2.1 / Fake Local news stub / [ u: {uhint} h: {thint} ]" % cmi_debug )
-            logging.info ( f'%s - Depth: 2.1 / BS4 processed doc length: {len(self.nsoup)}' % cmi_debug )
-            logging.info ( f'%s - Depth: 2.1 / nsoup type is: {type(self.nsoup)}' % cmi_debug )
-
-            local_news_meta = self.nsoup.find("head")
-            local_news_body = self.nsoup.find("body")
-            local_news_bmain = local_news_body.find("main")
-            local_news_bmart = local_news_bmain.find("article")
-            local_news_bmart_divs = local_news_bmart.find_all("div")
+            logging.info ( f'%s - Depth: 2.1 / BS4 processed doc length: {page["doc_len"]}' % cmi_debug )
 
-            local_news_meta_desc = self.nsoup.find("meta", attrs={"name": "description"})
-
-            #local_news_bmart_cap = local_news_bmart.find("div", attrs={"class": "caas-title-wrapper"})
-            local_news_bmart_cap = local_news_bmart.find("div", attrs={"class": "cover-title yf-1rjrr1"})
-            caption_pct_cl = re.sub(r'[\%]', "PCT", local_news_bmart_cap.text)  # cant have % in text. Problematic !!
+            caption_pct_cl = re.sub(r'[\%]', "PCT", str(page['caption']))  # cant have % in text. Problematic !!
             logging.info ( f'%s - COVER CAPTION: {caption_pct_cl}' % cmi_debug )
-
-            #local_news_bmart_ath = local_news_bmart.find("div", attrs={"class": "caas-attr-item-author"})
-            #local_news_bmart_dte = local_news_bmart.find("div", attrs={"class": "caas-attr-time-style"})
-
-            local_news_bmart_ath = local_news_bmart.find("div", attrs={"class": "byline-attr-author yf-1k5w6kz"})
-            logging.info ( f'%s - AUTHOR: {local_news_bmart_ath.text}' % cmi_debug )
-
-            local_news_bmart_dte = local_news_bmart.find("time", attrs={"class": "byline-attr-meta-time"})
-            logging.info ( f'%s - PUB TIME: {local_news_bmart_dte.text}' % cmi_debug )
-
-            local_news_bmain_azone = local_news_bmain.find("a")
-
-            """
-            print ( f"### DEBUG - Meta tle: {local_news_meta.title.string}" )
-            print ( f"### DEBUG - Meta:     {local_news_meta_desc['content']}" )
-            print ( f"### DEBUG - Caption:  {local_news_bmart_cap.h1.text}" )
-            print ( f"### DEBUG - Authour:  {local_news_bmart_ath.text}" )
-            print ( f"### DEBUG - Date:     {local_news_bmart_dte.text}" )
-            print ( f"### DEBUG - Ext link: {local_news_bmain_azone['href']}" )
-            print ( f"### DEBUG - Article:  {local_news_bmain_azone.text}" )
-            """
-            
-            """
-            for i in range(0, len(local_news_bmart_divs)):
-                try:
-                    print ( f"zone: {i}: {local_news_bmart_divs[i]['class']}")
-                    #for j in range(0, len(local_news_meta[i]['class'])):
-                    #    try:
-                    #        print ( f"class: {local_news_meta[i]['class'][j]}")
-                    #    except KeyError:
-                    #        print ( f"class: no class")
-                except KeyError:
-                    print ( f"zone: {i}: no zone")
-                pass
-            """
-
-            author = local_news_bmart_ath.text
-            pubdate = local_news_bmart_dte.text
+            author = page['stub_author']
+            pubdate = page['stub_pubdate']
+            logging.info ( f'%s - AUTHOR: {author}' % cmi_debug )
+            logging.info ( f'%s - PUB TIME: {pubdate}' % cmi_debug )
 
             # f-string cannot handle % sign in strings to expand + print
             #  cmi_debug = __name__+"::"+self.interpret_page.__name__+".#"+str(item_idx)
             cmi_debug = __name__+"::"+self.interpret_page.__name__+".#"+str(item_idx)+" - Depth: 2.1 / Caption: "+caption_pct_cl
-            #logging.info ( f"%s - Depth: 2.1 / Caption: {local_news_bmart_cap.h1.text}" % cmi_debug )
             logging.info ( f"%s" % cmi_debug )
             cmi_debug = __name__+"::"+self.interpret_page.__name__+".#"+str(item_idx)
             logging.info ( f"%s - Depth: 2.1 / Author: {author} / Published: {pubdate}" % cmi_debug )
-            logging.info ( f"%s - Depth: 2.1 / External link: {local_news_bmain_azone['href']}" % cmi_debug )
+            logging.info ( f"%s - Depth: 2.1 / External link: {page['exturl']}" % cmi_debug )
 
             thint = 1.1
-            if local_news_bmart is not None:                         # article has some content
-                logging.info ( f"%s - Depth: 2.1 / Good article stub / External location @: {local_news_bmain_azone['href']}" % cmi_debug )
-                ext_url_item =  local_news_bmain_azone['href']       # build a new dict entry (external; absolute url)
+            if page['article'] and page['exturl'] is not None:       # article has some content
+                logging.info ( f"%s - Depth: 2.1 / Good article stub / External location @: {page['exturl']}" % cmi_debug )
+                ext_url_item = page['exturl']                        # build a new dict entry (external; absolute url)
                 logging.info ( f"%s - Depth: 2.1 / Insert url into ml_ingest: [{ext_url_item}] " % cmi_debug )
                 # !! this is wrong - need to add new field exturl to the data_row dict
                 #data_row.update(url = ext_url_item)                 # insert new dict entry into ml_ingest via an AUGMENTED data_row
@@ -631,13 +552,13 @@ class yfnews_reader:
                 self.ml_ingest[idx] = data_row                       # now PERMENTALY update the ml_ingest record @ index = id
                 logging.info ( f"%s - Depth: 2.1 / NLP candidate is ready [ u: {uhint} h: {thint} ]" % cmi_debug )
                 return uhint, thint, ext_url_item
-            elif local_stub_news.text == "Story continues":          # local articles have a [story continues...] button
+            elif page['stub_continues']:                             # local articles have a [story continues...] button
                 logging.info ( f"%s - Depth: 2.1 / GOOD [story continues...] stub" % cmi_debug )
                 logging.info ( f"%s - Depth: 2.1 / confidence level / u: {uhint} h: {thint}" % cmi_debug )
                 data_row.update({"viable": 0})                       # cab not extra text data from this article
                 self.ml_ingest[idx] = data_row                       # now PERMENTALY update the ml_ingest record @ index = id
                 return uhint, thint, self.this_article_url           # REAL local news
-            elif local_story.button.text == "Read full article":     # test to make 100% sure its a low quality story
+            elif page['read_full']:                                  # test to make 100% sure its a low quality story
                 logging.info ( f"%s - Depth: 2.1 / GOOD [Read full article] stub" % cmi_debug )
                 logging.info ( f"%s - Depth: 2.1 / confidence level / u: {uhint} h: {thint}" % cmi_debug )
                 data_row.update({"viable": 0})                       # cab not extra text data from this article
@@ -650,8 +571,8 @@ class yfnews_reader:
                 return uhint, 9.9, self.this_article_url
         
         if uhint == 2:
-            if local_video.find('p'):          # video page only has a small <p> zone. NOT much TEXT (all the news is in the video)
-                logging.info ( f'%s - Depth: 2.2 / BS4 processed doc length: {len(self.nsoup)}' % cmi_debug )
+            if page['video_p']:                # video page only has a small <p> zone. NOT much TEXT (all the news is in the video)
+                logging.info ( f'%s - Depth: 2.2 / BS4 processed doc length: {page["doc_len"]}' % cmi_debug )
                 logging.info ( f"%s - Depth: 2.2 / GOOD [Video report] minimal text" % cmi_debug )
                 logging.info ( f"%s - Depth: 2.2 / confidence level / u: {uhint} h: {thint}" % cmi_debug )
                 data_row.update({"viable": 0})                       # cab not extra text data from this article
@@ -716,7 +637,7 @@ class yfnews_reader:
         # TODO:
         # since this code is exact duplicate of interpret_page(), we
         # shoud make this a method and call it when needed
-        # it would retrun self.nsoup and set self.yfn_jsdata
+        # it would retrun self.npage and set self.yfn_jsdata
         logging.info( f'%s - urlhash cache lookup: {cached_state}' % cmi_debug )
         cmi_debug = __name__+"::"+self.extract_article_data.__name__+".#"+str(item_idx)+" - URL: "+durl
         logging.info( f'%s' % cmi_debug )     # hack fix for urls containg "%" break logging module (NO FIX
@@ -734,7 +655,7 @@ class yfnews_reader:
             logging.info( f'%s - Cache req/get    : {type(cx_soup)}' % cmi_debug )
             logging.info( f'%s - Cahce Dataset    : {type(dataset_1)}' % cmi_debug )
             logging.info( f'%s - Cache URL object : {cx_soup.url}' % cmi_debug )
-            self.nsoup = BeautifulSoup(escape(dataset_1), "html.parser")
+            self.npage = get_parse_pool().run(extract_news_page, escape(dataset_1))     # memo hit if interpret_page() parsed it
         except KeyError:
             logging.info( f'%s - MISSING from cache / must read page' % cmi_debug )
             logging.info( f'%s - Cache URL object  : {type(durl)}' % cmi_debug )
@@ -764,7 +685,7 @@ class yfnews_reader:
                 logging.info ( f'%s - Cache url:     {cy_soup.url}' % cmi_debug )
                 logging.info ( f'%s - Cache req/get: {type(cy_soup)}' % cmi_debug )
                 logging.info ( f'%s - Cache Dataset: {type(self.yfn_jsdata)}' % cmi_debug )
-                self.nsoup = BeautifulSoup(escape(dataset_2), "html.parser")
+                self.npage = get_parse_pool().run(extract_news_page, escape(dataset_2))
             else:
                 logging.info( f'%s - FAIL to set BS4 data !' % cmi_debug )
                 return 10, 10.0, "ERROR_unknown_state!"
@@ -777,13 +698,8 @@ class yfnews_reader:
             # just use the CAPTION Teaser text from the YFN local url
             # we extracted that in interpret_page()
         else:
-            logging.info( f'%s - set BS4 data zones for article: [ {item_idx} ]' % cmi_debug )
-            #local_news = self.nsoup.find(attrs={"class": "body yf-tsvcyu"})             # full news article - locally hosted
-            local_news = self.nsoup.find(attrs={"class": "body yf-3qln1o"})             # full news article - locally hosted
-            local_news_meta = self.nsoup.find(attrs={"class": "main yf-cfn520"})        # comes above/before article
-            # local_stub_news = self.nsoup.find_all(attrs={"class": "article yf-l7apfj"})
-            local_stub_news = self.nsoup.find_all(attrs={"class": "body yf-3qln1o"})   # full news article - locally hosted
-            local_stub_news_p = local_news.find_all("p")    # BS4 all <p> zones (not just 1)
+            logging.info( f'%s - article <p> zones extracted by parse pool: [ {item_idx} ]' % cmi_debug )
+            local_stub_news_p = self.npage['p']             # TEXT of all <p> zones in the article body (not just 1)
 
             ####################################################################
             ##### M/L Gen AI NLP starts here !!!                         #######
@@ -0,0 +1,317 @@
+#! python3
+import asyncio
+import concurrent.futures
+import threading
+import hashlib
+import atexit
+import time
+import logging
+from rich import print
+from urllib.parse import urlparse
+
+try:
+    import httpx                    # optional: asyncio HTTP client. Falls back to the blocking shared fetcher
+except ImportError:
+    httpx = None
+
+try:
+    import h2                       # optional: HTTP/2 support for httpx
+except ImportError:
+    h2 = None
+
+from net_fetcher import get_fetcher
+from net_policy import deadline_exceeded
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class nasdaq_aclient:
+    """
+    asyncio HTTP core for the small JSON documents served by api.nasdaq.com (quotes, unusual volume)
+    - 1 long lived httpx.AsyncClient. Connection pool, HTTP keep-alive & HTTP/2 (if h2 is installed)
+    - Owns a private event loop running in a daemon thread (same model as render_pool), so the
+      blocking class methods (nquote, un_volumes) are thin wrappers that await it via fetch()
+    - High fan-out callers use fetch_many() to run hundreds of quote fetches (aget() coroutines) on 1 event loop
+    - Shares the fetch path services: per host limiter, deadlines & retry budget, hedging,
+      single-flight, conditional HTTP cache, page archive & replay (see net_fetcher)
+    - Deadlines are read on the callers thread (begin_job() deadlines are thread local) & travel
+      with the coroutine as an absolute time.monotonic() value
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    client = None           # httpx.AsyncClient (lives on the private loop)
+    loop = None             # private asyncio event loop (runs in loop_thread)
+    loop_thread = None
+    max_conns = 20          # connection pool size
+    http2 = True            # use HTTP/2 if h2 is installed
+    primed = False          # nasdaq.com cookie (ak_bmsc) collected
+    flights = {}            # { url: asyncio.Task } single-flight for in-loop fetches
+
+    def __init__(self, yti, max_conns=20, http2=True):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.max_conns = max_conns
+        self.http2 = http2 and h2 is not None
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.requests = 0
+        self.deduped = 0
+        return
+
+######################################################################
+# method 1
+    def start(self):
+        """Spin up the private event loop thread & the pooled async client. Only the 1st call does any work"""
+        cmi_debug = __name__+"::"+self.start.__name__+".#"+str(self.yti)
+        with self.lock:
+            if self.loop is not None:
+                return
+            logging.info( f'%s - Start async loop thread / HTTP/2: {self.http2} / pool: {self.max_conns}' % cmi_debug )
+            self.loop = asyncio.new_event_loop()
+            self.loop_thread = threading.Thread(target=self.loop.run_forever, name="nasdaq_aclient", daemon=True)
+            self.loop_thread.start()
+            atexit.register(self.shutdown)
+        self._run(self._open(), 30)
+        return
+
+######################################################################
+# method 2
+    def fetch(self, url, headers=None, timeout=5, session=None, cookies=None):
+        """
+        Blocking wrapper. Await 1 fetch on the private loop.
+        session/cookies: the callers requests session & cookie package (only used by the blocking fallback,
+                         the async client keeps its own cookie jar)
+        Returns a Response (httpx, or requests for cache hits & the fallback) with .text .status_code .json() + body_hash & cache_state
+        """
+        if httpx is None or get_fetcher().replaying:
+            return get_fetcher().get(url, session=session, headers=headers, cookies=cookies, timeout=timeout)
+        if self.loop is None:
+            self.start()
+        deadline, wait = self._budget(timeout)
+        return self._run(self.aget(url, headers, timeout, cookies, deadline), wait, deadline)
+
+######################################################################
+# method 3
+    def fetch_many(self, urls, headers=None, timeout=5, session=None, cookies=None):
+        """
+        Blocking wrapper for high fan-out. Run all fetches concurrently on the 1 event loop.
+        Returns a list of Responses (or the Exception for a failed fetch), same order as urls
+        """
+        if httpx is None or get_fetcher().replaying:
+            return [ self.fetch(u, headers, timeout, session, cookies) for u in urls ]
+        if self.loop is None:
+            self.start()
+        deadline, wait = self._budget(timeout)
+        return self._run(self._gather(urls, headers, timeout, cookies, deadline), wait, deadline)
+
+######################################################################
+# method 4
+    async def aget(self, url, headers=None, timeout=5, cookies=None, deadline=None):
+        """
+        The async core. Single-flight per URL: concurrent aget() of the same URL await the same task
+        deadline : time.monotonic() value from the callers thread (see _budget). None = no deadline
+        """
+        if cookies:
+            self.client.cookies.update(cookies)         # nasdaq cookie package -> client cookie jar
+        task = self.flights.get(url)
+        if task is not None:
+            self.deduped += 1
+            return await asyncio.shield(task)
+        task = asyncio.ensure_future(self._cached_get(url, headers, timeout, deadline))
+        self.flights[url] = task
+        task.add_done_callback(lambda t: self.flights.pop(url, None))
+        return await asyncio.shield(task)
+
+######################################################################
+# method 5
+    def print_stats(self):
+        print ( f"========== nasdaq async client / HTTP/2: {self.http2} / pool: {self.max_conns} ==========" )
+        print ( f"Network requests: {self.requests} / single-flight deduped: {self.deduped}" )
+        return
+
+######################################################################
+# method 6
+    def shutdown(self):
+        """Close the client & stop the private event loop"""
+        if self.loop is None:
+            return
+        try:
+            self._run(self.client.aclose(), 5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=5)
+        self.loop = None
+        return
+
+######################################################################
+# private helpers : everything below runs on the private event loop
+
+    def _budget(self, timeout):
+        """
+        Runs on the callers thread, where its begin_job() deadline is visible.
+        Returns (deadline, wait): the absolute deadline for the coroutine & how long the caller blocks on it
+        """
+        policy = get_fetcher().policy
+        policy.timeout_for(timeout)                     # raises deadline_exceeded if it's all used up
+        left = policy.remaining()
+        if left is None:                                # no deadline. Every attempt + backoff + prime
+            return None, (timeout or 5) * (policy.max_retries + 2) + policy.backoff_cap * policy.max_retries
+        return time.monotonic() + left, left
+
+    def _run(self, coro, timeout, deadline=None):
+        """Submit a coroutine to the private loop & block until done (or timeout)"""
+        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return fut.result(timeout=None if timeout is None else timeout + 0.5)
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            if deadline is None:
+                raise
+            policy = get_fetcher().policy
+            with policy.lock:
+                policy.deadline_hits += 1
+            raise deadline_exceeded(f"deadline expired / async fetch / stage: {policy.stage_name}")
+
+    async def _open(self):
+        limits = httpx.Limits(max_connections=self.max_conns, max_keepalive_connections=self.max_conns, keepalive_expiry=30)
+        self.client = httpx.AsyncClient(http2=self.http2, limits=limits, follow_redirects=True)
+        return
+
+    async def _gather(self, urls, headers, timeout, cookies, deadline):
+        return await asyncio.gather(*[ self.aget(u, headers, timeout, cookies, deadline) for u in urls ], return_exceptions=True)
+
+    async def _cached_get(self, url, headers, timeout, deadline):
+        """HTTP cache layer (the asyncio twin of net_fetcher.cached_get). Same cache dir, entries & stats"""
+        fetcher = get_fetcher()
+        if not fetcher.cache_on:
+            return fetcher.tag_response(await self._policy_get(url, headers, timeout, deadline), "bypass", url)
+        key = fetcher.cache_key(url)
+        meta, body = fetcher.cache_read(key)
+        if meta is not None and body is not None:
+            if fetcher.is_fresh(meta):
+                return fetcher.tag_response(fetcher.cached_response(None, url, meta, body), "fresh", url)
+            headers = dict(headers or {})
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        resp = await self._policy_get(url, headers, timeout, deadline)
+        if resp.status_code == 304 and meta is not None and body is not None:
+            fetcher.cache_write(key, url, resp, body, meta)           # refresh stored_at / max-age
+            return fetcher.tag_response(fetcher.cached_response(None, url, meta, body), "revalidated", url)
+        if resp.status_code == 200:
+            fetcher.cache_write(key, url, resp, resp.content, None)
+        return fetcher.tag_response(resp, "miss", url)
+
+    def _timeout_for(self, timeout, deadline):
+        """net_policy.timeout_for against the callers deadline (the loop thread cant see its begin_job())"""
+        policy = get_fetcher().policy
+        if deadline is None:
+            return timeout
+        left = deadline - time.monotonic()
+        if left <= 0:
+            with policy.lock:
+                policy.deadline_hits += 1
+            raise deadline_exceeded(f"deadline expired / async fetch / stage: {policy.stage_name}")
+        return left if timeout is None else min(timeout, left)
+
+    async def _policy_get(self, url, headers, timeout, deadline):
+        """Deadline clip, jittered retries & hedging (the asyncio twin of net_policy.run)"""
+        policy = get_fetcher().policy
+        host = urlparse(url).netloc
+        hedge = host in policy.hedge_hosts
+        with policy.lock:
+            policy.requests += 1
+        attempt = 0
+        while True:
+            t = self._timeout_for(timeout, deadline)
+            t0 = time.monotonic()
+            try:
+                resp = await (self._hedged(host, url, headers, t) if hedge else self._paced_get(host, url, headers, t))
+            except deadline_exceeded:
+                raise
+            except (httpx.TimeoutException, httpx.TransportError):
+                if not policy.may_retry(attempt):
+                    raise
+            else:
+                policy.record(host, time.monotonic() - t0)
+                if resp.status_code not in policy.retry_status or not policy.may_retry(attempt):
+                    return resp
+            await asyncio.sleep(policy.backoff_delay(attempt))
+            attempt += 1
+
+    async def _hedged(self, host, url, headers, timeout):
+        """Duplicate a request that runs past the host p95. 1st one wins, the loser is cancelled. No free slot = no hedge"""
+        policy = get_fetcher().policy
+        first = asyncio.ensure_future(self._paced_get(host, url, headers, timeout))
+        delay = policy.hedge_delay(host)
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done or not policy.may_hedge():
+            return await first
+        second = asyncio.ensure_future(self._paced_get(host, url, headers, max(timeout - delay, 0.5), wait=False))
+        done, pending = await asyncio.wait({first, second}, return_when=asyncio.FIRST_COMPLETED)
+        if second in done and second.exception() is None and second.result() is None:
+            with policy.lock:                           # no free slot. Hedge skipped, budget given back
+                policy.hedges -= 1
+                policy.hedge_skips += 1
+            return await first
+        ok = [ f for f in done if f.exception() is None ]
+        if not ok and pending:                          # 1st one to finish failed. Wait for the other
+            return await pending.pop()
+        for p in pending:
+            p.cancel()                                  # real cancellation. Frees the pooled connection
+        winner = ok[0] if ok else done.pop()
+        if winner is second:
+            with policy.lock:
+                policy.hedge_wins += 1
+        return winner.result()
+
+    async def _paced_get(self, host, url, headers, timeout, wait=True):
+        """1 network attempt. Paced by the shared per host limiter. wait=False (hedges) returns None if there's no free slot"""
+        limiter = get_fetcher().limiter
+        if wait:
+            await limiter.acquire_async(host)
+        elif limiter.try_acquire(host) != 0.0:
+            return None
+        t0 = time.monotonic()
+        try:
+            if not self.primed and host == "api.nasdaq.com":
+                await self._prime(headers, timeout)
+            resp = await self.client.get(url, headers=headers, timeout=timeout)
+        except httpx.TimeoutException:
+            limiter.release(host, None, time.monotonic() - t0, timed_out=True)
+            raise
+        except BaseException:
+            limiter.release(host, None, None)
+            raise
+        retry_after = resp.headers.get('Retry-After', "")
+        limiter.release(host, resp.status_code, time.monotonic() - t0, retry_after=int(retry_after) if retry_after.isdigit() else None)
+        self.requests += 1
+        return resp
+
+    async def _prime(self, headers, timeout):
+        """Present ourself to nasdaq.com once, so the client cookie jar holds the critical cookie -> ak_bmsc"""
+        self.primed = True
+        try:
+            await self.client.get("https://www.nasdaq.com", headers=headers, timeout=timeout)
+        except httpx.HTTPError as e:
+            logging.info( f'nasdaq_aclient::_prime - blind get failed: {e}' )
+        return
+
+######################################################################
+# Shared client. All nasdaq JSON fetches share 1 connection pool & 1 event loop
+
+shared_client = None
+
+def get_nasdaq_client():
+    """Return the process wide nasdaq async client (created on 1st use, loop started on 1st fetch)"""
+    global shared_client
+    if shared_client is None:
+        shared_client = nasdaq_aclient(1)
+    return shared_client
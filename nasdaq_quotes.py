@@ -5,6 +5,9 @@ import logging
 import argparse
 import json
 
+from net_fetcher import get_fetcher
+from nasdaq_aclient import get_nasdaq_client
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 
@@ -144,7 +147,7 @@ class nquote:
         """
         cmi_debug = __name__+"::"+self.init_blind_session.__name__+".#"+str(self.yti)
         logging.info('%s - Blind request get() on base url' % cmi_debug )
-        with self.js_session.get('https://www.nasdaq.com', stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp0:
+        with get_fetcher().get('https://www.nasdaq.com', session=self.js_session, cache=False, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp0:
             logging.info('%s - Request get() done' % cmi_debug )
             # DEBUG : Xray
             if self.args['bool_xray'] is True:
@@ -165,7 +168,7 @@ class nquote:
         Our goal is simply find & extract secret cookies. Nothing more.
         """
         cmi_debug = __name__+"::"+self.init_dummy_session.__name__+".#"+str(self.yti)
-        with self.js_session.get('https://www.nasdaq.com', stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp0:
+        with get_fetcher().get('https://www.nasdaq.com', session=self.js_session, cache=False, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp0:
             logging.info( f"%s - extract cookies  " % cmi_debug )
 
             # DEBUG : Xray
@@ -188,24 +191,27 @@ class nquote:
         """
         cmi_debug = __name__+"::"+self.learn_aclass.__name__+".#"+str(self.yti)
         logging.info( f"%s - Learn asset class @ API: {self.info_url}" % cmi_debug )
-        with self.js_session.get(self.info_url, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp1:
-            logging.info( f"%s - Extract default guess data..." % cmi_debug )
-            self.quote_json1 = json.loads(self.js_resp1.text)
-            #figure out asset_class which defines which API endpoint to use...
-            self.asset_class = -1
-            t_info_url = "https://api.nasdaq.com/api/quote/" + self.symbol + "/info?assetclass="
-            for i in ['stocks', 'etf']:
-                test_info_url = t_info_url + i
-                with self.js_session.get(test_info_url, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp4:
-                    logging.info( f'%s - Test {symbol} asset_class [ {i} ] @ API: {test_info_url}' % cmi_debug )
-                    self.quote_json4 = json.loads(self.js_resp4.text)
-                    if self.quote_json4['status']['rCode'] == 200:
-                        self.asset_class = i
-                        logging.info( f'%s - Asset_class is: [ {i} ] !' % cmi_debug )
-                        break
-                    else:
-                        logging.info( f'%s - Asset_class is NOT: [ {i} ] !' % cmi_debug )
-                        test_info_url = ""
+        # default guess + both asset_class tests are fetched concurrently on the async nasdaq client
+        t_info_url = "https://api.nasdaq.com/api/quote/" + self.symbol + "/info?assetclass="
+        aclasses = ['stocks', 'etf']
+        resps = get_nasdaq_client().fetch_many([self.info_url] + [ t_info_url + i for i in aclasses ], headers=self.nasdaq_headers, timeout=5, session=self.js_session, cookies=self.nasdaq_headers)
+        for r in resps:
+            if isinstance(r, Exception):
+                raise r
+        self.js_resp1 = resps[0]
+        logging.info( f"%s - Extract default guess data..." % cmi_debug )
+        self.quote_json1 = json.loads(self.js_resp1.text)
+        #figure out asset_class which defines which API endpoint to use...
+        self.asset_class = -1
+        for i, self.js_resp4 in zip(aclasses, resps[1:]):
+            logging.info( f'%s - Test {symbol} asset_class [ {i} ] @ API: {t_info_url + i}' % cmi_debug )
+            self.quote_json4 = json.loads(self.js_resp4.text)
+            if self.quote_json4['status']['rCode'] == 200:
+                self.asset_class = i
+                logging.info( f'%s - Asset_class is: [ {i} ] !' % cmi_debug )
+                break
+            else:
+                logging.info( f'%s - Asset_class is NOT: [ {i} ] !' % cmi_debug )
 
         logging.info( f"%s - Done" % cmi_debug )
         return i    # asset_class identifier  (stocks or etf)
@@ -225,23 +231,27 @@ class nquote:
         logging.info('%s - IN' % cmi_debug )
         self.qs = symbol
 
-        with self.js_session.get(self.summary_url, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp1:
-            logging.info( f"%s - Stage #1 / Summary / get() data / storing..." % cmi_debug )
-            logging.info( f"%s - API: {self.summary_url}" % cmi_debug )
-            self.quote_json1 = json.loads(self.js_resp1.text)
-            logging.info( f"%s - Stage #1 - Done" % cmi_debug )
+        # all 3 API endpoints are fetched concurrently on the async nasdaq client
+        resps = get_nasdaq_client().fetch_many([self.summary_url, self.watchlist_url, self.premarket_url], headers=self.nasdaq_headers, timeout=5, session=self.js_session, cookies=self.nasdaq_headers)
+        for r in resps:
+            if isinstance(r, Exception):
+                raise r
+        self.js_resp1, self.js_resp2, self.js_resp3 = resps
+
+        logging.info( f"%s - Stage #1 / Summary / get() data / storing..." % cmi_debug )
+        logging.info( f"%s - API: {self.summary_url}" % cmi_debug )
+        self.quote_json1 = json.loads(self.js_resp1.text)
+        logging.info( f"%s - Stage #1 - Done" % cmi_debug )
 
-        with self.js_session.get(self.watchlist_url, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp2:
-            logging.info( f"%s - Stage #2 / Watchlist / get() data / storing..." % cmi_debug )
-            # cant do logging.info on self.watchlist_url b/c it has '%7c' in url as a specla seperator for nasdaq.com API
-            self.quote_json2 = json.loads(self.js_resp2.text)
-            logging.info( f"%s - Stage #2 - Done" % cmi_debug )
+        logging.info( f"%s - Stage #2 / Watchlist / get() data / storing..." % cmi_debug )
+        # cant do logging.info on self.watchlist_url b/c it has '%7c' in url as a specla seperator for nasdaq.com API
+        self.quote_json2 = json.loads(self.js_resp2.text)
+        logging.info( f"%s - Stage #2 - Done" % cmi_debug )
 
-        with self.js_session.get(self.premarket_url, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp3:
-            logging.info( f"%s - Stage #3 / premarket / get() data / storing..." % cmi_debug )
-            logging.info( f"%s - API: {self.premarket_url}" % cmi_debug )
-            self.quote_json3 = json.loads(self.js_resp3.text)
-            logging.info( f"%s - Stage #3 - Done" % cmi_debug )
+        logging.info( f"%s - Stage #3 / premarket / get() data / storing..." % cmi_debug )
+        logging.info( f"%s - API: {self.premarket_url}" % cmi_debug )
+        self.quote_json3 = json.loads(self.js_resp3.text)
+        logging.info( f"%s - Stage #3 - Done" % cmi_debug )
 
         # Xray DEBUG
         if self.args['bool_xray'] is True:
@@ -264,13 +274,10 @@ class nquote:
         cmi_debug = __name__+"::"+self.get_js_nquote.__name__+".#"+str(self.yti)
         logging.info('%s - IN' % cmi_debug )
         self.symbol = symbol
-        with self.js_session.get(self.quote_url, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp1:
-            # read the webpage with our Javascript engine processor
-            logging.info('%s - Javascript engine processing...' % cmi_debug )
-            self.js_resp1.html.render()    # this isn't needed for this URL becuase is a RAW JSON output page. NOT Javascript
-            logging.info('%s - Javascript engine completed!' % cmi_debug )
-            logging.info('%s - summary json quote data package extracted / storing...' % cmi_debug )
-            self.quote_json1 = json.loads(self.js_resp1.text)
+        # RAW JSON output page. NOT Javascript, so no render is needed
+        self.js_resp1 = get_nasdaq_client().fetch(self.quote_url, headers=self.nasdaq_headers, timeout=5, session=self.js_session, cookies=self.nasdaq_headers)
+        logging.info('%s - summary json quote data package extracted / storing...' % cmi_debug )
+        self.quote_json1 = json.loads(self.js_resp1.text)
 
         # Xray DEBUG
         if self.args['bool_xray'] is True:
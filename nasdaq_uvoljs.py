@@ -9,6 +9,10 @@ import time
 import json
 from rich import print
 
+from net_fetcher import get_fetcher
+from nasdaq_aclient import get_nasdaq_client
+from row_buffer import row_buffer
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 
@@ -24,10 +28,12 @@ class un_volumes:
     uvol_all_data =""       # JSON dataset contains ALL data
     uvol_up_data =""        # JSON dataset contains UP data only
     uvol_down_data =""      # JSON dataset contains DOWN data only
+    uvol_hash = ""          # body hash of the last decoded JSON dataset (skip re-decode if unchanged)
     yti = 0                 # Unique instance identifier
     cycle = 0               # class thread loop counter
     soup = ""               # BS4 shared handle between UP & DOWN (1 URL, 2 embeded data sets in HTML doc)
     args = []               # class dict to hold global args being passed in from main() methods
+    uvol_cols = [ 'Row', 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', "Vol", 'Vol_pct', 'Time' ]    # up/down DF schema
 
                             # NASDAQ.com header/cookie hack
     nasdaq_headers = { \
@@ -74,21 +80,25 @@ class un_volumes:
         # be nice and set a healthy cookie package
         logging.info('%s - blind get()' % cmi_debug )
         self.js_session.cookies.update(self.nasdaq_headers)    # redundent as it's done in INIT but I'm not sure its persisting from there
-        with self.js_session.get("https://www.nasdaq.com", stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp0:
+        with get_fetcher().get("https://www.nasdaq.com", session=self.js_session, cache=False, stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp0:
             logging.info('%s - EXTRACT/INSERT valid cookie  ' % cmi_debug )
                         #self.js_session.cookies.update({'ak_bmsc': self.js_resp0.cookies['ak_bmsc']} )    # NASDAQ cookie hack
             #self.js_session.cookies.update({'bm_sv': self.js_resp0.cookies['bm_sv']} )    # NASDAQ cookie hack
 
         # 2nd get with the secret nasdaq.com cookie no inserted
         logging.info('%s - rest API read json' % cmi_debug )
-        with self.js_session.get("https://api.nasdaq.com/api/quote/list-type/unusual_volume", stream=True, headers=self.nasdaq_headers, cookies=self.nasdaq_headers, timeout=5 ) as self.js_resp2:
-            logging.info('%s - json data extracted' % cmi_debug )
+        self.js_resp2 = get_nasdaq_client().fetch("https://api.nasdaq.com/api/quote/list-type/unusual_volume", headers=self.nasdaq_headers, timeout=5, session=self.js_session, cookies=self.nasdaq_headers)
+        logging.info('%s - json data extracted' % cmi_debug )
+        if self.js_resp2.body_hash == self.uvol_hash:
+            logging.info( f'%s - json body unchanged [{self.js_resp2.cache_state}] / skip re-decode' % cmi_debug )
+        else:
             logging.info('%s - store FULL json dataset' % cmi_debug )
             self.uvol_all_data = json.loads(self.js_resp2.text)
             logging.info('%s - store UP data locale' % cmi_debug )
             self.uvol_up_data =  self.uvol_all_data['data']['up']['table']['rows']
             logging.info('%s - store DOWN data locale' % cmi_debug )
             self.uvol_down_data = self.uvol_all_data['data']['down']['table']['rows']
+            self.uvol_hash = self.js_resp2.body_hash
 
         # DEBUG
         if self.args['bool_xray'] is True:
@@ -129,6 +139,7 @@ class un_volumes:
         time_now = time.strftime("%H:%M:%S", time.localtime() )
         logging.info('%s - Drop all rows from DF' % cmi_debug )
         this_df.drop(this_df.index, inplace=True)
+        rows = row_buffer(self.yti, self.uvol_cols)     # rows collected column-wise. 1 DataFrame built at the end
         x = 1    # row counter Also leveraged for unique dataframe key
         for json_data_row in dataset:
             co_sym = json_data_row['symbol']
@@ -164,7 +175,7 @@ class un_volumes:
             vol_abs_cl = (re.sub('[,]', '', vol_abs))                      # remove ,
             vol_pct_cl = (re.sub('[%]', '', vol_pct))                      # remover %
 
-            self.list_data = [[ \
+            self.list_data = [ \
                        x, \
                        re.sub('\'', '', co_sym_lj), \
                        co_name_lj, \
@@ -173,21 +184,17 @@ class un_volumes:
                        round(float(price_pct_cl), 2), \
                        round(float(vol_abs_cl)), \
                        round(float(vol_pct_cl), 1), \
-                       time_now ]]
-
-
-            self.df_1_row = pd.DataFrame(self.list_data, columns=[ 'Row', 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', "Vol", 'Vol_pct', 'Time' ], index=[x] )
-            if ud == 0:
-                logging.info( '%s - append UP Volume data into DataFrame' % cmi_debug )
-                self.up_df0 = pd.concat([self.up_df0, self.df_1_row])    # append this ROW of data into the REAL DataFrame
-            else:
-                logging.info('%s - append DOWN Volume data into DataFrame' % cmi_debug )
-                self.down_df1 = pd.concat([self.down_df1, self.df_1_row])    # append this ROW of data into the REAL DataFrame
+                       time_now ]
 
+            rows.append(self.list_data)                 # append this ROW of data into the row buffer
             x += 1
 
-        if ud == 0: self.up_df0.reset_index(inplace=True, drop=True)           # reset index each time so its guaranteed sequential
-        if ud == 1: self.down_df1.reset_index(inplace=True, drop=True)         # reset index each time so its guaranteed sequential
+        if ud == 0:
+            logging.info( '%s - build UP Volume DataFrame' % cmi_debug )
+            self.up_df0 = rows.to_df()                  # index 0..n-1 (guaranteed sequential)
+        else:
+            logging.info('%s - build DOWN Volume DataFrame' % cmi_debug )
+            self.down_df1 = rows.to_df()
         logging.info('%s - populated new DF' % cmi_debug )
         return x        # number of rows inserted into DataFrame (0 = some kind of #FAIL)
                         # sucess = lobal class accessor (y_toplosers.df0) populated & updated
@@ -0,0 +1,354 @@
+#! python3
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests_html import HTMLSession, HTMLResponse
+from urllib.parse import urlparse
+import threading
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+import logging
+from rich import print
+
+from net_limiter import net_limiter
+from net_policy import net_policy, deadline_exceeded
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class net_fetcher:
+    """
+    Shared network fetch path for all collectors (nasdaq.com, finance.yahoo.com, bigcharts.marketwatch.com)
+    Every get() goes through here so network behaviour is managed in 1 place.
+    - On-disk HTTP cache. Stores validators (ETag / Last-Modified), sends If-None-Match / If-Modified-Since,
+      honors Cache-Control (max-age, no-cache, no-store) & serves the cached body on a 304
+    - Every response is tagged with a body hash, so downstream parsers can skip work when the body is unchanged
+    - Every body fetched from the network is saved in the raw page archive (page_archive)
+    - Replay mode serves archived bodies instead of the network (no network access at all)
+    - Every network request is paced per host (token bucket + AIMD concurrency window, see net_limiter)
+    - Every network request runs under the request policy (deadlines, retry budget, hedged JSON GETs, see net_policy)
+    - Single-flight: concurrent / near-simultaneous gets of the same URL share 1 network call & 1 response
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    session = None          # default requests session (used when caller doesnt own a session)
+    cache_dir = os.path.join(os.path.expanduser("~"), ".aop", "http_cache")
+    cache_on = True         # global cache switch
+    archive = None          # page_archive. Raw page bodies are recorded here (None = no archiving)
+    replaying = False       # True = serve every get() from the archive. NO network
+    limiter = None          # net_limiter. Per host rate & concurrency control
+    policy = None           # net_policy. Deadlines, retries & hedging
+    flights = {}            # { url: in-flight (or just landed) single-flight get }
+    flight_linger = 2.0     # secs. A landed response is shared with gets arriving this soon after it
+    stats = {}              # run stats (hits, revalidated, misses, bypass, replayed, deduped)
+
+    cc_maxage_rx = re.compile(r'max-age\s*=\s*(\d+)')
+
+    def __init__(self, yti, cache_dir=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        if cache_dir is not None:
+            self.cache_dir = cache_dir
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.limiter = net_limiter(yti)
+        self.policy = net_policy(yti)
+        self.flights = {}
+        self.stats = {'fresh': 0, 'revalidated': 0, 'miss': 0, 'bypass': 0, 'replay': 0, 'replay_miss': 0, 'deduped': 0}
+        return
+
+######################################################################
+# method 1
+    def get(self, url, session=None, cache=True, hedge=None, **kwargs):
+        """
+        Shared GET.
+        session : callers requests/requests_html session (cookies live there). None = use the shared session
+        cache   : False for cookie-priming gets (we need the live Set-Cookie, never a cached body)
+        hedge   : hedge slow requests with a duplicate. None = auto (idempotent JSON API hosts)
+        Returns a requests Response (HTMLResponse if session is an HTMLSession) with 2 extra attributes...
+            resp.cache_state : fresh | revalidated | miss | bypass | replay | replay_miss
+            resp.body_hash   : sha256 of the body bytes
+        NOTE: cookie-priming gets (cache=False) are never coalesced. Each caller needs its own Set-Cookie
+        """
+        cmi_debug = __name__+"::"+self.get.__name__+".#"+str(self.yti)
+        session = self.session if session is None else session
+        if self.replaying:
+            return self.replay_get(session, url)
+        if not (cache and self.cache_on):
+            resp = self.net_get(session, url, hedge, **kwargs)
+            return self.tag_response(resp, "bypass", url)
+
+        now = time.monotonic()
+        with self.lock:
+            flight = self.flights.get(url)
+            if flight is not None and flight['landed'] is not None and now - flight['landed'] > self.flight_linger:
+                flight = None
+            leader = flight is None
+            if leader:
+                if len(self.flights) > 64:                  # drop stale flights
+                    self.flights = { u: f for u, f in self.flights.items() if f['landed'] is None or now - f['landed'] <= self.flight_linger }
+                flight = {'done': threading.Event(), 'resp': None, 'err': None, 'landed': None}
+                self.flights[url] = flight
+
+        if leader:
+            try:
+                flight['resp'] = self.cached_get(url, session, hedge, **kwargs)
+            except Exception as e:
+                flight['err'] = e
+                with self.lock:
+                    self.flights.pop(url, None)             # dont share a failure with later gets
+                raise
+            finally:
+                flight['landed'] = time.monotonic()
+                flight['done'].set()
+            return flight['resp']
+
+        logging.info( f'%s - single-flight / join in-flight get: {url}' % cmi_debug )
+        flight['done'].wait()
+        if flight['err'] is not None:
+            raise flight['err']
+        with self.lock:
+            self.stats['deduped'] += 1
+        return self.clone_response(flight['resp'], session)
+
+######################################################################
+# method 2
+    def cached_get(self, url, session, hedge, **kwargs):
+        """HTTP cache layer. Serve fresh entries, revalidate stale ones, store cacheable responses"""
+        cmi_debug = __name__+"::"+self.cached_get.__name__+".#"+str(self.yti)
+        key = self.cache_key(url)
+        meta, body = self.cache_read(key)
+        if meta is not None and body is not None:
+            if self.is_fresh(meta):
+                logging.info( f'%s - Cache FRESH (max-age) / no network: {key[:12]}' % cmi_debug )
+                return self.tag_response(self.cached_response(session, url, meta, body), "fresh", url)
+            headers = dict(kwargs.pop('headers', None) or {})
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+            kwargs['headers'] = headers
+
+        resp = self.net_get(session, url, hedge, **kwargs)
+        if resp.status_code == 304 and meta is not None and body is not None:
+            logging.info( f'%s - 304 Not Modified / serve cached body: {key[:12]}' % cmi_debug )
+            resp.status_code = 200
+            resp._content = body                                   # keep the live response (cookies!) + cached body
+            resp.encoding = meta.get('encoding') or resp.encoding
+            self.cache_write(key, url, resp, body, meta)           # refresh stored_at / max-age
+            return self.tag_response(resp, "revalidated", url)
+
+        if resp.status_code == 200:
+            self.cache_write(key, url, resp, resp.content, None)
+        return self.tag_response(resp, "miss", url)
+
+######################################################################
+# method 3
+    def net_get(self, session, url, hedge, **kwargs):
+        """The only place that touches the network. Request policy (deadline/retry/hedge) wraps each paced get"""
+        host = urlparse(url).netloc
+        hedge = (host in self.policy.hedge_hosts) if hedge is None else hedge
+        timeout = kwargs.pop('timeout', None)
+        left = self.policy.remaining()                             # callers thread. Attempts may run on hedge threads
+        deadline = None if left is None else time.monotonic() + left
+        return self.policy.run(host, lambda t: self.paced_get(session, url, host, deadline=deadline, timeout=t, **kwargs), timeout, hedge,
+                               lambda t: self.paced_get(session, url, host, wait=False, timeout=t, **kwargs))
+
+######################################################################
+# method 4
+    def paced_get(self, session, url, host, wait=True, deadline=None, **kwargs):
+        """
+        1 network attempt. Paced by the per host limiter, outcome fed back into it
+        wait=False : hedges. Dont queue behind the host's concurrency window, return None if there's no free slot
+        deadline   : time.monotonic() value. The limiter wait is clipped to it (raises deadline_exceeded)
+        """
+        if wait:
+            try:
+                self.limiter.acquire(host, None if deadline is None else deadline - time.monotonic())
+            except deadline_exceeded:
+                with self.policy.lock:
+                    self.policy.deadline_hits += 1
+                raise
+        elif self.limiter.try_acquire(host) != 0.0:
+            return None
+        t0 = time.monotonic()
+        try:
+            resp = session.get(url, **kwargs)
+            resp.content                                           # stream=True callers. Pull body inside the slot
+        except requests.exceptions.Timeout:
+            self.limiter.release(host, None, time.monotonic() - t0, timed_out=True)
+            raise
+        except requests.exceptions.RequestException:
+            self.limiter.release(host, None, None)
+            raise
+        retry_after = resp.headers.get('Retry-After', "")
+        self.limiter.release(host, resp.status_code, time.monotonic() - t0, retry_after=int(retry_after) if retry_after.isdigit() else None)
+        return resp
+
+######################################################################
+# method 5
+    def clone_response(self, resp, session):
+        """Private copy of a shared single-flight response (callers render/mutate their response in place)"""
+        c = requests.Response()
+        c.__dict__.update({ k: v for k, v in resp.__dict__.items() if k not in ('session', '_html') })
+        c.headers = copy.copy(resp.headers)
+        if isinstance(session, HTMLSession):
+            c = HTMLResponse._from_response(c, session)
+        return c
+
+######################################################################
+# method 6
+    def tag_response(self, resp, state, url):
+        """Tag response with cache state & body hash. Count it in the run stats & archive the body (keyed by requested url)"""
+        resp.cache_state = state
+        resp.body_hash = hashlib.sha256(resp.content or b"").hexdigest()
+        with self.lock:
+            self.stats[state] += 1
+        if self.archive is not None and not self.replaying and state != "fresh":
+            self.archive.store(url, resp.content or b"", "get", resp.status_code, resp.encoding, resp.headers.get('Content-Type'))
+        return resp
+
+######################################################################
+# method 7
+    def cached_response(self, session, url, meta, body):
+        """Build a Response from a cache entry (no network)"""
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = body
+        resp.url = url
+        resp.encoding = meta.get('encoding')
+        resp.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        resp.request = requests.Request('GET', url).prepare()
+        if isinstance(session, HTMLSession):
+            resp = HTMLResponse._from_response(resp, session)     # callers expect resp.html
+        return resp
+
+######################################################################
+# method 8
+    def cache_control(self, resp):
+        """Decode Cache-Control into (max_age, no_cache, no_store)"""
+        cc = resp.headers.get('Cache-Control', "").lower()
+        m = self.cc_maxage_rx.search(cc)
+        max_age = int(m.group(1)) if m else 0
+        if 'no-cache' in cc:
+            max_age = 0
+        try:
+            max_age -= int(resp.headers.get('Age', 0))             # time already spent in upstream caches
+        except ValueError:
+            pass
+        return max(max_age, 0), ('no-cache' in cc), ('no-store' in cc)
+
+######################################################################
+# method 9
+    def is_fresh(self, meta):
+        return meta.get('max_age', 0) > 0 and (time.time() - meta.get('stored_at', 0)) < meta['max_age']
+
+######################################################################
+# method 10
+    def cache_key(self, url):
+        return hashlib.sha256(url.encode()).hexdigest()
+
+######################################################################
+# method 11
+    def cache_read(self, key):
+        """Return (meta, body) for a cache key or (None, None)"""
+        path = os.path.join(self.cache_dir, key)
+        try:
+            with open(path + ".json") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+######################################################################
+# method 12
+    def cache_write(self, key, url, resp, body, old_meta):
+        """Store body + validators. Only cacheable responses (validators or max-age, not no-store) are kept"""
+        max_age, no_cache, no_store = self.cache_control(resp)
+        etag = resp.headers.get('ETag') or (old_meta or {}).get('etag')
+        last_mod = resp.headers.get('Last-Modified') or (old_meta or {}).get('last_modified')
+        if no_store or not (etag or last_mod or max_age):
+            return
+        meta = { 'url': url,
+                 'etag': etag,
+                 'last_modified': last_mod,
+                 'max_age': max_age,
+                 'stored_at': time.time(),
+                 'encoding': resp.encoding,
+                 'body_hash': hashlib.sha256(body).hexdigest(),
+                 'headers': {k: v for k, v in resp.headers.items() if k.lower() in ('content-type', 'etag', 'last-modified', 'cache-control')} }
+        path = os.path.join(self.cache_dir, key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if old_meta is None or old_meta.get('body_hash') != meta['body_hash']:
+                with open(path + ".body.tmp", "wb") as f:
+                    f.write(body)
+                os.replace(path + ".body.tmp", path + ".body")
+            with open(path + ".json.tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(path + ".json.tmp", path + ".json")
+        except OSError as e:
+            logging.info( f'net_fetcher::cache_write - cant write cache entry: {e}' )
+        return
+
+######################################################################
+# method 13
+    def print_stats(self):
+        print ( f"========== Network fetch stats ==========" )
+        if self.replaying:
+            print ( f"REPLAY from: {self.archive.archive_dir} / served: {self.stats['replay']} / not in archive: {self.stats['replay_miss']}" )
+            return
+        print ( f"HTTP cache / fresh: {self.stats['fresh']} / revalidated (304): {self.stats['revalidated']} / miss: {self.stats['miss']} / bypass: {self.stats['bypass']}" )
+        print ( f"Single-flight / deduped gets: {self.stats['deduped']}" )
+        self.limiter.print_stats()
+        self.policy.print_stats()
+        if self.archive is not None:
+            print ( f"Page archive: {self.archive.archive_dir} / new bodies: {self.archive.stored} / deduped: {self.archive.deduped}" )
+        return
+
+######################################################################
+# method 14
+    def set_archive(self, archive, replay=False):
+        """Record raw pages into archive (page_archive). replay=True serves ONLY from the archive (offline)"""
+        cmi_debug = __name__+"::"+self.set_archive.__name__+".#"+str(self.yti)
+        self.archive = archive
+        self.replaying = replay
+        if replay:
+            archive.load_replay()
+            logging.info( f'%s - REPLAY mode / offline from: {archive.archive_dir}' % cmi_debug )
+        return
+
+######################################################################
+# method 15
+    def replay_get(self, session, url):
+        """Build a response from the archive. URLs that were never archived get an empty (skeleton page) 404"""
+        entry, body = self.archive.replay(url, "get")
+        if entry is None:
+            resp = self.cached_response(session, url, {}, b"<html><body></body></html>")     # requests_html chokes on b""
+            resp.status_code = 404
+            return self.tag_response(resp, "replay_miss", url)
+        meta = { 'encoding': entry['encoding'], 'headers': {'Content-Type': entry['content_type'] or ""} }
+        resp = self.cached_response(session, url, meta, body)
+        resp.status_code = entry['status']
+        return self.tag_response(resp, "replay", url)
+
+######################################################################
+# Shared fetcher. All collectors go through this single fetch path
+
+shared_fetcher = None
+
+def get_fetcher():
+    """Return the process wide network fetcher (created on 1st use)"""
+    global shared_fetcher
+    if shared_fetcher is None:
+        shared_fetcher = net_fetcher(1)
+    return shared_fetcher
@@ -0,0 +1,203 @@
+#! python3
+import threading
+import asyncio
+import time
+import logging
+from rich import print
+
+from net_policy import deadline_exceeded
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class net_limiter:
+    """
+    Per-host adaptive rate limiter & concurrency controller for the shared fetch path.
+    nasdaq.com & finance.yahoo.com throttle/block request bursts. Each host gets...
+    - a token bucket (requests/sec + burst size)
+    - an AIMD concurrency window. +1 per window of clean responses (additive increase),
+      halved on 429 / 403 / timeout / latency inflation (multiplicative decrease). The request
+      rate is cut with the window & creeps back up to the configured rate
+    - Retry-After from a 429/503 pauses the whole host
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    hosts = {}              # { host: per host limiter state }
+    lat_factor = 3.0        # latency > lat_factor x baseline latency = inflation (server is queueing us)
+    min_rate = 0.2          # never throttle a host below this (requests/sec)
+
+    # per source config. rate = requests/sec, burst = token bucket depth, max_conc = concurrency ceiling
+    host_cfg = { 'api.nasdaq.com':            {'rate': 4.0, 'burst': 4, 'max_conc': 4},
+                 'www.nasdaq.com':            {'rate': 2.0, 'burst': 2, 'max_conc': 2},
+                 'finance.yahoo.com':         {'rate': 3.0, 'burst': 6, 'max_conc': 4},
+                 'bigcharts.marketwatch.com': {'rate': 2.0, 'burst': 2, 'max_conc': 2},
+                 'default':                   {'rate': 5.0, 'burst': 5, 'max_conc': 4} }
+
+    def __init__(self, yti, host_cfg=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.host_cfg = dict(self.host_cfg)
+        if host_cfg is not None:
+            self.host_cfg.update(host_cfg)
+        self.lock = threading.Lock()
+        self.hosts = {}
+        return
+
+######################################################################
+# method 1
+    def configure(self, host, rate=None, burst=None, max_conc=None):
+        """Set/override the limits for 1 source host (e.g. api.nasdaq.com)"""
+        cfg = dict(self.host_cfg.get(host, self.host_cfg['default']))
+        for k, v in (('rate', rate), ('burst', burst), ('max_conc', max_conc)):
+            if v is not None:
+                cfg[k] = v
+        with self.lock:
+            self.host_cfg[host] = cfg
+            self.hosts.pop(host, None)          # rebuilt with the new limits on next use
+        return cfg
+
+######################################################################
+# method 2
+    def host_state(self, host):
+        with self.lock:
+            h = self.hosts.get(host)
+            if h is None:
+                cfg = self.host_cfg.get(host, self.host_cfg['default'])
+                h = { 'cfg': cfg,
+                      'rate': float(cfg['rate']),         # current (adaptive) request rate
+                      'tokens': float(cfg['burst']),
+                      'last_fill': time.monotonic(),
+                      'cwnd': 1.0,                        # AIMD concurrency window. Slow start at 1
+                      'inflight': 0,
+                      'paused_until': 0.0,                # Retry-After
+                      'base_lat': None,                   # baseline (best recent) latency secs
+                      'requests': 0,
+                      'throttled': 0,                     # 429 / 403 / timeout / inflation events
+                      'cond': threading.Condition() }
+                self.hosts[host] = h
+        return h
+
+######################################################################
+# method 3
+    def acquire(self, host, budget=None):
+        """
+        Block until this host has a free concurrency slot AND a rate token.
+        budget : max secs to wait (the callers net_policy.remaining()). None = no limit.
+                 Raises deadline_exceeded when it runs out (a long Retry-After pause or a full cwnd)
+        """
+        cmi_debug = __name__+"::"+self.acquire.__name__+".#"+str(self.yti)
+        h = self.host_state(host)
+        deadline = None if budget is None else time.monotonic() + budget
+        with h['cond']:
+            while h['inflight'] >= int(h['cwnd']):
+                h['cond'].wait(self.wait_left(host, deadline, None))
+            h['inflight'] += 1
+            while True:
+                now = time.monotonic()
+                h['tokens'] = min(h['cfg']['burst'], h['tokens'] + (now - h['last_fill']) * h['rate'])
+                h['last_fill'] = now
+                wait = max(h['paused_until'] - now, 0.0)
+                if wait == 0.0 and h['tokens'] >= 1.0:
+                    h['tokens'] -= 1.0
+                    break
+                wait = max(wait, (1.0 - h['tokens']) / h['rate'])
+                logging.info( f'%s - {host} / rate limited. wait {wait:.2f}s' % cmi_debug )
+                try:
+                    wait = self.wait_left(host, deadline, wait)
+                except deadline_exceeded:
+                    h['inflight'] -= 1                  # give the slot back
+                    h['cond'].notify()
+                    raise
+                h['cond'].wait(wait)
+        return
+
+    def wait_left(self, host, deadline, wait):
+        """Clip a cond wait to the deadline. Raises deadline_exceeded if it's all used up"""
+        if deadline is None:
+            return wait
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise deadline_exceeded(f"deadline expired / waiting for a {host} limiter slot")
+        return left if wait is None else min(wait, left)
+
+######################################################################
+# method 4
+    def try_acquire(self, host):
+        """Non blocking acquire (for asyncio callers). Returns 0.0 if the slot + token were taken, else secs to wait"""
+        h = self.host_state(host)
+        with h['cond']:
+            if h['inflight'] >= int(h['cwnd']):
+                return 0.05
+            now = time.monotonic()
+            h['tokens'] = min(h['cfg']['burst'], h['tokens'] + (now - h['last_fill']) * h['rate'])
+            h['last_fill'] = now
+            wait = max(h['paused_until'] - now, 0.0)
+            if wait == 0.0 and h['tokens'] >= 1.0:
+                h['tokens'] -= 1.0
+                h['inflight'] += 1
+                return 0.0
+            return max(wait, (1.0 - h['tokens']) / h['rate'])
+
+######################################################################
+# method 5
+    async def acquire_async(self, host):
+        """asyncio acquire. Yields to the event loop while this host is rate/concurrency limited"""
+        while True:
+            wait = self.try_acquire(host)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+######################################################################
+# method 6
+    def release(self, host, status, latency, timed_out=False, retry_after=None):
+        """
+        Return the slot & feed the outcome back into the AIMD controller.
+        status = HTTP status (None if the request failed), latency = secs
+        """
+        cmi_debug = __name__+"::"+self.release.__name__+".#"+str(self.yti)
+        h = self.host_state(host)
+        with h['cond']:
+            h['inflight'] -= 1
+            h['requests'] += 1
+            inflated = False
+            if latency is not None and not timed_out:
+                if h['base_lat'] is None or latency < h['base_lat']:
+                    h['base_lat'] = latency
+                else:
+                    h['base_lat'] = h['base_lat'] * 0.95 + latency * 0.05   # let baseline drift up slowly
+                inflated = latency > self.lat_factor * h['base_lat'] and latency > 1.0
+
+            if timed_out or status in (429, 403) or inflated:
+                h['throttled'] += 1
+                h['cwnd'] = max(1.0, h['cwnd'] / 2)                    # multiplicative decrease
+                h['rate'] = max(self.min_rate, h['rate'] / 2)
+                if retry_after:
+                    h['paused_until'] = time.monotonic() + retry_after
+                logging.info( f'%s - {host} BACKOFF [status: {status} / timeout: {timed_out} / inflated: {inflated}] cwnd: {h["cwnd"]:.1f} rate: {h["rate"]:.2f}/s' % cmi_debug )
+            elif status is not None and status < 500:
+                h['cwnd'] = min(float(h['cfg']['max_conc']), h['cwnd'] + 1.0 / h['cwnd'])   # additive increase
+                h['rate'] = min(float(h['cfg']['rate']), h['rate'] + h['cfg']['rate'] * 0.1)
+            h['cond'].notify_all()
+        return
+
+######################################################################
+# method 7
+    def host_stats(self):
+        """Return { host: {rate, concurrency, inflight, requests, throttled} }"""
+        return { host: { 'rate': round(h['rate'], 2),
+                         'concurrency': int(h['cwnd']),
+                         'inflight': h['inflight'],
+                         'requests': h['requests'],
+                         'throttled': h['throttled'] } for host, h in list(self.hosts.items()) }
+
+######################################################################
+# method 8
+    def print_stats(self):
+        for host, s in self.host_stats().items():
+            print ( f"{host:<28} rate: {s['rate']}/s / concurrency: {s['concurrency']} / requests: {s['requests']} / throttled: {s['throttled']}" )
+        return
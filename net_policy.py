@@ -0,0 +1,281 @@
+#! python3
+import requests
+import concurrent.futures
+import contextlib
+import threading
+import statistics
+import random
+import time
+import logging
+from collections import deque
+from rich import print
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class deadline_exceeded(requests.exceptions.Timeout):
+    """Run / stage deadline budget is used up. Subclass of Timeout, so existing timeout handling catches it"""
+    pass
+
+#####################################################
+
+class net_policy:
+    """
+    Request policy layer for the shared fetch path. Fights tail latency...
+    - Deadlines: a per-run budget & a per-stage budget (tops, uvol, news...). Every request timeout is
+      clipped to the time left. An expired deadline raises deadline_exceeded. Run inside stage() it
+      cancels the rest of that stage only & the run moves on
+    - Retries: jittered exponential backoff (full jitter) for timeouts, connection errors, 429 & 5xx.
+      Bounded by a retry budget (retries <= retry_ratio of all requests) so a sick host cant trigger a retry storm
+    - Hedging: idempotent JSON GETs that run past the host's p95 latency get a duplicate request.
+      1st response wins. Hedges are budgeted too
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    default_timeout = 10    # secs. Used when the caller doesnt set a timeout
+    max_retries = 2         # per request
+    backoff_base = 0.25     # secs. Backoff = random(0, min(backoff_cap, base * 2^attempt))
+    backoff_cap = 4.0
+    retry_ratio = 0.1       # retry budget. Retries allowed = retry_ratio x requests + retry_floor
+    retry_floor = 3
+    hedge_ratio = 0.1       # hedge budget (same shape as retry budget)
+    hedge_after = 1.5       # secs. Hedge delay until a host has enough latency samples for a p95
+    hedge_hosts = {'api.nasdaq.com'}    # hosts that serve idempotent JSON GETs (hedge by default)
+    retry_status = {429, 500, 502, 503, 504}
+    run_deadline = None     # time.monotonic() value. None = no run deadline
+    stage_name = None
+    stage_deadline = None
+    cancelled = []          # stages cancelled by their deadline, in run order
+
+    # per stage deadline budgets (secs). Generous on purpose. They catch hangs, not normal slow runs
+    stage_budgets = { 'tops': 120, 'losers': 120, 'tenten60': 300, 'screen': 120, 'uvol': 60,
+                      'perf': 180, 'news': 900, 'quote': 60 }
+
+    def __init__(self, yti):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.lock = threading.Lock()
+        self.latency = {}                       # { host: deque of recent latencies (secs) }
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedge_skips = 0
+        self.deadline_hits = 0
+        self.hedge_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="net_hedge")
+        self.local = threading.local()          # per thread job deadline (daemon jobs). See begin_job()
+        self.cancelled = []
+        return
+
+######################################################################
+# method 1
+    def set_run_deadline(self, secs):
+        """Whole run budget (secs from now). None = no run deadline"""
+        self.run_deadline = None if secs is None else time.monotonic() + secs
+        return
+
+######################################################################
+# method 2
+    def begin_stage(self, name, secs=None):
+        """Start a new stage budget. Replaces the previous stage (stages run 1 after the other in main)"""
+        cmi_debug = __name__+"::"+self.begin_stage.__name__+".#"+str(self.yti)
+        secs = self.stage_budgets.get(name) if secs is None else secs
+        self.stage_name = name
+        self.stage_deadline = None if secs is None else time.monotonic() + secs
+        logging.info( f'%s - Stage: {name} / budget: {secs}s' % cmi_debug )
+        return
+
+######################################################################
+# method 2.1
+    @contextlib.contextmanager
+    def stage(self, name, secs=None):
+        """
+        with policy.stage("tops"): ...   Run a block under a stage budget. deadline_exceeded inside it is
+        caught & logged, the rest of the block is skipped & the run moves on. Budget ends with the block
+        """
+        cmi_debug = __name__+"::"+self.stage.__name__+".#"+str(self.yti)
+        self.begin_stage(name, secs)
+        try:
+            yield
+        except deadline_exceeded as e:
+            self.cancelled.append(name)
+            logging.warning( f'%s - Stage: {name} CANCELLED / {e}' % cmi_debug )
+            print ( f"Stage {name} cancelled / {e}" )
+        finally:
+            self.stage_name = None
+            self.stage_deadline = None
+        return
+
+    def stage_ok(self, name):
+        """False if the stage was cancelled (its data is incomplete)"""
+        return name not in self.cancelled
+
+######################################################################
+# method 2.2
+    def begin_job(self, name, secs=None):
+        """
+        Start a job budget for the calling thread only. Daemon jobs run side by side on a worker pool,
+        so they cant share the 1 stage budget. Blocking fetches made by this thread are clipped to it
+        """
+        cmi_debug = __name__+"::"+self.begin_job.__name__+".#"+str(self.yti)
+        self.local.job = (name, None if secs is None else time.monotonic() + secs)
+        logging.info( f'%s - Job: {name} / budget: {secs}s' % cmi_debug )
+        return
+
+    def end_job(self):
+        self.local.job = None
+        return
+
+######################################################################
+# method 3
+    def remaining(self):
+        """Secs left before the nearest deadline (run, stage or this thread's job). None = no deadline"""
+        job = getattr(self.local, 'job', None)
+        d = [ x for x in (self.run_deadline, self.stage_deadline, job[1] if job else None) if x is not None ]
+        if not d:
+            return None
+        return min(d) - time.monotonic()
+
+######################################################################
+# method 4
+    def timeout_for(self, timeout):
+        """Clip a request/render timeout to the deadline budget. Raises deadline_exceeded if it's all used up"""
+        left = self.remaining()
+        if left is None:
+            return timeout
+        if left <= 0:
+            with self.lock:
+                self.deadline_hits += 1
+            job = getattr(self.local, 'job', None)
+            raise deadline_exceeded(f"deadline expired / stage: {self.stage_name}" + (f" / job: {job[0]}" if job else ""))
+        return left if timeout is None else min(timeout, left)
+
+######################################################################
+# method 5
+    def run(self, host, fn, timeout=None, hedge=False, hedge_fn=None):
+        """
+        Run fn(timeout) -> Response under the policy (deadline, retries, hedging)
+        fn must be an idempotent GET.
+        hedge_fn : the duplicate request. Same as fn but must NOT wait for a limiter slot.
+                   Returns None if the host has no free slot (the hedge is skipped). None = use fn
+        """
+        cmi_debug = __name__+"::"+self.run.__name__+".#"+str(self.yti)
+        timeout = self.default_timeout if timeout is None else timeout
+        with self.lock:
+            self.requests += 1
+        attempt = 0
+        while True:
+            t = self.timeout_for(timeout)
+            t0 = time.monotonic()
+            try:
+                resp = self.hedged(host, fn, t, hedge_fn) if hedge else fn(t)
+            except deadline_exceeded:
+                raise
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if not self.may_retry(attempt):
+                    raise
+                logging.info( f'%s - {host} / {type(e).__name__} / retry #{attempt+1}' % cmi_debug )
+            else:
+                self.record(host, time.monotonic() - t0)
+                if resp.status_code not in self.retry_status or not self.may_retry(attempt):
+                    return resp
+                logging.info( f'%s - {host} / HTTP {resp.status_code} / retry #{attempt+1}' % cmi_debug )
+                resp.close()
+            self.backoff(attempt)
+            attempt += 1
+
+######################################################################
+# method 6
+    def may_retry(self, attempt):
+        """Per request retry limit + global retry budget"""
+        with self.lock:
+            if attempt >= self.max_retries or self.retries >= self.retry_ratio * self.requests + self.retry_floor:
+                return False
+            self.retries += 1
+        return True
+
+######################################################################
+# method 7
+    def backoff(self, attempt):
+        """Full jitter exponential backoff. Never sleeps past the deadline"""
+        time.sleep(self.backoff_delay(attempt))
+        return
+
+    def backoff_delay(self, attempt):
+        pause = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        left = self.remaining()
+        if left is not None:
+            pause = min(pause, max(left, 0))
+        return pause
+
+######################################################################
+# method 8
+    def hedged(self, host, fn, timeout, hedge_fn=None):
+        """
+        Fire fn. If it's still running after the host's p95 latency, fire a duplicate (hedge_fn).
+        Return whichever finishes 1st. The loser is left to finish in the background & discarded.
+        A hedge that finds no free limiter slot (hedge_fn returns None) is skipped & not counted.
+        """
+        cmi_debug = __name__+"::"+self.hedged.__name__+".#"+str(self.yti)
+        first = self.hedge_pool.submit(fn, timeout)
+        delay = self.hedge_delay(host)
+        try:
+            return first.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        if not self.may_hedge():
+            return first.result()
+        logging.info( f'%s - {host} / slow > {delay:.2f}s / HEDGE request' % cmi_debug )
+        second = self.hedge_pool.submit(hedge_fn or fn, max(timeout - delay, 0.5))
+        done, pending = concurrent.futures.wait([first, second], return_when=concurrent.futures.FIRST_COMPLETED)
+        if second in done and second.exception() is None and second.result() is None:
+            logging.info( f'%s - {host} / no free slot / hedge skipped' % cmi_debug )
+            with self.lock:
+                self.hedges -= 1                             # give the hedge budget back
+                self.hedge_skips += 1
+            return first.result()
+        ok = [ f for f in done if f.exception() is None ]
+        if ok:
+            winner = ok[0]
+        else:                                                # 1st one to finish failed. Wait for the other
+            winner = pending.pop() if pending else done.pop()
+        if winner is second:
+            with self.lock:
+                self.hedge_wins += 1
+        return winner.result()
+
+######################################################################
+# method 9
+    def may_hedge(self):
+        """Hedge budget. Counts the hedge if allowed"""
+        with self.lock:
+            if self.hedges >= self.hedge_ratio * self.requests + self.retry_floor:
+                return False
+            self.hedges += 1
+        return True
+
+######################################################################
+# method 10
+    def hedge_delay(self, host):
+        """p95 latency of this host (or hedge_after until there are enough samples)"""
+        lat = self.latency.get(host)
+        if lat is None or len(lat) < 20:
+            return self.hedge_after
+        return statistics.quantiles(lat, n=20)[18]
+
+######################################################################
+# method 11
+    def record(self, host, secs):
+        with self.lock:
+            self.latency.setdefault(host, deque(maxlen=200)).append(secs)
+        return
+
+######################################################################
+# method 12
+    def print_stats(self):
+        print ( f"Request policy / requests: {self.requests} / retries: {self.retries} / hedges: {self.hedges} (won: {self.hedge_wins} / no slot: {self.hedge_skips}) / deadline hits: {self.deadline_hits}" )
+        return
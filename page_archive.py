@@ -0,0 +1,150 @@
+#! python3
+import threading
+import hashlib
+import json
+import gzip
+import os
+import time
+import logging
+
+try:
+    import zstandard                # optional: zstd compression. Falls back to gzip if not installed
+except ImportError:
+    zstandard = None
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class page_archive:
+    """
+    Content-addressed archive of every raw page body fetched by the collectors.
+    - Bodies are stored once per unique content (sha256 of the body) as zstd compressed blobs
+    - index.jsonl records every fetch: URL + timestamp -> body hash (append only)
+    - Replay mode serves the archived bodies (in recorded order, per URL) instead of the network,
+      so parsers, combo logic & NLP can be benchmarked deterministically offline
+    Layout:  <archive_dir>/index.jsonl
+             <archive_dir>/blobs/ab/ab12...ef.zst
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    archive_dir = os.path.join(os.path.expanduser("~"), ".aop", "archive")
+    replay_idx = {}         # { (kind, url): [ index entries ] } loaded for replay
+    replay_pos = {}         # { (kind, url): next entry to serve }
+
+    def __init__(self, yti, archive_dir=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        if archive_dir is not None:
+            self.archive_dir = archive_dir
+        self.lock = threading.Lock()
+        self.replay_idx = {}
+        self.replay_pos = {}
+        self.stored = 0
+        self.deduped = 0
+        return
+
+######################################################################
+# method 1
+    def store(self, url, body, kind="get", status=200, encoding=None, content_type=None):
+        """
+        Archive 1 fetched body. kind = get (raw HTTP body) | render (JS rendered DOM)
+        Identical bodies are written once. Every fetch gets an index entry.
+        """
+        cmi_debug = __name__+"::"+self.store.__name__+".#"+str(self.yti)
+        if isinstance(body, str):
+            body = body.encode(encoding or "utf-8")
+        body_hash = hashlib.sha256(body).hexdigest()
+        entry = { 'ts': time.time(),
+                  'kind': kind,
+                  'url': url,
+                  'hash': body_hash,
+                  'status': status,
+                  'encoding': encoding,
+                  'content_type': content_type }
+        try:
+            with self.lock:
+                path = self.blob_path(body_hash)
+                if os.path.exists(path):
+                    self.deduped += 1
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path + ".tmp", "wb") as f:
+                        f.write(self.compress(body))
+                    os.replace(path + ".tmp", path)
+                    self.stored += 1
+                with open(os.path.join(self.archive_dir, "index.jsonl"), "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logging.info( f'%s - cant archive page: {e}' % cmi_debug )
+        return body_hash
+
+######################################################################
+# method 2
+    def load_replay(self):
+        """Load the archive index for replay. Returns number of archived fetches"""
+        cmi_debug = __name__+"::"+self.load_replay.__name__+".#"+str(self.yti)
+        self.replay_idx = {}
+        self.replay_pos = {}
+        n = 0
+        with open(os.path.join(self.archive_dir, "index.jsonl")) as f:
+            for line in f:
+                try:
+                    e = json.loads(line)
+                except ValueError:
+                    continue                        # torn last line from a killed run
+                self.replay_idx.setdefault((e['kind'], e['url']), []).append(e)
+                n += 1
+        for v in self.replay_idx.values():
+            v.sort(key=lambda e: e['ts'])
+        logging.info( f'%s - Replay index: {n} fetches / {len(self.replay_idx)} unique URLs' % cmi_debug )
+        return n
+
+######################################################################
+# method 3
+    def replay(self, url, kind="get"):
+        """
+        Serve the next archived body for this URL (same order as recorded. The last one repeats)
+        Returns (entry, body) or (None, None) if the URL was never archived
+        """
+        cmi_debug = __name__+"::"+self.replay.__name__+".#"+str(self.yti)
+        key = (kind, url)
+        with self.lock:
+            entries = self.replay_idx.get(key)
+            if not entries:
+                logging.warning( f'%s - NOT in archive: {kind} {url}' % cmi_debug )
+                return None, None
+            pos = self.replay_pos.get(key, 0)
+            self.replay_pos[key] = min(pos + 1, len(entries) - 1)
+        e = entries[pos]
+        with open(self.blob_path(e['hash']), "rb") as f:
+            body = self.decompress(f.read())
+        return e, body
+
+######################################################################
+# method 4
+    def blob_path(self, body_hash):
+        ext = ".zst" if zstandard is not None else ".gz"
+        path = os.path.join(self.archive_dir, "blobs", body_hash[:2], body_hash + ext)
+        if not os.path.exists(path):                # archive may have been written with the other codec
+            alt = path[:-len(ext)] + (".gz" if ext == ".zst" else ".zst")
+            if os.path.exists(alt):
+                return alt
+        return path
+
+######################################################################
+# method 5
+    def compress(self, body):
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=10).compress(body)
+        return gzip.compress(body)
+
+######################################################################
+# method 6
+    def decompress(self, blob):
+        if blob[:4] == b'\x28\xb5\x2f\xfd':           # zstd frame magic
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
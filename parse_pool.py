@@ -0,0 +1,250 @@
+#! python3
+import concurrent.futures
+import threading
+import hashlib
+import atexit
+import logging
+import time
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+from rich import print
+
+from html_backend import get_html_backend
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+# Worker side extractors. Run inside the parse worker processes.
+# In: raw page bytes. Out: small dicts of plain str/int/bool (cheap to pickle). Parse trees never leave the worker
+
+def extract_news_feed(body, parser, zone_class, item_class):
+    """
+    News feed page (finance.yahoo.com/quote/XXX/news). Zone = the news stream container.
+    Returns { zone, children, tags, items, articles: [ {item, a_zone, headline, url, agency} ] }
+    item = 1 based <li> story item the article lives in. a_zone = running <a> tag counter (across all items)
+    """
+    soup = BeautifulSoup(body, parser, parse_only=SoupStrainer(attrs={"class": zone_class}))
+    zone = soup.find(attrs={"class": zone_class})
+    feed = { 'zone': zone is not None, 'children': 0, 'tags': 0, 'items': 0, 'articles': [] }
+    if zone is None:
+        return feed
+    feed['children'] = len(list(zone.children))
+    feed['tags'] = len(list(zone.descendants))
+    a_counter = 0
+    for n, li_tag in enumerate(zone.find_all(attrs={"class": item_class}), start=1):
+        feed['items'] = n
+        for element in li_tag.find_all("a"):
+            a_counter += 1
+            if element.h3 is None or not element.has_attr('href'):
+                continue
+            news_ag = li_tag.find(attrs={'class': 'publishing yf-1weyqlp'})
+            feed['articles'].append({ 'item': n,
+                                      'a_zone': a_counter,
+                                      'headline': element.h3.text,
+                                      'url': element.get("href"),
+                                      'agency': news_ag.text.split("•")[0] if news_ag is not None else "Failed to extract News Agency" })
+    return feed
+
+def extract_news_page(body, parser):
+    """
+    1 news article page (local article, fake local stub, op-ed, video).
+    Returns every field interpret_page() & extract_article_data() need + the article <p> texts
+    """
+    soup = BeautifulSoup(body, parser)
+    page = { 'doc_len': len(soup),
+             'author': None, 'pubdate': None, 'p': [],
+             'article': False, 'caption': None, 'stub_author': None, 'stub_pubdate': None, 'exturl': None,
+             'stub_continues': False, 'read_full': False, 'video_p': False }
+
+    local_news = soup.find(attrs={"class": "body yf-3qln1o"})              # full news article - locally hosted
+    local_news_meta = soup.find(attrs={"class": "main yf-cfn520"})         # comes above/before article
+    if local_news is not None:
+        page['p'] = [ p.text for p in local_news.find_all("p") ]
+    if local_news_meta is not None:
+        author_zone = local_news_meta.find("div", attrs={"class": "byline-attr-author yf-1k5w6kz"} )
+        pubdate_zone = local_news_meta.find("div", attrs={"class": "byline-attr-time-style"} )
+        if author_zone is not None:
+            author = author_zone.a.string if author_zone.a is not None else author_zone.string
+            page['author'] = str(author) if author is not None else None      # plain str. A NavigableString drags its whole tree into the pickle
+        if pubdate_zone is not None and pubdate_zone.time is not None and pubdate_zone.time.string is not None:
+            page['pubdate'] = str(pubdate_zone.time.string)
+
+    bmain = soup.body.find("main") if soup.body is not None else None      # fake local stub. Links out to a remote article
+    bmart = bmain.find("article") if bmain is not None else None
+    if bmart is not None:
+        page['article'] = True
+        cap = bmart.find("div", attrs={"class": "cover-title yf-1rjrr1"})
+        ath = bmart.find("div", attrs={"class": "byline-attr-author yf-1k5w6kz"})
+        dte = bmart.find("time", attrs={"class": "byline-attr-meta-time"})
+        azone = bmain.find("a")
+        page['caption'] = cap.text if cap is not None else None
+        page['stub_author'] = ath.text if ath is not None else None
+        page['stub_pubdate'] = dte.text if dte is not None else None
+        page['exturl'] = azone.get('href') if azone is not None else None
+
+    page['stub_continues'] = any(s.text == "Story continues" for s in soup.find_all(attrs={"class": "article yf-l7apfj"}))
+    local_story = soup.find(attrs={"class": "body yf-tsvcyu"})             # Op-Ed / video story - locally hosted
+    if local_story is not None:
+        page['read_full'] = local_story.button is not None and local_story.button.text == "Read full article"
+        page['video_p'] = local_story.find('p') is not None
+    return page
+
+#####################################################
+
+class parse_pool:
+    """
+    Process pool for the CPU bound HTML parsing in the news pipeline (news feed & article pages).
+    BS4 tree building is pure python & holds the GIL, so 1 parsing thread caps the whole news reader.
+    - Workers receive raw page bytes & return compact extracted results (see extract_*()), never soup objects
+    - Results are memoized by body hash. The same page is parsed once for interpret_page() & extract_article_data()
+    - workers=0 (or a broken pool) parses in-process. Same results, no parallelism
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    workers = 0             # worker processes. 0 = parse in-process
+    executor = None         # concurrent.futures.ProcessPoolExecutor (started on 1st submit)
+    memo = {}               # { (extractor, body hash): result }
+    max_memo = 256          # results kept in the memo
+
+    def __init__(self, yti, workers=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.workers = max(1, min(4, (os.cpu_count() or 1) - 1)) if workers is None else workers
+        self.lock = threading.Lock()
+        self.memo = {}
+        self.parsed = 0
+        self.memo_hits = 0
+        self.inline = 0                         # parsed in-process (workers=0 or pool failure)
+        self.wait = 0.0                         # secs callers spent blocked on parse results
+        return
+
+######################################################################
+# method 1
+    def start(self):
+        """
+        Spin up the worker processes. Only the 1st call does any work.
+        Call it early (start of the news stage). Workers are forked before the fetch/render threads exist
+        """
+        cmi_debug = __name__+"::"+self.start.__name__+".#"+str(self.yti)
+        with self.lock:
+            if self.executor is not None or self.workers == 0:
+                return
+            logging.info( f'%s - Start {self.workers} parse workers' % cmi_debug )
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            atexit.register(self.shutdown)
+        self.executor.submit(os.getpid).result()                # fork the workers now (before the fetch & render threads start)
+        return
+
+######################################################################
+# method 2
+    def submit(self, fn, body, *args):
+        """
+        Queue 1 page for parsing. fn = a module level extract_*() function
+        Returns a Future. The result is memoized by (fn, body hash)
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key = (fn.__name__, hashlib.sha256(body).hexdigest()) + args
+        with self.lock:
+            hit = self.memo.get(key)
+        if hit is not None:
+            self.memo_hits += 1
+            fut = concurrent.futures.Future()
+            fut.set_result(hit)
+            return fut
+        args = (body, get_html_backend().parser) + args
+        if self.executor is None:
+            self.start()
+        if self.executor is None:
+            fut = self._inline(fn, args)
+        else:
+            try:
+                fut = self.executor.submit(fn, *args)
+            except (concurrent.futures.process.BrokenProcessPool, RuntimeError) as e:
+                logging.warning( f'parse_pool::submit - worker pool unusable / parse in-process: {e}' )
+                self.executor = None
+                self.workers = 0
+                fut = self._inline(fn, args)
+        fut.add_done_callback(lambda f: self._done(key, f))
+        return fut
+
+######################################################################
+# method 3
+    def run(self, fn, body, *args):
+        """Blocking parse of 1 page. Waits on the worker (GIL is free for the fetch & render threads meanwhile)"""
+        t0 = time.perf_counter()
+        result = self._result(self.submit(fn, body, *args), fn, body, args)
+        self.wait += time.perf_counter() - t0
+        return result
+
+######################################################################
+# method 4
+    def map(self, fn, bodies, *args):
+        """Parse many pages across all workers. Results in the same order as bodies"""
+        t0 = time.perf_counter()
+        futs = [ self.submit(fn, b, *args) for b in bodies ]
+        results = [ self._result(f, fn, b, args) for f, b in zip(futs, bodies) ]
+        self.wait += time.perf_counter() - t0
+        return results
+
+######################################################################
+# method 5
+    def print_stats(self):
+        print ( f"Parse pool / workers: {self.workers} / pages parsed: {self.parsed} (in-process: {self.inline}) / memo hits: {self.memo_hits} / wait: {self.wait:.2f}s" )
+        return
+
+######################################################################
+# method 6
+    def shutdown(self):
+        if self.executor is None:
+            return
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.executor = None
+        return
+
+######################################################################
+# private helpers
+
+    def _result(self, fut, fn, body, args):
+        """Future result. A worker that died (OOM, killed) breaks the pool -> finish the job in-process"""
+        try:
+            return fut.result()
+        except concurrent.futures.process.BrokenProcessPool as e:
+            logging.warning( f'parse_pool::_result - worker pool broken / parse in-process: {e}' )
+            self.executor = None
+            self.workers = 0
+            return self.submit(fn, body, *args).result()
+
+    def _inline(self, fn, args):
+        fut = concurrent.futures.Future()
+        try:
+            fut.set_result(fn(*args))
+        except Exception as e:
+            fut.set_exception(e)
+        self.inline += 1
+        return fut
+
+    def _done(self, key, fut):
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        with self.lock:
+            self.parsed += 1
+            if len(self.memo) >= self.max_memo:
+                self.memo.pop(next(iter(self.memo)))            # drop the oldest
+            self.memo[key] = fut.result()
+        return
+
+######################################################################
+# Shared pool. All news readers share 1 set of parse workers
+
+shared_pool = None
+
+def get_parse_pool():
+    """Return the process wide parse pool (workers started on 1st parse)"""
+    global shared_pool
+    if shared_pool is None:
+        shared_pool = parse_pool(1)
+    return shared_pool
@@ -0,0 +1,112 @@
+#! python3
+import numpy as np
+import pandas as pd
+import logging
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+# my private classes & methods
+from combo_schema import mb_codes
+
+#####################################################
+# Market cap bucket score (M_B scale tag -> 0..1). Liquid large caps score high, zero/unknown caps & funds low
+cap_scores = { 'MT': 1.0, 'LT': 1.0, 'LB': 0.8, 'TM': 0.7, 'SB': 0.6, 'LM': 0.5, 'SM': 0.3, 'ST': 0.3,
+               'LZ': 0.0, 'SZ': 0.0, 'EF': 0.0, 'UZ': 0.0 }
+
+#####################################################
+# CLASS
+class rank_engine:
+    """
+    Vectorized multi factor ranking. Scores every symbol on weighted factors in 1 NumPy pass.
+    Works on 1 row per symbol frames: the deep_logic wide table (per source suffixed columns) or any
+    frame with the plain combo columns.
+    - Each factor = row-wise max over its candidate columns (e.g. Pct_change_tg / _sc / _uu)
+    - Factors are z-scored across the universe, missing values score 0 (neutral), then weighted & summed
+    - top(k) selects with argpartition (O(n)) & only sorts the k winners
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    # { factor: candidate columns }. The ones present in the frame are combined (row-wise max)
+    factors = { 'pct':   [ 'Pct_change_tg', 'Pct_change_sc', 'Pct_change_uu', 'Pct_change' ],
+                'vol':   [ 'Vol_pct_uu', 'Vol_pct' ],
+                'cap':   [ 'M_B' ],
+                'hot':   [ 'Hot' ],
+                'te':    [ 'Bullcount_te', 'Bullcount' ],
+                'senti': [ 'Senti_te', 'Senti' ],
+                }
+    weights = { 'pct': 1.0, 'vol': 0.5, 'cap': 0.25, 'hot': 1.0, 'te': 0.5, 'senti': 0.5 }
+
+    def __init__(self, yti, weights=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.weights = dict(self.weights)
+        if weights is not None:
+            unknown = set(weights) - set(self.factors)
+            if unknown:
+                raise ValueError(f"rank_engine: unknown factors: {sorted(unknown)}. Expected: {list(self.factors)}")
+            self.weights.update(weights)
+        self.cap_lut = np.array([ cap_scores.get(c, 0.0) for c in mb_codes ] + [ np.nan ])     # code -1 (NaN) -> last
+        return
+
+######################################################################
+# method 1
+    def factor_matrix(self, df):
+        """(rows x factors) float64 matrix of raw factor values. NaN = not available for that symbol"""
+        n = len(df)
+        names = list(self.weights)
+        m = np.full((n, len(names)), np.nan)
+        for j, f in enumerate(names):
+            cols = [ c for c in self.factors[f] if c in df.columns ]
+            if not cols:
+                continue
+            if f == 'cap':
+                codes = pd.Categorical(df[cols[0]], categories=mb_codes).codes
+                m[:, j] = self.cap_lut[codes]
+            elif f == 'hot':
+                m[:, j] = (df[cols[0]].astype(str) == "*Hot*").to_numpy(dtype=np.float64)
+            else:
+                vals = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+                with np.errstate(all='ignore'):
+                    m[:, j] = np.fmax.reduce(vals, axis=1)          # fmax ignores NaN unless all NaN
+        return m
+
+######################################################################
+# method 2
+    def score(self, df):
+        """Weighted sum of z-scored factors. 1 float per row (higher = better)"""
+        cmi_debug = __name__+"::"+self.score.__name__+".#"+str(self.yti)
+        m = self.factor_matrix(df)
+        if len(m) == 0:
+            return np.zeros(0)
+        have = ~np.isnan(m)
+        cnt = np.maximum(have.sum(axis=0), 1)
+        x = np.where(have, m, 0.0)
+        mean = x.sum(axis=0) / cnt
+        std = np.sqrt((np.where(have, m - mean, 0.0) ** 2).sum(axis=0) / cnt)
+        std[~(std > 0)] = 1.0                                   # constant or empty factor: no spread, no scaling
+        z = np.where(have, (x - mean) / std, 0.0)               # missing = universe mean = 0
+        w = np.array(list(self.weights.values()))
+        logging.info( f'%s - {len(df)} rows x {len(w)} factors' % cmi_debug )
+        return z @ w
+
+######################################################################
+# method 3
+    def top(self, df, k=10):
+        """Top k rows by score (best first), with Score & Rank columns added"""
+        s = self.score(df)
+        k = min(k, len(s))
+        if k == 0:
+            return df.iloc[0:0].assign(Score=np.zeros(0), Rank=np.zeros(0, dtype='int32'))
+        idx = np.argpartition(-s, k - 1)[:k] if k < len(s) else np.arange(len(s))
+        idx = idx[np.argsort(-s[idx], kind='stable')]           # only the k winners are sorted
+        out = df.iloc[idx].assign(Score=s[idx].round(3), Rank=np.arange(1, k + 1, dtype='int32'))
+        return out.reset_index(drop=True)
+
+######################################################################
+# method 4
+    def rank_all(self, df):
+        """Full ranking (Score & Rank for every row), best first"""
+        return self.top(df, len(df))
@@ -0,0 +1,293 @@
+#! python3
+import asyncio
+import concurrent.futures
+import threading
+import statistics
+import atexit
+import logging
+import time
+from collections import deque
+from rich import print
+
+from requests_html import HTML, DEFAULT_ENCODING
+from pyppeteer import launch
+
+from net_fetcher import get_fetcher
+
+try:
+    import psutil                   # optional: only needed for browser RSS tracking
+except ImportError:
+    psutil = None
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class render_pool:
+    """
+    Managed pool of long-lived headless Chromium pages for JAVAScript rendering.
+    requests_html html.render() launches a browser, opens a new page & then sleeps for every
+    render. The browsers are never reaped & leak memory. This pool launches 1 browser, keeps
+    N warm pages open & lets call sites borrow a page for each render.
+    - Pages are recycled after max_renders renders
+    - Browser is relaunched when its process tree RSS grows beyond max_rss_mb
+    - Each render is bounded by a hard timeout
+    NOTE: pyppeteer is asyncio. The pool owns a private event loop running in a daemon thread,
+          so render() can be called from any thread (main or worker).
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    pool_size = 2           # number of warm pages kept open
+    max_renders = 50        # recycle a page after this many renders
+    max_rss_mb = 1024       # relaunch browser when process tree RSS (MB) grows beyond this
+    render_timeout = 20     # default per-render timeout (secs)
+    rss_every = 10          # sample browser RSS every N renders
+    loop = None             # private asyncio event loop (runs in loop_thread)
+    loop_thread = None
+    browser = None          # pyppeteer browser handle
+    pages = None            # asyncio.Queue of (page, renders_done, generation)
+    generation = 0          # browser generation. Incremented on every relaunch
+
+    def __init__(self, yti, pool_size=2, max_renders=50, max_rss_mb=1024, render_timeout=20):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.pool_size = pool_size
+        self.max_renders = max_renders
+        self.max_rss_mb = max_rss_mb
+        self.render_timeout = render_timeout
+        self.lock = threading.Lock()
+        self.latency = deque(maxlen=1000)       # render latency history (msecs)
+        self.renders = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.recycled = 0
+        self.relaunches = 0
+        self.rss = 0.0                          # last sampled browser RSS (MB)
+        return
+
+######################################################################
+# method 1
+    def start(self):
+        """
+        Spin up the private event loop thread, launch the browser & pre-open the warm pages.
+        Safe to call multiple times. Only the 1st call does any work.
+        """
+        cmi_debug = __name__+"::"+self.start.__name__+".#"+str(self.yti)
+        with self.lock:
+            if self.loop is not None:
+                return
+            logging.info( f'%s - Start render loop thread / pool size: {self.pool_size}' % cmi_debug )
+            self.loop = asyncio.new_event_loop()
+            self.loop_thread = threading.Thread(target=self.loop.run_forever, name="render_pool", daemon=True)
+            self.loop_thread.start()
+            atexit.register(self.shutdown)
+
+        self._run(self._launch(), 60)
+        logging.info( f'%s - Browser launched / {self.pool_size} pages ready' % cmi_debug )
+        return
+
+######################################################################
+# method 2
+    def render(self, html, timeout=None, sleep=1):
+        """
+        Render a requests_html HTML object with a borrowed page from the pool.
+        Mirrors requests_html html.render(): navigate to html.url, wait [sleep] secs, then
+        swap the rendered DOM back into the HTML object (so r.html.find() etc. see the JS data)
+        Raises concurrent.futures.TimeoutError if the render exceeds the timeout.
+        Rendered DOMs are saved in the page archive. In replay mode the archived DOM is served (no browser)
+        """
+        cmi_debug = __name__+"::"+self.render.__name__+".#"+str(self.yti)
+        fetcher = get_fetcher()
+        if fetcher.replaying:
+            entry, body = fetcher.archive.replay(html.url, "render")
+            if entry is not None:
+                rendered = HTML(session=html.session, url=html.url, html=body, default_encoding=DEFAULT_ENCODING)
+                html.__dict__.update(rendered.__dict__)
+            return html
+
+        if self.loop is None:
+            self.start()
+
+        timeout = fetcher.policy.timeout_for(self.render_timeout if timeout is None else timeout)     # clip to deadline budget
+        logging.info( f'%s - Render / timeout: {timeout}s' % cmi_debug )
+        t0 = time.perf_counter()
+        try:
+            content = self._run(self._render(html.url, timeout, sleep), timeout + 5)
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            self.timeouts += 1
+            logging.warning( f'%s - Render TIMEOUT after {timeout}s' % cmi_debug )
+            raise concurrent.futures.TimeoutError(f"render exceeded {timeout}s")
+        except Exception as e:
+            self.failures += 1
+            logging.warning( f'%s - Render FAILED: {e}' % cmi_debug )
+            raise
+
+        self.latency.append((time.perf_counter() - t0) * 1000)
+        self.renders += 1
+        if fetcher.archive is not None:
+            fetcher.archive.store(html.url, content, "render", 200, DEFAULT_ENCODING, "text/html")
+        rendered = HTML(session=html.session, url=html.url, html=content.encode(DEFAULT_ENCODING), default_encoding=DEFAULT_ENCODING)
+        html.__dict__.update(rendered.__dict__)        # same swap-in that requests_html does after render()
+
+        if self.renders % self.rss_every == 0:         # keep an eye on browser memory growth
+            if self.rss_mb() > self.max_rss_mb:
+                logging.info( f'%s - Browser RSS {self.rss:.0f}MB > {self.max_rss_mb}MB / relaunch' % cmi_debug )
+                self._run(self._relaunch(), 60)
+        return html
+
+######################################################################
+# method 3
+    def rss_mb(self):
+        """
+        Sample the resident memory of the browser process tree (browser + renderer children).
+        Returns 0.0 if psutil is not installed or the browser is not running.
+        """
+        if psutil is None or self.browser is None or self.browser.process is None:
+            return 0.0
+        try:
+            proc = psutil.Process(self.browser.process.pid)
+            rss = proc.memory_info().rss
+            for child in proc.children(recursive=True):
+                rss += child.memory_info().rss
+        except psutil.Error:
+            return self.rss
+        self.rss = rss / (1024 * 1024)
+        return self.rss
+
+######################################################################
+# method 4
+    def pool_stats(self):
+        """Return a dict of render pool performance stats"""
+        return { 'renders': self.renders,
+                 'median_ms': round(statistics.median(self.latency), 1) if self.latency else 0.0,
+                 'max_ms': round(max(self.latency), 1) if self.latency else 0.0,
+                 'timeouts': self.timeouts,
+                 'failures': self.failures,
+                 'recycled': self.recycled,
+                 'relaunches': self.relaunches,
+                 'rss_mb': round(self.rss_mb(), 1) }
+
+######################################################################
+# method 5
+    def print_stats(self):
+        """Print the render pool stats"""
+        s = self.pool_stats()
+        print ( f"========== JS render pool / {self.pool_size} pages =================================" )
+        print ( f"Renders: {s['renders']} / Median: {s['median_ms']}ms / Max: {s['max_ms']}ms / Timeouts: {s['timeouts']} / Fails: {s['failures']}" )
+        print ( f"Page recycles: {s['recycled']} / Browser relaunches: {s['relaunches']} / Browser RSS: {s['rss_mb']}MB" )
+        return
+
+######################################################################
+# method 6
+    def shutdown(self):
+        """Close the browser & stop the private event loop"""
+        cmi_debug = __name__+"::"+self.shutdown.__name__+".#"+str(self.yti)
+        if self.loop is None:
+            return
+        logging.info( f'%s - Close browser & stop render loop' % cmi_debug )
+        try:
+            self._run(self._close_browser(), 10)
+        except Exception as e:
+            logging.info( f'%s - Browser close error: {e}' % cmi_debug )
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=5)
+        self.loop = None
+        return
+
+######################################################################
+# private helpers : everything below runs on the private event loop
+
+    def _run(self, coro, timeout):
+        """Submit a coroutine to the private loop & block until done (or timeout)"""
+        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return fut.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            raise
+
+    async def _launch(self):
+        # signal handlers can only be installed from the main thread. The pool loop is not main
+        self.browser = await launch(headless=True, args=['--no-sandbox'], handleSIGINT=False, handleSIGTERM=False, handleSIGHUP=False)
+        self.generation += 1
+        self.pages = asyncio.Queue()
+        for i in range(self.pool_size):
+            page = await self.browser.newPage()
+            self.pages.put_nowait((page, 0, self.generation))
+        return
+
+    async def _relaunch(self):
+        await self._close_browser()
+        self.relaunches += 1
+        await self._launch()
+        return
+
+    async def _close_browser(self):
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        return
+
+    async def _borrow(self):
+        """Returns (page, renders_done, generation). Give the page back with THAT generation (see _give_back)"""
+        page, used, gen = await self.pages.get()
+        if gen != self.generation:                      # page belongs to a dead browser
+            page = None
+        if page is not None and used >= self.max_renders:
+            asyncio.ensure_future(page.close())         # recycle tired page
+            self.recycled += 1
+            page = None
+        if page is None:
+            gen = self.generation
+            try:
+                page = await self.browser.newPage()
+            except BaseException:
+                self._give_back(None, 0, gen)           # dont leak the pool slot
+                raise
+            used = 0
+        return page, used, gen
+
+    def _give_back(self, page, used, gen):
+        """
+        Return a borrowed slot to the pool it was borrowed from. A relaunch since the borrow built a new
+        full pool, so a slot from a dead generation is dropped (putting it back would grow the pool)
+        """
+        if gen != self.generation:
+            if page is not None:
+                asyncio.ensure_future(page.close())
+            return
+        self.pages.put_nowait((page, used, gen))
+        return
+
+    async def _render(self, url, timeout, sleep):
+        page, used, gen = await self._borrow()
+        try:
+            content = await asyncio.wait_for(self._goto(page, url, timeout, sleep), timeout)
+        except BaseException:
+            # page is in an unknown state (mid navigation / crashed). Replace it on next borrow
+            asyncio.ensure_future(page.close())
+            self._give_back(None, 0, gen)
+            raise
+        self._give_back(page, used + 1, gen)
+        return content
+
+    async def _goto(self, page, url, timeout, sleep):
+        await page.goto(url, options={'timeout': int(timeout * 1000)})
+        if sleep:
+            await asyncio.sleep(sleep)
+        return await page.content()
+
+######################################################################
+# Shared pool. Anyone that needs a JS render borrows pages from this single pool
+
+shared_pool = None
+
+def get_render_pool():
+    """Return the process wide render pool (created on 1st use, browser launched on 1st render)"""
+    global shared_pool
+    if shared_pool is None:
+        shared_pool = render_pool(1)
+    return shared_pool
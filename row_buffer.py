@@ -0,0 +1,74 @@
+#! python3
+import logging
+import pandas as pd
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class row_buffer:
+    """
+    Columnar row builder for the DataFrame producers (unusual vol, tech events, sentiment...)
+    Building a 1 row DataFrame & pd.concat'ing it onto the accumulator copies the whole frame for
+    every record (O(n^2)). This buffer appends each row into per column lists (O(1)) and
+    materializes 1 DataFrame at the end (O(n)).
+    - Fixed schema per producer: column order + optional dtypes { col: dtype } applied at to_df()
+    - Rows are sequences in schema order. A row of the wrong width is rejected (ValueError)
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    columns = []            # schema. Column names in order
+    dtypes = {}             # { col: dtype } cast at to_df(). Missing cols are inferred
+
+    def __init__(self, yti, columns, dtypes=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.columns = list(columns)
+        self.dtypes = dict(dtypes) if dtypes is not None else {}
+        self.data = [ [] for _ in self.columns ]
+        return
+
+######################################################################
+# method 1
+    def append(self, row):
+        """Add 1 row (list/tuple in schema order)"""
+        if len(row) != len(self.data):
+            raise ValueError(f"row_buffer: row has {len(row)} fields / schema has {len(self.data)}: {self.columns}")
+        for col, v in zip(self.data, row):
+            col.append(v)
+        return
+
+######################################################################
+# method 2
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return
+
+######################################################################
+# method 3
+    def __len__(self):
+        return len(self.data[0]) if self.data else 0
+
+######################################################################
+# method 4
+    def to_df(self, index=None):
+        """
+        Materialize the buffer as 1 DataFrame (the buffer is left intact).
+        index: None = 0..n-1 (RangeIndex) | int = sequential index starting at that value | list-like
+        """
+        if isinstance(index, int):
+            index = pd.RangeIndex(index, index + len(self))
+        df = pd.DataFrame(dict(zip(self.columns, self.data)), columns=self.columns, index=index)
+        if self.dtypes:
+            df = df.astype(self.dtypes)
+        return df
+
+######################################################################
+# method 5
+    def clear(self):
+        self.data = [ [] for _ in self.columns ]
+        return
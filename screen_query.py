@@ -0,0 +1,475 @@
+#! python3
+import re
+import threading
+import datetime
+import logging
+import numpy as np
+import pandas as pd
+from rich import print
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+# my private classes & methods
+from combo_schema import mkt_cap_usd
+from deep_logic import deep_logic
+from snapshot_store import pyarrow
+
+#####################################################
+# Screen expression language. 1 expression = boolean filter + optional sort & limit:
+#   pct_change > 5 and mkt_cap_usd between 300M and 2B and source in (smallcap, uvol) order by pct_change desc limit 10
+# - and / or / not / ( )                  - > >= < <= = == != <>
+# - field between X and Y                 - field [not] in (a, b, ...)
+# - bare field = truthy (hot, in_uvol_up, Vol_pct > 0...)
+# - numbers take K / M / B / T suffixes (300M = 300e6), $ & % are ignored. Text is bare or 'quoted'
+# - missing values (NaN) never match a comparison
+# Fields are column names (case insensitive) or the virtual fields below. On the deep_logic wide table a
+# field with per source columns (Pct_change_tg / _sc / _uu) = row-wise max over them
+
+aliases = { 'price': 'Cur_price', 'pct': 'Pct_change', 'name': 'Co_name', 'cap': 'Mkt_cap', 'vol_pct': 'Vol_pct' }
+virtual = { 'mkt_cap_usd': [ 'Mkt_cap', 'M_B' ], 'source': [] }     # { field: columns it is computed from }
+source_aliases = { 'smallcap': 'small_caps', 'smallcaps': 'small_caps', 'small_cap': 'small_caps',
+                   'uvol': 'uvol_up', 'unusual': 'uvol_up', 'tops': 'gainers', 'gainer': 'gainers',
+                   'loser': 'losers', 'te': 'tech_events', 'techevents': 'tech_events' }
+suffixes = { 'k': 1e3, 'm': 1e6, 'b': 1e9, 't': 1e12 }
+tags = { t for bit, t, cols in deep_logic.sources.values() }         # per source column suffixes (Pct_change_tg)
+keywords = { 'and', 'or', 'not', 'between', 'in', 'order', 'by', 'asc', 'desc', 'limit', 'true', 'false' }
+
+token_re = re.compile(r"""\s*(?:
+      (?P<num>-?\$?(?:\d+\.?\d*|\.\d+)(?:[kKmMbBtT](?![A-Za-z0-9_]))?%?)
+    | (?P<str>'[^']*'|"[^"]*")
+    | (?P<op>>=|<=|==|!=|<>|>|<|=)
+    | (?P<punc>[(),])
+    | (?P<name>[A-Za-z_][A-Za-z0-9_.]*)
+    )""", re.VERBOSE)
+
+cmp_ops = { '>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal,
+            '=': np.equal, '==': np.equal, '!=': np.not_equal, '<>': np.not_equal }
+
+def tokenize(text):
+    """text -> [ (kind, value, position) ]. kind = num | str | op | punc | kw | name | end"""
+    out = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = token_re.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"screen_query: unexpected character {text[pos:].lstrip()[:1]!r} at position {pos}")
+        kind = m.lastgroup
+        val = m.group(kind)
+        at = m.start(kind)
+        if kind == 'num':
+            digits = val.replace('$', '').rstrip('%')
+            mult = suffixes.get(digits[-1].lower(), 1.0)
+            val = float(digits.rstrip('kKmMbBtT')) * mult
+        elif kind == 'str':
+            val = val[1:-1]
+        elif kind == 'name' and val.lower() in keywords:
+            kind, val = 'kw', val.lower()
+        out.append((kind, val, at))
+        pos = m.end()
+    out.append(('end', None, len(text)))
+    return out
+
+#####################################################
+
+class screen_query:
+    """
+    Declarative screens over any symbol frame: producer frames, combo_df, the combo_state symbol frame,
+    the deep_logic wide table or snapshot_store history.
+    - Parsed once (recursive descent) & compiled into a tree of closures. Running = 1 vectorized NumPy
+      compare per condition, no per row Python & no string eval
+    - Compiled screens are cached by text, so re-running a screen every cycle never re-parses
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    text = ""               # the screen expression
+    fields = set()          # fields the screen references (lower case)
+    order = []              # [ (field, ascending) ]
+    limit = None            # max rows returned. None = all
+    cache = {}              # { text: (predicate, fields, order, limit) }. Shared by all instances
+    cache_lock = threading.Lock()
+
+    def __init__(self, yti, text):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.text = " ".join(text.split())
+        with self.cache_lock:
+            hit = self.cache.get(self.text)
+        if hit is None:
+            hit = self.compile(self.text)
+            with self.cache_lock:
+                self.cache[self.text] = hit
+        self.predicate, self.fields, self.order, self.limit = hit
+        return
+
+######################################################################
+# method 1
+    def mask(self, df, source=None):
+        """
+        Bool numpy mask of the rows matching the screen.
+        source : the source df came from, when it has no Srcs / in_<source> / Source column (e.g. 1 producer frame)
+        """
+        return self.predicate(frame_env(df, source))
+
+######################################################################
+# method 2
+    def run(self, df, source=None):
+        """Matching rows, sorted & limited as the screen says. Index is reset"""
+        cmi_debug = __name__+"::"+self.run.__name__+".#"+str(self.yti)
+        env = frame_env(df, source)
+        idx = np.flatnonzero(self.predicate(env))
+        if self.order:
+            keys = pd.DataFrame({ f"k{i}": env.value(f)[idx] for i, (f, asc) in enumerate(self.order) })
+            keys = keys.sort_values(by=list(keys.columns), ascending=[ a for f, a in self.order ],
+                                    na_position='last', kind='stable')
+            idx = idx[keys.index.to_numpy()]
+        if self.limit is not None:
+            idx = idx[:self.limit]
+        logging.info( f'%s - {len(idx)} of {len(df)} rows' % cmi_debug )
+        return df.iloc[idx].reset_index(drop=True)
+
+######################################################################
+# method 3
+    def columns(self):
+        """Stored columns the screen needs (for column pruning when reading snapshots). None = cant tell"""
+        cols = set()
+        for f in self.fields | { f for f, a in self.order }:
+            if f in virtual:
+                cols.update(virtual[f])
+            elif f.startswith('in_'):
+                return None                     # computed by combo_state, not stored
+            else:
+                cols.add(aliases.get(f, f))
+        return sorted(cols)
+
+######################################################################
+# method 4
+    def run_snapshots(self, store, sources=None, start=None, end=None):
+        """
+        Screen snapshot_store history. Each source is read with only the columns the screen needs,
+        tagged with a Source column & screened together. start / end = ISO dates (default today, UTC)
+        """
+        cmi_debug = __name__+"::"+self.run_snapshots.__name__+".#"+str(self.yti)
+        today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+        start = today if start is None else start
+        end = today if end is None else end
+        wanted = self.columns()
+        frames = []
+        for s in (store.sources() if sources is None else sources):
+            df = store.read(s, start, end, columns=None if wanted is None else self.stored_case(store, s, wanted))
+            if len(df):
+                frames.append(df.assign(Source=s))
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        logging.info( f'%s - {len(frames)} sources / {len(df)} rows' % cmi_debug )
+        return self.run(df)
+
+######################################################################
+# method 5
+    def print_screen(self, df, source=None, cols=None):
+        out = self.run(df, source)
+        print ( f"========== Screen: {self.text} / {len(out)} rows ==========" )
+        print ( out if cols is None else out[[ c for c in cols if c in out.columns ]] )
+        return out
+
+######################################################################
+# private helpers
+
+    def stored_case(self, store, source, wanted):
+        """Map lower case field names to the stored column names of 1 source (from its 1st file schema)"""
+        files = store.files(source)
+        if pyarrow is None or not files:
+            return wanted
+        names = { n.lower(): n for n in pyarrow.parquet.read_schema(files[0]).names }
+        return [ names.get(c.lower(), c) for c in wanted ]
+
+    @classmethod
+    def compile(cls, text):
+        p = parser(tokenize(text))
+        pred = p.expr()
+        order, limit = p.tail()
+        if p.peek()[0] != 'end':
+            kind, val, pos = p.peek()
+            raise ValueError(f"screen_query: unexpected {val!r} at position {pos}")
+        return pred, frozenset(p.fields), order, limit
+
+#####################################################
+# Recursive descent parser. Each rule returns a closure env -> bool numpy mask
+
+class parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+        self.fields = set()
+
+    def peek(self):
+        return self.tokens[self.i]
+
+    def take(self, kind=None, val=None):
+        tok = self.tokens[self.i]
+        if (kind is not None and tok[0] != kind) or (val is not None and tok[1] != val):
+            want = val if val is not None else kind
+            got = "end of screen" if tok[0] == 'end' else repr(tok[1])
+            raise ValueError(f"screen_query: expected {want} at position {tok[2]}, got {got}")
+        self.i += 1
+        return tok
+
+    def accept(self, val):
+        tok = self.tokens[self.i]
+        if tok[0] in ('kw', 'op', 'punc') and tok[1] == val:
+            self.i += 1
+            return True
+        return False
+
+    def expr(self):
+        left = self.and_expr()
+        while self.accept('or'):
+            left = either(left, self.and_expr())
+        return left
+
+    def and_expr(self):
+        left = self.not_expr()
+        while self.accept('and'):
+            left = both(left, self.not_expr())
+        return left
+
+    def not_expr(self):
+        if self.accept('not'):
+            inner = self.not_expr()
+            return lambda env: ~inner(env)
+        return self.atom()
+
+    def atom(self):
+        if self.accept('('):
+            inner = self.expr()
+            self.take('punc', ')')
+            return inner
+        f = self.field()
+        kind, val, pos = self.peek()
+        if kind == 'op':
+            self.i += 1
+            return compare(f, val, self.value())
+        if self.accept('between'):
+            lo = self.value()
+            self.take('kw', 'and')
+            hi = self.value()
+            return both(compare(f, '>=', lo), compare(f, '<=', hi))
+        negate = self.accept('not')
+        if negate or self.peek()[:2] == ('kw', 'in'):
+            self.take('kw', 'in')
+            self.take('punc', '(')
+            vals = [ self.value() ]
+            while self.accept(','):
+                vals.append(self.value())
+            self.take('punc', ')')
+            member = isin(f, vals)
+            return exclude(f, member) if negate else member
+        return lambda env: env.truthy(f)
+
+    def field(self):
+        kind, val, pos = self.peek()
+        if kind != 'name':
+            got = "end of screen" if kind == 'end' else repr(val)
+            raise ValueError(f"screen_query: expected a field at position {pos}, got {got}")
+        self.i += 1
+        self.fields.add(val.lower())
+        return val.lower()
+
+    def value(self):
+        kind, val, pos = self.peek()
+        if kind in ('num', 'str', 'name'):
+            self.i += 1
+            return val
+        if kind == 'kw' and val in ('true', 'false'):
+            self.i += 1
+            return val == 'true'
+        got = "end of screen" if kind == 'end' else repr(val)
+        raise ValueError(f"screen_query: expected a value at position {pos}, got {got}")
+
+    def tail(self):
+        """order by f [asc|desc], ... limit N"""
+        order = []
+        limit = None
+        if self.accept('order'):
+            self.take('kw', 'by')
+            while True:
+                f = self.field()
+                asc = True
+                if self.accept('desc'):
+                    asc = False
+                else:
+                    self.accept('asc')
+                order.append((f, asc))
+                if not self.accept(','):
+                    break
+        if self.accept('limit'):
+            n = self.take('num')[1]
+            if n < 0 or n != int(n):
+                raise ValueError(f"screen_query: limit must be a whole number, got {n}")
+            limit = int(n)
+        return order, limit
+
+def either(a, b):
+    return lambda env: a(env) | b(env)
+
+def both(a, b):
+    return lambda env: a(env) & b(env)
+
+def compare(f, op, value):
+    fn = cmp_ops[op]
+    if f == 'source':
+        if op not in ('=', '==', '!=', '<>'):
+            raise ValueError(f"screen_query: source only supports = / != / in, not {op}")
+        member = isin(f, [ value ])
+        return member if fn is np.equal else exclude(f, member)
+    if isinstance(value, bool):
+        return lambda env: fn(env.numeric(f) != 0, value) & env.present(f)
+    if isinstance(value, float):
+        def num_cmp(env):
+            with np.errstate(invalid='ignore'):
+                return fn(env.numeric(f), value) & env.present(f)
+        return num_cmp
+    if op not in ('=', '==', '!=', '<>'):
+        raise ValueError(f"screen_query: {f} {op} {value!r} / text only supports = / != / in")
+    member = isin(f, [ value ])
+    return member if fn is np.equal else exclude(f, member)
+
+def exclude(f, member):
+    """not in / != : rows with the field missing dont match either (source is never missing)"""
+    if f == 'source':
+        return lambda env: ~member(env)
+    return lambda env: ~member(env) & env.present(f)
+
+def isin(f, values):
+    if f == 'source':
+        names = [ source_aliases.get(str(v).lower(), str(v).lower()) for v in values ]
+        return lambda env: env.in_sources(names)
+    nums = [ v for v in values if isinstance(v, float) ]
+    text = [ v for v in values if not isinstance(v, float) ]
+    def member(env):
+        if env.is_numeric(f):
+            if text:
+                raise ValueError(f"screen_query: {f} is numeric, cant match text {text}")
+            return np.isin(env.numeric(f), nums)
+        return env.text_isin(f, [ str(v) for v in values ])
+    return member
+
+#####################################################
+# Column access for 1 run. Every field is resolved & converted once per run, then shared by all conditions
+
+class frame_env:
+    def __init__(self, df, source=None):
+        self.df = df
+        self.source = source
+        self.n = len(df)
+        self.lower = { str(c).lower(): c for c in df.columns }
+        self.cols = {}
+
+    def column(self, f):
+        """field -> pandas Series (None = virtual / multi column field)"""
+        f = aliases.get(f, f).lower()
+        if f in self.lower:
+            return self.df[self.lower[f]]
+        return None
+
+    def is_numeric(self, f):
+        col = self.column(f)
+        if col is None:
+            return True                     # virtual or per source numeric columns
+        return pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col)
+
+    def numeric(self, f):
+        """float64 array (NaN = missing)"""
+        key = ('num', f)
+        if key in self.cols:
+            return self.cols[key]
+        col = self.column(f)
+        if f == 'mkt_cap_usd' and col is None:
+            if 'mkt_cap' not in self.lower or 'm_b' not in self.lower:
+                raise ValueError("screen_query: mkt_cap_usd needs Mkt_cap & M_B columns")
+            df = self.df.rename(columns={ self.lower['mkt_cap']: 'Mkt_cap', self.lower['m_b']: 'M_B' })
+            out = mkt_cap_usd(df)
+        elif col is not None:
+            if not (pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col)):
+                raise ValueError(f"screen_query: {f} is text, compare it with = / != / in")
+            out = pd.to_numeric(col, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        else:
+            per_src = [ self.lower[c] for c in self.lower if c.startswith(aliases.get(f, f).lower() + "_")
+                        and c.rsplit("_", 1)[1] in tags ]
+            if not per_src:
+                raise ValueError(f"screen_query: unknown field {f!r}")
+            vals = self.df[per_src].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            with np.errstate(all='ignore'):
+                out = np.fmax.reduce(vals, axis=1)
+        self.cols[key] = out
+        return out
+
+    def text(self, f):
+        """object array of stripped strings ('' = missing)"""
+        key = ('str', f)
+        if key not in self.cols:
+            col = self.column(f)
+            if col is None:
+                raise ValueError(f"screen_query: unknown field {f!r}")
+            self.cols[key] = col.astype(object).where(col.notna(), "").astype(str).str.strip().to_numpy()
+        return self.cols[key]
+
+    def text_isin(self, f, values):
+        col = self.column(f)
+        if col is None:
+            raise ValueError(f"screen_query: unknown field {f!r}")
+        if isinstance(col.dtype, pd.CategoricalDtype):           # match the categories, then index by code
+            cats = pd.Index(col.cat.categories.astype(str).str.strip())
+            lut = np.append(cats.isin(values), False)
+            return lut[col.cat.codes.to_numpy()]
+        return np.isin(self.text(f), values)
+
+    def present(self, f):
+        if self.is_numeric(f):
+            return ~np.isnan(self.numeric(f))
+        return self.text(f) != ""
+
+    def value(self, f):
+        """sort key"""
+        if f == 'source':
+            return self.source_names()
+        return self.numeric(f) if self.is_numeric(f) else self.text(f)
+
+    def truthy(self, f):
+        if f == 'hot' and self.column(f) is not None and not self.is_numeric(f):
+            return self.text(f) == "*Hot*"
+        if f.startswith('in_') and self.column(f) is None:
+            return self.in_sources([ source_aliases.get(f[3:], f[3:]) ])
+        if self.is_numeric(f):
+            v = self.numeric(f)
+            return (v != 0) & ~np.isnan(v)
+        return self.text(f) != ""
+
+    def in_sources(self, names):
+        """Rows present in ANY of the named sources"""
+        if 'srcs' in self.lower:                        # deep_logic wide table: presence bitmask
+            want = 0
+            for s in names:
+                if s not in deep_logic.sources:
+                    raise ValueError(f"screen_query: unknown source {s!r}. Expected one of: {list(deep_logic.sources)}")
+                want |= deep_logic.sources[s][0]
+            return (self.df[self.lower['srcs']].to_numpy(dtype='int64') & want) != 0
+        flags = [ c for c in self.lower for s in names if c in (f"in_{s}", f"in_{s}_top10") ]
+        if flags:                                       # combo_state symbol frame
+            return np.logical_or.reduce([ self.df[self.lower[c]].to_numpy(dtype=bool) for c in flags ])
+        if 'source' in self.lower:                      # snapshot history / tagged concat
+            src = self.text('source')
+            return np.isin(src, names) | np.isin(src, [ s + "_top10" for s in names ])
+        if self.source is None:
+            raise ValueError("screen_query: frame has no source info (Srcs / in_<source> / Source). Pass source=")
+        src = source_aliases.get(self.source, self.source)
+        return np.full(self.n, src in names or src in [ s + "_top10" for s in names ])
+
+    def source_names(self):
+        if 'source' in self.lower:
+            return self.text('source')
+        return np.full(self.n, "" if self.source is None else self.source, dtype=object)
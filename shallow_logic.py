@@ -1,5 +1,6 @@
 #! python3
 
+import numpy as np
 import pandas as pd
 import logging
 
@@ -8,6 +9,7 @@ logging.basicConfig(level=logging.INFO)
 # my private classes & methods
 from nasdaq_quotes import nquote
 from nasdaq_wrangler import nq_wrangler
+from combo_schema import conform, cast, display_df, insights_dtype, cap_units
 
 #####################################################
 # CLASS
@@ -42,10 +44,13 @@ class combo_logic:
         cmi_debug = __name__+"::"+self.__init__.__name__
         logging.info('%s - INST_class' % cmi_debug )
         self.inst_uid = yti
-        self.deep_1 = d1.tg_df1.drop(columns=[ 'ERank', 'Time' ]).sort_values(by='Pct_change', ascending=False )
-        self.deep_2 = d2.dg1_df1.drop(columns=[ 'Row', 'Time' ] )
-        self.deep_3 = d3.up_df0.drop(columns=[ 'Row', 'Time', 'Vol', 'Vol_pct']).sort_values(by='Pct_change', ascending=False )
         self.args = global_args
+        if d1 is None:              # state driven (see load_state). No producer frames
+            return
+        # producer boundary: each frame is validated & conformed to the typed combo schema (see combo_schema)
+        self.deep_1 = conform(d1.tg_df1, "top_gainers").sort_values(by='Pct_change', ascending=False )
+        self.deep_2 = conform(d2.dg1_df1, "small_caps")
+        self.deep_3 = conform(d3.up_df0, "unusual_vol").sort_values(by='Pct_change', ascending=False )
         return
 
     def __repr__(self):
@@ -61,7 +66,7 @@ class combo_logic:
         """
         cmi_debug = __name__+"::"+self.prepare_combo_df.__name__+".#"+str(self.inst_uid)
         logging.info('%s - IN' % cmi_debug )
-        temp_df = pd.concat( [ self.deep_1, self.deep_2, self.deep_3], sort=False, ignore_index=True ).sort_values(by=['Pct_change', 'M_B', 'Mkt_cap'], ascending=False, na_position='last')
+        temp_df = cast(pd.concat( [ self.deep_1, self.deep_2, self.deep_3], sort=False, ignore_index=True )).sort_values(by=['Pct_change', 'M_B', 'Mkt_cap'], ascending=False, na_position='last')
         temp_df.reset_index(inplace=True, drop=True)                               # reset index each time so its guaranteed sequential
         self.combo_df = temp_df.sort_values(by=['Pct_change'], ascending=False )   # ensure sorted combo DF is avail as class global attr
         self.combo_dupes = self.combo_df.duplicated(['Symbol']).to_frame()         # convert Bool SERIES > DF & make avail as class global attr DF
@@ -70,16 +75,18 @@ class combo_logic:
 ###################################################################################
 # method 1
 
-    def polish_combo_df(self, me):
+    def polish_combo_df(self, me, prepared=False):
         """
         Clean, Polish & Wax the main Combo DataFrame.
         We do a lot of heavy DF data generation/manipulation/insertion here.
         Fill-out key collumn data thats missing, incomplete and/or not reliable due to errors in initial data extraction
+        prepared = True: combo_df is already set (e.g. combo_state rows to repair). Dont rebuild it
         """
         cmi_debug = __name__+"::"+self.polish_combo_df.__name__+".#"+str(self.inst_uid)+"."+str(me)
         logging.info( f"%s - CALLED" % cmi_debug )
 
-        self.prepare_combo_df()                         # FIRST, merge Small_cap + med + large + mega into a single DF
+        if not prepared:
+            self.prepare_combo_df()                     # FIRST, merge Small_cap + med + large + mega into a single DF
 
         # Look into the main combo_df at the Unsual Vol columns
         # Find/fix missing data in nasdaq.com unusual volume DF - i.e. market_cap info
@@ -169,7 +176,7 @@ class combo_logic:
                     print ( f"quote: {wq.qd_quote.items()}" )
                     print ( f"combo_df: {self.combo_df}" )
                     print ( f"=xray=========================== {self.inst_uid} ==================================end=" )
-                self.combo_df.at[self.combo_df[self.combo_df['Symbol'] == xsymbol].index, 'Mkt_cap'] = 'UZ'    # make is a real number = 0
+                self.combo_df.loc[self.combo_df['Symbol'] == xsymbol, 'Mkt_cap'] = z_float    # make is a real number = 0
                 print ( f"^^", end="" )                                 # >> pretty printer <<
                 self.cleansed_errors += 2
                 self.fixchars += 2
@@ -181,7 +188,7 @@ class combo_logic:
                     print ( f"quote: {wq.qd_quote.items()}" )
                     print ( f"combo_df: {self.combo_df}" )
                     print ( f"=xray=========================== {self.inst_uid} ==================================end=" )
-                self.combo_df.at[self.combo_df[self.combo_df['Symbol'] == xsymbol].index, 'Mkt_cap'] = 'UZ'    # make is a real number = 0 
+                self.combo_df.loc[self.combo_df['Symbol'] == xsymbol, 'Mkt_cap'] = z_float    # make is a real number = 0 
                 self.cleansed_errors += 1
                 print ( f"!", end="" )                                  # >> pretty printer <<
                 self.fixchars += 1
@@ -212,6 +219,11 @@ class combo_logic:
                         else:
                             row_index = self.combo_df.loc[self.combo_df['Symbol'] == xsymbol].index[0]
                             self.combo_df.at[row_index, 'M_B'] = i[0]
+                            # nasdaq.com gives $M. Store Mkt_cap in the unit of the scale tag, like the producers do (LB 15.0 = $15B)
+                            # UZ has no unit (Z). Keep the raw $M value already set in Phase 2
+                            unit = cap_units.get(i[0][1])
+                            if unit is not None:
+                                self.combo_df.at[row_index, 'Mkt_cap'] = round(wq.qd_quote['mkt_cap'] * 1e6 / unit, 3)
                             logging.info( f"{cmi_debug} - Market cap: [ {wq.qd_quote['mkt_cap']} ] scale set to: {i[0]}" )
                             self.wrangle_errors += 1          # insert market cap scale into DF @ column M_B for this symbol
                             self.cleansed_errors += 1
@@ -249,29 +261,32 @@ class combo_logic:
         """
         Find & Tag the *duplicate* entries in the combo_df matrix dataset, which is important b/c dupes
         here means these stocks are HOT and appearing across multiple dataframes.
+        All dupe groups are tagged in 1 vectorized pass:
+        - Mkt_cap + M_B known  = *Hot* + Insights from the scale tag (+ ^Un vol)
+        - Mkt_cap + M_B NaN    = row dropped (the unusual vol copy of a stock we already have)
+        - only 1 of them known = warning. Row left untagged
         """
         cmi_debug = __name__+"::"+self.tag_dupes.__name__+".#"+str(self.inst_uid)
         logging.info('%s - IN' % cmi_debug )
-        self.combo_df = self.combo_df.assign(Hot="", Insights="" )     # pre-insert 2 new columns
-        self.mpt = ()            # Helper: Internal DICT(tuple) element to find cheapest ***HOT stock
-
-        for ds in self.combo_df[self.combo_df.duplicated(['Symbol'])].Symbol.values:    # ONLY work on dupes in DF !!!
-            for row_idx in iter( self.combo_df.loc[self.combo_df['Symbol'] == ds ].index ):
-                sym = self.combo_df.loc[row_idx].Symbol
-                cap = self.combo_df.loc[row_idx].Mkt_cap
-                scale = self.combo_df.loc[row_idx].M_B
-                price = self.combo_df.loc[row_idx].Cur_price
-                if pd.isna(self.combo_df.loc[row_idx].Mkt_cap) == False and pd.isna(self.combo_df.loc[row_idx].M_B) == False:
-                    self.combo_df.loc[row_idx,'Hot'] = "*Hot*"      # Tag as a **HOT** stock
-                    self.combo_df.loc[row_idx,'Insights'] = self.cx.get(scale) + " + ^Un vol"     # Annotate why...
-                    self.mpt = ( row_idx, sym.rstrip(), round(float(price), 2) )   # pack a tuple - for min_price analysis later
-                    self.min_price.update({row_idx: self.mpt})           # load helpder DICT e.g. {1: (7, 'IBM', 120.51), 7: (24, 'TSLA', 138.21)}
-                elif pd.isna(self.combo_df.loc[row_idx].Mkt_cap) == True and pd.isna(self.combo_df.loc[row_idx].M_B) == True:
-                     self.combo_df.drop([row_idx], inplace=True)    # drop this row from DF
-                else:
-                    print ( f"WARNING: Don't know what to do for: {sym} - Mkt_cap: {cap} / M_B: {scale}" )
-                    break
-            return
+        self.combo_df = self.combo_df.assign(Hot="", Insights="" ).astype({'Insights': insights_dtype(self.cx)})     # pre-insert 2 new columns
+
+        df = self.combo_df
+        dupe = df.groupby('Symbol', observed=True, sort=False)['Symbol'].transform('size') > 1    # ONLY work on dupes in DF !!!
+        has_cap = df['Mkt_cap'].notna()
+        has_scale = df['M_B'].notna()
+        hot = dupe & has_cap & has_scale
+        blank = dupe & ~has_cap & ~has_scale
+        for sym, cap, scale in df.loc[dupe & (has_cap != has_scale), ['Symbol', 'Mkt_cap', 'M_B']].itertuples(index=False):
+            print ( f"WARNING: Don't know what to do for: {sym} - Mkt_cap: {cap} / M_B: {scale}" )
+
+        df.loc[hot, 'Hot'] = "*Hot*"                                                          # Tag as a **HOT** stock
+        df.loc[hot, 'Insights'] = df.loc[hot, 'M_B'].astype(object).map(self.cx) + " + ^Un vol"  # Annotate why...
+        self.combo_df = df.drop(index=df.index[blank])                                        # drop these rows from DF
+
+        hot_df = self.combo_df.loc[self.combo_df['Hot'] == "*Hot*"]                          # load helper DICT e.g. {1: (1, 'IBM', 120.51), 7: (7, 'TSLA', 138.21)}
+        self.min_price = dict(zip(hot_df.index, zip(hot_df.index, hot_df['Symbol'].astype(str), hot_df['Cur_price'].astype(float).round(2))))
+        logging.info( f'%s - Tagged {int(hot.sum())} *Hot* rows / dropped {int(blank.sum())}' % cmi_debug )
+        return
 
 #####################################################################################
 # method #2.1
@@ -280,24 +295,18 @@ class combo_logic:
 
     def find_hottest(self):
         print ( f"\n========== Hot stock analysis ====================================================" )
-        if self.min_price:                       # not empty, We have some **HOT stocks to evaluate
-            print ( f"\nLocating...", end="" ) 
-            mptv = min(( td[2] for td in self.min_price.values() )) # td[2] = iterator of 3rd elment of min_price{}
-            for v in self.min_price.values():                       # v = tuple structured like: (0, IBM, 28.42)
-                if v[2] == mptv:                                    # v[2] = 3rd element = price symbol
-                    row_idx = int(v[0])                             # v[0] = 1st emelent = DF index of symbol
-                    self.rx = [row_idx, v[1].rstrip()]              # add hottest stock with lowest price / 1 entry in list[]
-                    self.combo_df.loc[row_idx,'Hot'] = "*Hot*"      # Tag as a **HOT** stock in DataFrame
-                    found_sym = self.combo_df.loc[row_idx, 'Symbol']
-                    print ( f" [ {found_sym.rstrip()} ] @ #{row_idx}" )
-                    print ( f"========== complete ==============================================================" )
-                    break
-                else:
-                    print ( f".", end="" )
+        hot = self.combo_df.loc[self.combo_df['Hot'] == "*Hot*", 'Cur_price'] if 'Hot' in self.combo_df.columns else pd.Series(dtype='float32')
+        if not hot.empty:                        # not empty, We have some **HOT stocks to evaluate
+            print ( f"\nLocating...", end="" )
+            row_idx = hot.round(2).idxmin()                         # 1st row with the lowest price
+            found_sym = str(self.combo_df.loc[row_idx, 'Symbol'])
+            self.rx = [row_idx, found_sym]                          # hottest stock with lowest price / 1 entry in list[]
+            print ( f" [ {found_sym} ] @ #{row_idx}" )
+            print ( f"========== complete ==============================================================" )
 
         # TODO: ** This logic can fail @ Market open when many things are empty & unpopulated...
-        if not bool(self.min_price):                # is empty?
-            print ( f"NO **HOT tagged stocks located yet" )  
+        else:
+            print ( f"NO **HOT tagged stocks located yet" )
 
         return
 
@@ -313,21 +322,14 @@ class combo_logic:
         cmi_debug = __name__+"::"+self.tag_uniques.__name__+".#"+str(self.inst_uid)
         logging.info('%s - IN' % cmi_debug )
 
-        for row_idx in self.combo_df.loc[self.combo_df['Insights'] == "" ].index:
-            logging.info('%s - Cycle over list of symbols' % cmi_debug )
-            sym = self.combo_df.loc[row_idx].Symbol
-            cap = self.combo_df.loc[row_idx].Mkt_cap
-            scale = self.combo_df.loc[row_idx].M_B
-
-            if pd.isna(self.combo_df.loc[row_idx].Mkt_cap) == False and pd.isna(self.combo_df.loc[row_idx].M_B) == False:
-                self.combo_df.loc[row_idx,'Insights'] = self.cx.get(scale)
-            elif pd.isna(self.combo_df.loc[row_idx].Mkt_cap) == True and pd.isna(self.combo_df.loc[row_idx].M_B) == True:
-                logging.info('%s - Apply NaN/NaN inferrence logic' % cmi_debug )
-                self.combo_df.loc[row_idx,'Insights'] = "^ Un vol only"
-            else:
-                logging.info('%s - Unknown logic discovered' % cmi_debug )
-                self.combo_df.loc[row_idx,'Insights'] = "!No logic!"
-        logging.info('%s - Exit tag uniques cycle' % cmi_debug )
+        df = self.combo_df
+        todo = df['Insights'] == ""
+        has_cap = df['Mkt_cap'].notna()
+        has_scale = df['M_B'].notna()
+        df.loc[todo & has_cap & has_scale, 'Insights'] = df.loc[todo & has_cap & has_scale, 'M_B'].astype(object).map(self.cx)
+        df.loc[todo & ~has_cap & ~has_scale, 'Insights'] = "^ Un vol only"          # NaN/NaN inferrence logic
+        df.loc[todo & (has_cap != has_scale), 'Insights'] = "!No logic!"            # Unknown logic discovered
+        logging.info( f'%s - Tagged {int(todo.sum())} uniques' % cmi_debug )
         return
 
 #################################################################################
@@ -337,33 +339,14 @@ class combo_logic:
     def tag_naans(self):
         """
         Hunt down and loose NaaN entries left lying arround
+        Returns the rows that still hold a NaN (also printed)
         """
 
         cmi_debug = __name__+"::"+self.tag_naans.__name__+".#"+str(self.inst_uid)
         logging.info('%s - IN' % cmi_debug )
-        print ( f"{self.combo_df[self.combo_df.isna().any(axis=1)]}" )
-        return
-
-        """
-        for row_idx in self.combo_df.loc[self.combo_df['Insights'] == "" ].index:
-            logging.info('%s - Cycle over list of symbols' % cmi_debug )
-            sym = self.combo_df.loc[row_idx].Symbol
-            cap = self.combo_df.loc[row_idx].Mkt_cap
-            scale = self.combo_df.loc[row_idx].M_B
-
-            if pd.isna(self.combo_df.loc[row_idx].Mkt_cap) == False and pd.isna(self.combo_df.loc[row_idx].M_B) == False:
-                self.combo_df.loc[row_idx,'Insights'] = self.cx.get(scale)
-                #
-            elif pd.isna(self.combo_df.loc[row_idx].Mkt_cap) == True and pd.isna(self.combo_df.loc[row_idx].M_B) == True:
-                self.combo_df.loc[row_idx].Mkt_cap = 0
-                self.combo_df.loc[row_idx].M_B = 'UZ'
-                logging.info('%s - Apply NaN/NaN inferrence logic' % cmi_debug )
-                self.combo_df.loc[row_idx,'Insights'] = "^ Unusual vol only"
-            else:
-                logging.info('%s - Unknown logic discovered' % cmi_debug )
-                self.combo_df.loc[row_idx,'Insights'] = "!No logic!"
-        logging.info('%s - Exit tag uniques cycle' % cmi_debug )
-        """
+        naans = self.combo_df[self.combo_df.isna().any(axis=1)]
+        print ( f"{naans}" )
+        return naans
 
 ############################################################################
 # method 5 Hottest 
@@ -375,20 +358,8 @@ class combo_logic:
         """
         cmi_debug = __name__+"::"+self.rank_hot.__name__+".#"+str(self.inst_uid)
         logging.info('%s - IN' % cmi_debug )
-        self.combo_df = self.combo_df.assign(rank="" )     # pre-insert the new Tag_Rank column
-
-        # get a list of rows that meet the critera and find each row's index ID's.
-        # Pack the list of index ID's into a list [] & pass it as an indexer inside a Loop
-        # use rank column to hold a tag/ranking of cheapest *Hot* stock to most expensive *Hot* stock
-        #rh_df0 = self.combo_df.sort_values(by=['Cur_price'], ascending=True)
-        #rh_list = rh_df0.loc[self.combo_df['Hot'] == "*Hot*"]
-
-        z = list(self.combo_df.sort_values(by=['Cur_price'], ascending=True).loc[self.combo_df['Hot'] == "*Hot*"].index)
-        y = 100                                  # HOT stocks ranking starts at 100
-        for i in z:                              # cycle thru the sorted DF
-            self.combo_df.loc[i, 'rank'] = y     # rank each Hot entry
-            # DEBUG: print ( "i: ", i, "x:", y )
-            y += 1
+        self.combo_df = self.combo_df.assign(rank=np.zeros(len(self.combo_df), dtype='int32'))     # pre-insert the new Tag_Rank column (0 = not ranked yet)
+        self.rank_rows(self.combo_df['Hot'] == "*Hot*", 100)    # HOT stocks ranking starts at 100
         return self.combo_df
 
 ###################################################################################
@@ -399,12 +370,7 @@ class combo_logic:
         Isolate all Unusual Vol stocks only.
         tag_rank them with code: 3xx (e.g. 300, 301, 302)
         """
-        z = list(self.combo_df.sort_values(by=['Cur_price'], ascending=True).loc[self.combo_df['Insights'] == "^ Un vol only"].index)
-        y = 300                                  # Unusual Vol stocks ranking starts at 300 
-        for i in z:                              # cycle thru the sorted DF
-            self.combo_df.loc[i, 'rank'] = y     # rank each Unique entry
-            # DEBUG: print ( "i: ", i, "x:", y )
-            y += 1
+        self.rank_rows(self.combo_df['Insights'] == "^ Un vol only", 300)     # Unusual Vol stocks ranking starts at 300
         return self.combo_df
 
 ###################################################################################
@@ -418,14 +384,21 @@ class combo_logic:
             This is a cheap way to find/select criteria.
             MUST call this ranking method last for this to work correctly.
         """
-        z = list(self.combo_df.sort_values(by=['Cur_price'], ascending=True).loc[self.combo_df['rank'] == "" ].index)
-        y = 200                                 # Non tagged average unknown stocks ranking starts at 200
-        for i in z:                             # cycle thru the sorted DF
-            self.combo_df.loc[i, 'rank'] = y    # rank each entry
-            # DEBUG : print ( "i: ", i, "x:", y )
-            y += 1
+        self.rank_rows(self.combo_df['rank'] == 0, 200)        # Non tagged average unknown stocks ranking starts at 200
         return self.combo_df
 
+###################################################################################
+# method 7.1
+
+    def rank_rows(self, mask, base):
+        """Rank the masked rows by Cur_price (cheapest = base, base+1...). 1 sort, no row loop"""
+        prices = self.combo_df.loc[mask, 'Cur_price'].to_numpy(dtype='float64')
+        order = np.argsort(prices, kind='stable')
+        ranks = np.empty(len(order), dtype='int32')
+        ranks[order] = np.arange(base, base + len(order))
+        self.combo_df.loc[mask, 'rank'] = ranks
+        return
+
 ###################################################################################
 # method 8
 
@@ -439,7 +412,7 @@ class combo_logic:
         logging.info('%s - IN' % cmi_debug )
         pd.set_option('display.max_rows', None)
         pd.set_option('max_colwidth', 40)
-        return self.combo_df
+        return display_df(self.combo_df)            # padded for printing. combo_df stays unpadded
 
 ###################################################################################
 # method 9
@@ -455,7 +428,7 @@ class combo_logic:
         pd.set_option('display.max_rows', None)
         pd.set_option('max_colwidth', 40)
         # DEBUG: print ( self.combo_df.sort_values(by=['Pct_change'], ascending=False) )
-        return self.combo_df.sort_values(by=['Pct_change'], ascending=False)
+        return display_df(self.combo_df.sort_values(by=['Pct_change'], ascending=False))
 
 ###################################################################################
 # method 10
@@ -554,6 +527,22 @@ class combo_logic:
 
         return
 
+###################################################################################
+# method 14.1
+
+    def load_state(self, state):
+        """
+        Load combo_df from an incrementally maintained combo_state (long running mode), instead of
+        prepare_combo_df() + tag_dupes() + tag_uniques(). Rows are already tagged & sorted
+        """
+        cmi_debug = __name__+"::"+self.load_state.__name__+".#"+str(self.inst_uid)
+        self.combo_df = state.view().copy()
+        self.combo_dupes = self.combo_df.duplicated(['Symbol']).to_frame()
+        hot_df = self.combo_df.loc[self.combo_df['Hot'] == "*Hot*"]
+        self.min_price = dict(zip(hot_df.index, zip(hot_df.index, hot_df['Symbol'].astype(str), hot_df['Cur_price'].astype(float).round(2))))
+        logging.info( f'%s - {len(self.combo_df)} rows / {len(hot_df)} *Hot*' % cmi_debug )
+        return
+
 ###################################################################################
 # method 15
 
@@ -0,0 +1,246 @@
+#! python3
+import threading
+import datetime
+import os
+import time
+import logging
+import pandas as pd
+from rich import print
+
+try:
+    import pyarrow                  # optional: Parquet engine. Snapshots are off if not installed
+    import pyarrow.parquet
+    import pyarrow.dataset
+except ImportError:
+    pyarrow = None
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class snapshot_store:
+    """
+    Date & source partitioned Parquet history of every DataFrame the collectors build.
+    - write() appends 1 frame as 1 Parquet file, tagged with the run id & a snapshot timestamp
+    - read() prunes partitions by date & source (directory names), pushes the symbol filter down
+      to the Parquet row group stats & only loads the columns asked for
+    - Past days are compacted into 1 file per source, sorted by Symbol (few files to open / tight row group stats)
+    Layout:  <snap_dir>/source=gainers/date=2026-03-10/<run_id>-0001.parquet     (date = UTC)
+             <snap_dir>/source=gainers/date=2026-03-09/compact.parquet
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    snap_dir = os.path.join(os.path.expanduser("~"), ".aop", "snapshots")
+    run_id = None           # 1 per process. Groups every frame written by 1 run / daemon session
+    enabled = True          # False = write() is a no-op (replay mode / no Parquet engine)
+    row_group = 65536       # rows per row group in compacted files
+
+    def __init__(self, yti, snap_dir=None):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        if snap_dir is not None:
+            self.snap_dir = snap_dir
+        self.run_id = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"-{os.getpid()}"
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.written = 0
+        self.rows = 0
+        self.last_day = {}              # { source: date of the last write }. A new day compacts the previous one
+        if pyarrow is None:
+            logging.warning( f'%s - pyarrow not installed / snapshots disabled' % cmi_debug )
+            self.enabled = False
+        return
+
+######################################################################
+# method 1
+    def set_dir(self, snap_dir=None, enabled=True):
+        """None = keep the default dir"""
+        if snap_dir is not None:
+            self.snap_dir = snap_dir
+        self.enabled = enabled and pyarrow is not None
+        return
+
+######################################################################
+# method 2
+    def write(self, source, df, ts=None):
+        """
+        Append 1 collector frame. source = gainers | losers | small_caps | uvol_up | tech_events | combo ...
+        Adds Run_id & Snap_ts columns. Returns the file written (None if nothing was written)
+        """
+        cmi_debug = __name__+"::"+self.write.__name__+".#"+str(self.yti)
+        if not self.enabled or df is None or len(df) == 0:
+            return None
+        now = datetime.datetime.fromtimestamp(time.time() if ts is None else ts, datetime.timezone.utc)
+        table = pyarrow.Table.from_pandas(self.conform(df, now), preserve_index=False)
+        day = now.date().isoformat()
+        with self.lock:
+            self.seq += 1
+            name = f"{self.run_id}-{self.seq:04d}.parquet"
+            prev = self.last_day.get(source)
+            self.last_day[source] = day
+        path = os.path.join(self.snap_dir, f"source={source}", f"date={day}", name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pyarrow.parquet.write_table(table, path + ".tmp", compression="zstd")
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logging.info( f'%s - cant write snapshot: {e}' % cmi_debug )
+            return None
+        with self.lock:
+            self.written += 1
+            self.rows += len(df)
+        if prev is not None and prev < day:
+            self.compact(source, prev)
+        return path
+
+######################################################################
+# method 3
+    def read(self, source, start=None, end=None, symbols=None, columns=None):
+        """
+        Query 1 source's history.
+        start / end : ISO dates (inclusive). None = open ended. Pruned by partition dir, no file is opened
+        symbols     : list of symbols. Pushed down to the Parquet reader (row groups are skipped on stats)
+        columns     : columns to load (Symbol, Run_id & Snap_ts are always included). None = all
+        """
+        cmi_debug = __name__+"::"+self.read.__name__+".#"+str(self.yti)
+        files = self.files(source, start, end)
+        if pyarrow is None or not files:
+            return pd.DataFrame()
+        dset = self.dataset(files)
+        if dset is None:                # column types clash across files. Read 1 by 1, let pandas line them up
+            frames = [ self.read_dataset(pyarrow.dataset.dataset([ f ], format="parquet"), symbols, columns) for f in files ]
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = self.read_dataset(dset, symbols, columns)
+        logging.info( f'%s - {source}: {len(files)} files / {len(df)} rows' % cmi_debug )
+        return df.sort_values(by=['Snap_ts'], kind='stable').reset_index(drop=True)
+
+######################################################################
+# method 4
+    def files(self, source, start=None, end=None):
+        """Snapshot files for 1 source with date partitions in [start, end]"""
+        src_dir = os.path.join(self.snap_dir, f"source={source}")
+        if not os.path.isdir(src_dir):
+            return []
+        out = []
+        for d in sorted(os.listdir(src_dir)):
+            day = d[len("date="):]
+            if not d.startswith("date=") or (start is not None and day < start) or (end is not None and day > end):
+                continue
+            part = os.path.join(src_dir, d)
+            out.extend(os.path.join(part, f) for f in sorted(os.listdir(part)) if f.endswith(".parquet"))
+        return out
+
+######################################################################
+# method 5
+    def compact(self, source, day):
+        """
+        Merge 1 day's snapshot files into compact.parquet, sorted by Symbol then Snap_ts.
+        Returns the number of files merged
+        """
+        cmi_debug = __name__+"::"+self.compact.__name__+".#"+str(self.yti)
+        files = self.files(source, day, day)
+        if pyarrow is None or len(files) < 2:
+            return 0
+        dset = self.dataset(files)
+        if dset is None:
+            logging.info( f'%s - {source} {day}: column types clash across files / not compacted' % cmi_debug )
+            return 0
+        table = dset.to_table()
+        names = set(table.schema.names)
+        if any(not set(pyarrow.parquet.read_schema(f).names) <= names for f in files):
+            logging.info( f'%s - {source} {day}: compacted schema would drop columns / not compacted' % cmi_debug )
+            return 0                    # never delete inputs the compacted file doesnt fully cover
+        keys = [ (c, "ascending") for c in ('Symbol', 'Snap_ts') if c in table.schema.names ]
+        if keys:
+            table = table.sort_by(keys)
+        path = os.path.join(self.snap_dir, f"source={source}", f"date={day}", "compact.parquet")
+        try:
+            pyarrow.parquet.write_table(table, path + ".tmp", compression="zstd", row_group_size=self.row_group)
+            os.replace(path + ".tmp", path)
+            for f in files:
+                if f != path:
+                    os.remove(f)
+        except OSError as e:
+            logging.info( f'%s - cant compact {source} {day}: {e}' % cmi_debug )
+            return 0
+        logging.info( f'%s - {source} {day}: {len(files)} files -> 1 / {table.num_rows} rows' % cmi_debug )
+        return len(files)
+
+######################################################################
+# method 6
+    def sources(self):
+        if not os.path.isdir(self.snap_dir):
+            return []
+        return sorted(d[len("source="):] for d in os.listdir(self.snap_dir) if d.startswith("source="))
+
+######################################################################
+# method 7
+    def print_stats(self):
+        print ( f"========== Snapshots / {self.snap_dir} ==========" )
+        print ( f"Run: {self.run_id} / frames written: {self.written} / rows: {self.rows}" )
+        return
+
+######################################################################
+# private helpers
+
+    def dataset(self, files):
+        """
+        Dataset over files with the union of their schemas. Frames of 1 source can differ in columns
+        (e.g. CLI combo has rank, daemon combo doesnt). pyarrow would otherwise take the 1st file's schema
+        & silently drop the rest. None = column types cant be unified
+        """
+        try:
+            schema = pyarrow.unify_schemas([ pyarrow.parquet.read_schema(f) for f in files ], promote_options="permissive")
+            return pyarrow.dataset.dataset(files, schema=schema, format="parquet")
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            return None
+
+    def read_dataset(self, dset, symbols, columns):
+        """symbol filter pushdown + column pruning"""
+        filt = None
+        if symbols is not None and 'Symbol' in dset.schema.names:
+            filt = pyarrow.dataset.field('Symbol').isin([ s.strip() for s in symbols ])
+        cols = None
+        if columns is not None:
+            keep = [ 'Symbol', 'Run_id', 'Snap_ts' ] + [ c for c in columns if c not in ('Symbol', 'Run_id', 'Snap_ts') ]
+            cols = [ c for c in keep if c in dset.schema.names ]
+        return dset.to_table(columns=cols, filter=filt).to_pandas()
+
+    def conform(self, df, now):
+        """
+        Stable Parquet types across runs, so 1 source's files always share a schema.
+        Text is stripped (display padding) & stored as strings. Numbers as float64 / int64
+        """
+        out = pd.DataFrame(index=range(len(df)))
+        for c in df.columns:
+            col = df[c].reset_index(drop=True)
+            if pd.api.types.is_bool_dtype(col):
+                out[str(c)] = col.astype(bool)
+            elif pd.api.types.is_integer_dtype(col):
+                out[str(c)] = col.astype('int64')
+            elif pd.api.types.is_numeric_dtype(col):
+                out[str(c)] = col.astype('float64')
+            elif pd.api.types.is_datetime64_any_dtype(col):
+                out[str(c)] = col
+            else:
+                s = col.astype('string')
+                out[str(c)] = s.str.strip()
+        out['Run_id'] = self.run_id
+        out['Snap_ts'] = pd.Timestamp(now)
+        return out
+
+######################################################################
+# Shared store
+
+shared_store = None
+
+def get_snapshot_store():
+    """Return the process wide snapshot store (created on 1st use)"""
+    global shared_store
+    if shared_store is None:
+        shared_store = snapshot_store(1)
+    return shared_store
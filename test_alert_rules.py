@@ -0,0 +1,66 @@
+#! python3
+"""
+Tests for the standing alert rules engine (alert_rules.py) over the incrementally maintained combo state.
+Alert log goes to a pytest tmp dir. No network access needed.
+"""
+
+import json
+import pytest
+from shallow_logic import combo_logic
+from combo_state import combo_state
+from cdc_stream import cdc_stream
+from alert_rules import alert_rules, compile_rule
+
+def engine(tmp_path, rules=None):
+    cdc = cdc_stream(1)
+    state = combo_state(1, combo_logic.cx)
+    rules = alert_rules(1, state, rules, log_path=str(tmp_path / "alerts.jsonl"))
+    cdc.subscribe('*', state.apply)
+    cdc.subscribe('*', rules.on_delta)
+    return cdc, rules
+
+def test_compile_rule():
+    import pandas as pd
+    df = pd.DataFrame({ 'Cur_price': [ 5.0, 20.0, float('nan') ], 'M_B': [ "SB", "LT", None ] })
+    assert compile_rule([ ('Cur_price', '<', 10.0) ])(df).tolist() == [ True, False, False ]
+    assert compile_rule([ ('M_B', 'in', [ "LT", "SB" ]), ('Cur_price', '>', 6) ])(df).tolist() == [ False, True, False ]
+    with pytest.raises(ValueError, match="unknown op"):
+        compile_rule([ ('Cur_price', '~', 1) ])
+    with pytest.raises(ValueError, match="unknown column"):
+        compile_rule([ ('Nope', '>', 1) ])(df)
+
+def test_edge_triggered_and_logged(frames, feed, tmp_path):
+    cdc, rules = engine(tmp_path)
+    tg, sc, uv = frames({ "AMD": 12.0 }, { "CHEAP": 7.0 }, { "CHEAP": 7.0, "UVOL": 1.0 })     # 7/7 = +1%
+    feed(cdc, tg, sc, uv)
+    assert rules.active['new_hot'] == { "CHEAP" } and rules.active['uvol_small_cap_under_10'] == set()
+    sc.loc[0, 'Pct_change'] = 6.5
+    feed(cdc, tg, sc, uv)
+    sc.loc[0, 'Cur_price'] = 7.25                                               # still matching. No re-fire
+    feed(cdc, tg, sc, uv)
+    assert [ (a['rule'], a['symbol']) for a in rules.fired ] == [ ('new_hot', "CHEAP"), ('uvol_small_cap_under_10', "CHEAP") ]
+    log = [ json.loads(l) for l in open(tmp_path / "alerts.jsonl") ]
+    assert len(log) == 2 and log[1]['values']['Pct_change'] == 6.5
+    assert sorted(log[1]['sources']) == [ 'small_caps_top10', 'uvol_up' ]
+
+def test_rearm_and_cooldown(frames, feed, tmp_path):
+    cdc, rules = engine(tmp_path, [ { 'name': 'under_10', 'when': [ ('Cur_price', '<', 10.0) ] } ])
+    rules.cooldown = 0
+    feed(cdc, *frames({ "AMD": 9.0 }, {}, {}))
+    feed(cdc, *frames({ "AMD": 11.0 }, {}, {}))                                 # stops matching = re-arm
+    feed(cdc, *frames({ "AMD": 9.5 }, {}, {}))
+    assert [ a['symbol'] for a in rules.fired ] == [ "AMD", "AMD" ]
+    rules.cooldown = 3600
+    feed(cdc, *frames({}, {}, {}))                                              # drops out = re-arm
+    feed(cdc, *frames({ "AMD": 9.0 }, {}, {}))
+    assert len(rules.fired) == 2 and rules.stats['suppressed'] == 1           # inside the cooldown
+
+def test_only_changed_symbols_evaluated(frames, feed, tmp_path):
+    cdc, rules = engine(tmp_path)
+    syms = { f"S{i}": 10.0 + i for i in range(300) }
+    tg, sc, uv = frames(syms, {}, {})
+    feed(cdc, tg, sc, uv)
+    before = rules.stats['rows']
+    tg.loc[0, 'Cur_price'] = 1.0
+    feed(cdc, tg, sc, uv)
+    assert rules.stats['rows'] - before == 1
@@ -0,0 +1,46 @@
+#! python3
+"""
+Tests for change data capture between collection cycles (cdc_stream.py).
+No network access needed.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from cdc_stream import cdc_stream
+
+def frame(rows):
+    """rows = { symbol: (price, M_B) }. Symbols display padded like the collectors build them"""
+    syms = list(rows)
+    return pd.DataFrame({ 'Row': range(len(syms)), 'Symbol': [ s.ljust(6) for s in syms ],
+                          'Cur_price': [ rows[s][0] for s in syms ], 'M_B': pd.Categorical([ rows[s][1] for s in syms ]),
+                          'Time': time.time() })
+
+def test_first_frame_is_all_inserts():
+    c = cdc_stream(1)
+    d = c.diff('gainers', frame({ "AMD": (1.0, "LB"), "IBM": (2.0, "LB") }))
+    assert d.cycle == 1 and sorted(d.inserted.index) == [ "AMD", "IBM" ]
+    assert d.removed.empty and d.updated.empty
+
+def test_insert_remove_update():
+    c = cdc_stream(1)
+    c.diff('gainers', frame({ "AMD": (1.0, "LB"), "IBM": (2.0, "LB"), "TSLA": (3.0, "LT"), "F": (np.nan, "LM") }))
+    d = c.diff('gainers', frame({ "NVDA": (9.0, "LT"), "IBM": (2.5, "LB"), "TSLA": (3.0, "LB"), "F": (np.nan, "LM") }))
+    assert list(d.inserted.index) == [ "NVDA" ] and list(d.removed.index) == [ "AMD" ]
+    assert d.changed == { "IBM": [ 'Cur_price' ], "TSLA": [ 'M_B' ] }                  # NaN == NaN. Row & Time ignored
+    assert d.updated.loc["IBM", 'Cur_price'] == 2.5
+    assert d.symbols() == { "NVDA", "AMD", "IBM", "TSLA" }
+
+def test_subscribers_only_get_changes():
+    c = cdc_stream(1)
+    seen = { 'gainers': [], 'all': [] }
+    c.subscribe('gainers', seen['gainers'].append)
+    c.subscribe('*', seen['all'].append)
+    c.subscribe('*', lambda d: 1 / 0)                               # a broken subscriber doesnt stop the others
+    f = frame({ "AMD": (1.0, "LB") })
+    c.diff('gainers', f)
+    assert c.diff('gainers', f.assign(Row=5)).empty()              # same data / nothing published
+    c.diff('losers', f)
+    assert [ d.cycle for d in seen['gainers'] ] == [ 1 ]
+    assert [ d.source for d in seen['all'] ] == [ 'gainers', 'losers' ]
+    assert c.stats['unchanged'] == 1
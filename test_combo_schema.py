@@ -0,0 +1,85 @@
+#! python3
+"""
+Tests for the typed combo_df schema (combo_schema.py) & the combo_logic producer boundary.
+Producer frames are built with the real screener DataFrame builder. No network access needed.
+"""
+
+import types
+import pandas as pd
+import pytest
+from combo_schema import conform, display_df, memory_kb, mb_codes
+from y_screenerdata import y_screenerdata
+from shallow_logic import combo_logic
+
+def quotes(syms, base=10.0):
+    return [ {"symbol": s, "shortName": f"{s} Corp", "regularMarketPrice": base + i, "regularMarketChange": 0.5,
+              "regularMarketChangePercent": 5.0 + i, "marketCap": 2.5e9} for i, s in enumerate(syms) ]
+
+def producers():
+    tg = y_screenerdata(1, "L").build_json_df(quotes(["IBM", "TSLA", "AMD"]), "09:30:00").rename(columns={'Row': 'ERank'})
+    sc = y_screenerdata(1, "S").build_json_df(quotes(["SMOL", "AMD"], 2.0), "09:30:00")
+    uv = y_screenerdata(1, "L").build_json_df(quotes(["UVOL"], 1.0), "09:30:00").drop(columns=['Mkt_cap', 'M_B'])
+    uv = uv.assign(Vol=1000, Vol_pct=12.5)
+    return types.SimpleNamespace(tg_df1=tg), types.SimpleNamespace(dg1_df1=sc), types.SimpleNamespace(up_df0=uv)
+
+def test_conform_types_and_unpads():
+    df = conform(producers()[0].tg_df1, "top_gainers")
+    assert list(df.columns) == [ 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap', 'M_B' ]
+    assert df['Symbol'].tolist() == ["IBM", "TSLA", "AMD"]
+    assert df['Co_name'].iloc[0] == "IBM Corp"
+    assert df['Symbol'].dtype == 'category'
+    assert list(df['M_B'].cat.categories) == mb_codes
+    assert (df[['Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap']].dtypes == 'float32').all()
+
+def test_conform_rejects_bad_frames():
+    tg = producers()[0].tg_df1
+    with pytest.raises(ValueError, match="missing columns"):
+        conform(tg.drop(columns=['Cur_price']), "top_gainers")
+    with pytest.raises(ValueError, match="not numeric"):
+        conform(tg.assign(Pct_change="n/a"), "top_gainers")
+    with pytest.raises(ValueError, match="unknown scale tags"):
+        conform(tg.assign(M_B="XX"), "top_gainers")
+
+def test_combo_df_typed_after_merge():
+    x = combo_logic(1, *producers(), {'bool_xray': False})
+    x.prepare_combo_df()
+    df = x.combo_df
+    assert len(df) == 6
+    assert df['Symbol'].dtype == 'category' and df['M_B'].dtype == 'category'
+    assert pd.isna(df.loc[df['Symbol'] == "UVOL", 'M_B']).all()           # unusual vol has no scale tag
+    assert df['Pct_change'].is_monotonic_decreasing
+    assert x.combo_dupes[0].sum() == 1                                     # AMD is in 2 producer frames
+    x.tag_dupes()
+    x.tag_uniques()
+    insights = dict(zip(x.combo_df['Symbol'].astype(str) + x.combo_df['M_B'].astype(str), x.combo_df['Insights']))
+    assert x.combo_df['Insights'].dtype == 'category'
+    assert insights["AMDLB"] == "L cap + % gainer + ^Un vol"
+    assert insights["AMDSB"] == "B/S cap + % gainer + ^Un vol"
+    assert x.combo_df.loc[x.combo_df['Symbol'] == "UVOL", 'Insights'].tolist() == [ "^ Un vol only" ]
+    assert insights["IBMLB"] == "L cap + % gainer"
+
+def test_display_padding_only():
+    x = combo_logic(1, *producers(), {'bool_xray': False})
+    x.prepare_combo_df()
+    view = x.combo_listall()
+    assert set(view['Symbol'].str.len()) == {6}
+    assert set(view['Co_name'].str.len()) == {60}
+    assert "IBM" in x.combo_df['Symbol'].tolist()                          # combo_df itself stays unpadded
+
+def test_display_df_pads_a_copy():
+    df = pd.DataFrame({ 'Symbol': [ "AMD", None ], 'Co_name': [ "Advanced Micro", "x" ], 'Cur_price': [ 1.5, 2.0 ] })
+    view = display_df(df)
+    assert view['Symbol'].iloc[0] == "AMD   " and pd.isna(view['Symbol'].iloc[1])      # missing stays missing
+    assert view['Co_name'].str.len().tolist() == [ 60, 60 ]
+    assert view['Cur_price'].tolist() == [ 1.5, 2.0 ] and df['Symbol'].iloc[0] == "AMD"   # source frame untouched
+
+def test_memory_smaller_than_object_frame():
+    syms = [ f"S{i}" for i in range(300) ]
+    d1, d2, d3 = producers()
+    d1.tg_df1 = y_screenerdata(1, "L").build_json_df(quotes(syms), "09:30:00").rename(columns={'Row': 'ERank'})
+    d2.dg1_df1 = y_screenerdata(1, "S").build_json_df(quotes(syms[::2]), "09:30:00")
+    old = pd.concat([ d1.tg_df1.drop(columns=['ERank', 'Time']), d2.dg1_df1.drop(columns=['Row', 'Time']),
+                      d3.up_df0.drop(columns=['Row', 'Time', 'Vol', 'Vol_pct']) ], ignore_index=True)
+    x = combo_logic(1, d1, d2, d3, {'bool_xray': False})
+    x.prepare_combo_df()
+    assert memory_kb(x.combo_df) < memory_kb(old)
@@ -0,0 +1,56 @@
+#! python3
+"""
+Tests for the deep converged wide table (deep_logic.py).
+Source frames are built with the real screener DataFrame builder. No network access needed.
+"""
+
+import pandas as pd
+import pytest
+from y_screenerdata import y_screenerdata
+from deep_logic import deep_logic
+
+def screener(prefix, prices):
+    quotes = [ {"symbol": s, "shortName": f"{s} Corp", "regularMarketPrice": p, "regularMarketChange": 0.5,
+                "regularMarketChangePercent": 4.0, "marketCap": 2.5e9} for s, p in prices.items() ]
+    return y_screenerdata(1, prefix).build_json_df(quotes, "09:30:00")
+
+def uvol(prices):
+    return screener("L", prices).drop(columns=['Mkt_cap', 'M_B']).assign(Vol=1000, Vol_pct=12.5)
+
+def build():
+    d = deep_logic(1, {})
+    d.add_source('gainers', screener("L", { "AMD": 10.0, "IBM": 20.0, "TSLA": 30.0 }))
+    d.add_source('losers', screener("L", { "F": 5.0 }))
+    d.add_source('small_caps', screener("S", { "AMD": 10.1, "SMOL": 3.0 }))
+    d.add_source('uvol_up', uvol({ "AMD": 10.2, "IBM": 20.0, "UVOL": 1.0 }))
+    d.add_source('tech_events', pd.DataFrame({ 'Symbol': [ "AMD", "F" ], 'Bullcount': [ 3, 1 ], 'Senti': [ 2, -1 ] }))
+    d.converge()
+    return d
+
+def test_one_row_per_symbol():
+    df = build().wide_df
+    assert sorted(df['Symbol'].astype(str)) == [ "AMD", "F", "IBM", "SMOL", "TSLA", "UVOL" ]
+    amd = df[df['Symbol'] == "AMD"].iloc[0]
+    assert amd['Cur_price'] == pytest.approx(10.0)             # coalesced from the 1st source (gainers)
+    assert amd['M_B'] == "LB"
+    assert amd['Vol_uu'] == 1000 and amd['Bullcount_te'] == 3
+    assert pd.isna(df[df['Symbol'] == "UVOL"].iloc[0]['M_B'])
+
+def test_presence_bitmask_and_hot():
+    d = build()
+    srcs = dict(zip(d.wide_df['Symbol'].astype(str), zip(d.wide_df['Srcs'], d.wide_df['Nsrc'], d.wide_df['Hot'])))
+    assert srcs["AMD"] == (1 | 2 | 4 | 32, 4, "*Hot*")
+    assert srcs["IBM"] == (1 | 4, 2, "*Hot*")
+    assert srcs["F"] == (8 | 32, 2, "")                         # 2 sources, but losers + tech events is not Hot
+    assert srcs["TSLA"] == (1, 1, "")
+    assert d.wide_df['Nsrc'].iloc[0] == 4                       # most converged first
+    assert d.hottest()['Symbol'].astype(str).tolist() == [ "AMD", "IBM" ]
+    assert sorted(d.in_sources('gainers', 'uvol_up')['Symbol'].astype(str)) == [ "AMD", "IBM" ]
+
+def test_source_validation():
+    d = deep_logic(1, {})
+    with pytest.raises(ValueError, match="unknown source"):
+        d.add_source('crypto', screener("L", { "AMD": 1.0 }))
+    with pytest.raises(ValueError, match="missing columns"):
+        d.add_source('gainers', pd.DataFrame({ 'Symbol': [ "AMD" ] }))
+    assert list(d.converge().columns) == [ 'Symbol', 'Co_name', 'Cur_price', 'Mkt_cap', 'M_B', 'Srcs', 'Nsrc', 'Hot' ]
@@ -0,0 +1,66 @@
+#! python3
+"""
+Tests for the daemon mode interval scheduler (job_scheduler.py) & the per thread job deadline in net_policy.
+No network access needed. Short intervals (tens of ms).
+"""
+
+import threading
+import time
+import pytest
+from job_scheduler import job_scheduler
+from net_fetcher import get_fetcher
+from net_policy import deadline_exceeded
+
+def test_jobs_run_on_their_own_interval():
+    s = job_scheduler(1, workers=2, seed=1)
+    hits = { 'fast': 0, 'slow': 0 }
+    s.add_job('fast', lambda: hits.__setitem__('fast', hits['fast'] + 1), 0.05, jitter=0.0)
+    s.add_job('slow', lambda: hits.__setitem__('slow', hits['slow'] + 1), 0.25, jitter=0.0)
+    s.run(duration=0.6)
+    assert 9 <= hits['fast'] <= 14
+    assert 2 <= hits['slow'] <= 3
+    assert s.jobs['fast'].runs == hits['fast']
+
+def test_no_overlap():
+    s = job_scheduler(1, workers=4)
+    active = []
+    peak = []
+    def slow():
+        active.append(1)
+        peak.append(len(active))
+        time.sleep(0.12)
+        active.pop()
+    s.add_job('slow', slow, 0.03, jitter=0.0)
+    s.run(duration=0.4)
+    assert max(peak) == 1
+    assert s.jobs['slow'].skips > 0
+
+def test_failures_counted_and_jitter_bounded():
+    s = job_scheduler(1, workers=1, seed=7)
+    def boom():
+        raise RuntimeError("collector broke")
+    job = s.add_job('boom', boom, 0.05, jitter=0.2)
+    s.run(duration=0.3)
+    assert job.fails == job.runs and job.runs >= 3
+    job.planned = time.monotonic() + 10
+    starts = [ s.start_time(job) - job.planned for _ in range(200) ]
+    assert min(starts) >= -0.05 * 0.2 - 0.01 and max(starts) <= 0.05 * 0.2
+
+def test_job_deadline_is_per_thread():
+    policy = get_fetcher().policy
+    seen = {}
+    def job():
+        seen['left'] = policy.remaining()
+        t = threading.Thread(target=lambda: seen.__setitem__('other', policy.remaining()))
+        t.start()
+        t.join()
+        time.sleep(0.06)
+        with pytest.raises(deadline_exceeded, match="job: clip"):
+            policy.timeout_for(5)
+    s = job_scheduler(1, workers=1)
+    job_ref = s.add_job('clip', job, 10, jitter=0.0, deadline=0.05)
+    s.run(duration=0.2)
+    assert 0 < seen['left'] <= 0.05
+    assert seen['other'] is None                # another thread doesnt inherit the job budget
+    assert policy.remaining() is None           # cleared when the run ends
+    assert job_ref.overruns == 1 and job_ref.fails == 0
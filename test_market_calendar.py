@@ -0,0 +1,64 @@
+#! python3
+"""
+Tests for the market session clock (market_calendar.py) & market aware job intervals in job_scheduler.
+Fixed market times. No network access needed.
+"""
+
+import datetime
+from zoneinfo import ZoneInfo
+from market_calendar import market_calendar
+from job_scheduler import job_scheduler
+
+ny = ZoneInfo("America/New_York")
+
+def at(y, m, d, hh, mm=0):
+    return datetime.datetime(y, m, d, hh, mm, tzinfo=ny)
+
+def test_phases_on_a_trading_day():
+    cal = market_calendar(1)
+    assert cal.phase(at(2026, 3, 10, 3, 59)) == 'closed'
+    assert cal.phase(at(2026, 3, 10, 4, 0)) == 'pre'
+    assert cal.phase(at(2026, 3, 10, 9, 45)) == 'open_burst'
+    assert cal.phase(at(2026, 3, 10, 12, 0)) == 'regular'
+    assert cal.phase(at(2026, 3, 10, 15, 30)) == 'close_burst'
+    assert cal.phase(at(2026, 3, 10, 16, 0)) == 'after'
+    assert cal.phase(at(2026, 3, 10, 20, 0)) == 'closed'
+    assert cal.session(at(2026, 3, 10, 9, 45)) == 'regular'
+
+def test_holidays_and_early_close():
+    cal = market_calendar(1)
+    assert cal.phase(at(2026, 12, 25, 12, 0)) == 'closed'            # christmas
+    assert cal.phase(at(2026, 3, 14, 12, 0)) == 'closed'             # saturday
+    assert cal.phase(at(2026, 11, 27, 12, 45)) == 'close_burst'      # day after thanksgiving. 13:00 close
+    assert cal.phase(at(2026, 11, 27, 14, 0)) == 'after'
+
+def test_utc_input_is_converted():
+    cal = market_calendar(1)
+    utc = datetime.datetime(2026, 3, 10, 17, 0, tzinfo=datetime.timezone.utc)     # 13:00 EDT
+    assert cal.phase(utc) == 'regular'
+
+def test_poll_interval_follows_the_session():
+    cal = market_calendar(1)
+    assert cal.poll_interval(60, now=at(2026, 3, 10, 9, 40)) == 30.0
+    assert cal.poll_interval(60, now=at(2026, 3, 10, 12, 0)) == 60.0
+    assert cal.poll_interval(60, now=at(2026, 3, 10, 7, 0)) == 240.0
+    assert cal.poll_interval(60, ('regular',), at(2026, 3, 10, 7, 0)) == 2.5 * 3600     # sleeps until the open
+
+def test_closed_waits_for_the_next_session():
+    cal = market_calendar(1)
+    fri = at(2026, 3, 6, 21, 0)
+    assert cal.next_start(('pre', 'regular', 'after'), fri) == at(2026, 3, 9, 4, 0)     # over the weekend
+    assert cal.next_start(('regular',), at(2026, 12, 24, 14, 0)) == at(2026, 12, 28, 9, 30)
+    secs = cal.poll_interval(60, ('pre', 'regular', 'after'), at(2026, 3, 7, 12, 0))   # across the DST switch
+    assert secs == (at(2026, 3, 9, 4, 0) - at(2026, 3, 7, 12, 0)).total_seconds() - 3600
+
+def test_scheduler_asks_the_calendar():
+    s = job_scheduler(1)
+    fixed = s.add_job('fixed', lambda: None, 60)
+    aware = s.add_job('aware', lambda: None, 60, sessions=('regular',))
+    assert s.next_wait(aware) == 60                     # no calendar = fixed intervals
+    class closed_cal:
+        def poll_interval(self, base, sessions):
+            return 3600.0
+    s.calendar = closed_cal()
+    assert s.next_wait(aware) == 3600.0 and s.next_wait(fixed) == 60
@@ -0,0 +1,78 @@
+#! python3
+"""
+Tests for the request policy layer (net_policy.py): stage deadlines & cancellation, hedging, limiter waits.
+Requests are fake callables (or a fake session behind the shared fetch path). No network access needed.
+"""
+
+import time
+import types
+import pytest
+from net_policy import net_policy, deadline_exceeded
+from net_fetcher import net_fetcher
+
+def ok(timeout):
+    return types.SimpleNamespace(status_code=200, close=lambda: None)
+
+def test_cancelled_stage_moves_on():
+    p = net_policy(1)
+    done = []
+    with p.stage("tops", 0.05):
+        p.run("example.com", ok)
+        time.sleep(0.06)
+        p.run("example.com", ok)                       # past the stage budget = deadline_exceeded
+        done.append("tops")
+    with p.stage("uvol"):
+        p.run("example.com", ok)
+        done.append("uvol")
+    assert done == [ "uvol" ] and p.cancelled == [ "tops" ] and p.deadline_hits == 1
+    assert not p.stage_ok("tops") and p.stage_ok("uvol")
+
+def test_stage_budget_ends_with_the_block():
+    p = net_policy(1)
+    with p.stage("quote", 60):
+        assert 0 < p.remaining() <= 60
+    assert p.remaining() is None and p.stage_name is None
+
+class slow_session:
+    """1st get is slow, the rest are fast"""
+    def __init__(self):
+        self.gets = 0
+    def get(self, url, **kwargs):
+        self.gets += 1
+        if self.gets == 1:
+            time.sleep(0.5)
+        return types.SimpleNamespace(status_code=200, content=b"slow" if self.gets == 1 else b"fast", headers={}, encoding=None, close=lambda: None)
+
+def hedging_fetcher(tmp_path):
+    f = net_fetcher(1, cache_dir=str(tmp_path))
+    f.policy.hedge_after = 0.05
+    f.policy.hedge_hosts = { "example.com" }
+    return f
+
+def test_hedge_fires_and_wins(tmp_path):
+    f = hedging_fetcher(tmp_path)
+    f.limiter.host_state("example.com")['cwnd'] = 4.0          # window has room for the hedge
+    session = slow_session()
+    resp = f.get("https://example.com/q", session=session, cache=False)
+    assert resp.content == b"fast" and session.gets == 2
+    assert f.policy.hedges == 1 and f.policy.hedge_wins == 1 and f.policy.hedge_skips == 0
+
+def test_hedge_never_waits_for_a_slot(tmp_path):
+    f = hedging_fetcher(tmp_path)                               # slow start. cwnd = 1, the 1st request holds it
+    session = slow_session()
+    resp = f.get("https://example.com/q", session=session, cache=False)
+    assert resp.content == b"slow" and session.gets == 1
+    assert f.policy.hedges == 0 and f.policy.hedge_skips == 1
+
+def test_limiter_wait_clipped_to_job_budget(tmp_path):
+    f = net_fetcher(1, cache_dir=str(tmp_path))
+    h = f.limiter.host_state("example.com")
+    h['paused_until'] = time.monotonic() + 3600                 # Retry-After: 1 hour
+    session = slow_session()
+    f.policy.begin_job("uvol", 0.1)
+    try:
+        with pytest.raises(deadline_exceeded):
+            f.get("https://example.com/q", session=session, cache=False)
+    finally:
+        f.policy.end_job()
+    assert session.gets == 0 and h['inflight'] == 0 and f.policy.deadline_hits == 1
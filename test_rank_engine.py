@@ -0,0 +1,49 @@
+#! python3
+"""
+Tests for the vectorized multi factor ranking engine (rank_engine.py) & the combo_logic rank_* tags.
+No network access needed.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from rank_engine import rank_engine
+
+def test_single_factor_orders_by_it(wide):
+    df = wide(50)
+    r = rank_engine(1, { 'pct': 1.0, 'vol': 0, 'cap': 0, 'hot': 0, 'te': 0, 'senti': 0 })
+    top = r.top(df, 5)
+    best = np.fmax(df['Pct_change_tg'], df['Pct_change_sc'])             # factor = best % change over the sources
+    assert top['Symbol'].tolist() == df.loc[best.sort_values(ascending=False).index[:5], 'Symbol'].tolist()
+    assert top['Rank'].tolist() == [ 1, 2, 3, 4, 5 ] and top['Score'].is_monotonic_decreasing
+
+def test_top_k_matches_full_sort(wide):
+    df = wide(2000, seed=7)
+    r = rank_engine(1)
+    s = r.score(df)
+    assert r.top(df, 25)['Symbol'].tolist() == df['Symbol'].to_numpy()[np.argsort(-s, kind='stable')][:25].tolist()
+    assert len(r.rank_all(df)) == 2000 and r.top(df.iloc[0:0], 5).empty
+
+def test_hot_and_missing_factors():
+    df = pd.DataFrame({ 'Symbol': [ "A", "B", "C" ], 'Pct_change': [ 2.0, 2.0, 2.0 ], 'Hot': [ "", "*Hot*", "" ] })
+    assert rank_engine(1).top(df, 1)['Symbol'].tolist() == [ "B" ]        # absent factors are neutral
+    with pytest.raises(ValueError, match="unknown factors"):
+        rank_engine(1, { 'nope': 1.0 })
+
+def test_top_k_at_scale(wide):
+    df = wide(50000, seed=3)
+    r = rank_engine(1)
+    top = r.top(df, 10)
+    assert top['Symbol'].tolist() == r.rank_all(df)['Symbol'].tolist()[:10]            # argpartition == full sort
+    assert top['Rank'].tolist() == list(range(1, 11)) and top['Score'].is_monotonic_decreasing
+
+def test_combo_rank_tags(combo):
+    x = combo({ "AMD": 12.0, "TSLA": 200.0 }, { "AMD": 12.5, "SMOL": 3.0, "MID": 7.0 }, { "UVOL": 1.0 })
+    x.tag_dupes()
+    x.tag_uniques()
+    x.rank_hot()
+    x.rank_unvol()
+    x.rank_caps()
+    ranks = dict(zip(zip(x.combo_df['Symbol'].astype(str), x.combo_df['Cur_price'].round(1)), x.combo_df['rank']))
+    assert ranks == { ("AMD", 12.0): 100, ("AMD", 12.5): 101, ("SMOL", 3.0): 200, ("MID", 7.0): 201,
+                      ("TSLA", 200.0): 202, ("UVOL", 1.0): 300 }
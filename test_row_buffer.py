@@ -0,0 +1,86 @@
+#! python3
+"""
+Tests for the columnar row builder (row_buffer.py) & the producers that use it.
+Each producer is checked against the old 1 row DataFrame + pd.concat build. No network access needed.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+import pytest
+from row_buffer import row_buffer
+
+UVOL_COLS = [ 'Row', 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', "Vol", 'Vol_pct', 'Time' ]
+SEN_COLS = [ 'Row', 'Symbol', 'Article', 'Chunk', 'Sent', 'Rank' ]
+
+def uvol_rows(n):
+    return [ {'symbol': f"S{i}", 'company': f"Co 'number' {i}", 'lastSale': f"${i}.25", 'netChange': f"-{i % 7}.10",
+              'deltaIndicator': "down", 'percentChange': f"-{i % 9}.5%", 'shareVolume': f"{i},000", 'volumePctChange': f"{i}.3%"}
+             for i in range(1, n + 1) ]
+
+def concat_build(cols, rows, index_from=None):
+    """The old way. 1 row DataFrame per record, pd.concat'ed onto the accumulator"""
+    df = pd.DataFrame()
+    for x, row in enumerate(rows, start=1):
+        df = pd.concat([df, pd.DataFrame([row], columns=cols, index=[x])])
+    if index_from is None:
+        df.reset_index(inplace=True, drop=True)
+    return df
+
+def old_uvol_build(dataset, time_now):
+    """The removed un_volumes.build_df(). Same cleanse, 1 row DataFrame per JSON record, pd.concat'ed"""
+    df = pd.DataFrame()
+    for x, r in enumerate(dataset, start=1):
+        co_sym_lj = np.array2string(np.char.ljust(r['symbol'], 6) )
+        co_name_lj = np.array2string(np.char.ljust(re.sub('[\'\"]', '', r['company']), 60) )
+        row = [[ x, re.sub('\'', '', co_sym_lj), re.sub('[\']', '', co_name_lj),
+                 round(float(re.sub('[ $,]', '', r['lastSale'])), 2), round(float(re.sub(r'[\-+]', '', r['netChange'])), 2),
+                 round(float(re.sub(r'[\-+%]', '', r['percentChange'])), 2), round(float(re.sub('[,]', '', r['shareVolume']))),
+                 round(float(re.sub('[%]', '', r['volumePctChange'])), 1), time_now ]]
+        df = pd.concat([df, pd.DataFrame(row, columns=UVOL_COLS, index=[x])])
+    df.reset_index(inplace=True, drop=True)
+    return df
+
+def test_schema_width_enforced():
+    rb = row_buffer(1, ['a', 'b'])
+    rb.append([1, 2])
+    with pytest.raises(ValueError):
+        rb.append([1, 2, 3])
+    assert len(rb) == 1
+
+def test_empty_buffer_keeps_schema():
+    df = row_buffer(1, SEN_COLS).to_df()
+    assert list(df.columns) == SEN_COLS and len(df) == 0
+
+def test_dtypes_and_index():
+    rb = row_buffer(1, ['Symbol', 'Vol'], dtypes={'Vol': 'int32'})
+    rb.extend([["A", 1], ["B", 2]])
+    df = rb.to_df(index=1)
+    assert df.index.tolist() == [1, 2]
+    assert df['Vol'].dtype == 'int32'
+
+def test_uvol_build_df_identical():
+    from nasdaq_uvoljs import un_volumes
+    uv = un_volumes(1, {'bool_xray': False})
+    uv.uvol_up_data = uvol_rows(50)
+    uv.build_df(0)
+    new = uv.up_df0
+    assert new.loc[0, 'Symbol'] == "S1    "
+    assert new['Cur_price'].tolist()[:2] == [1.25, 2.25]
+    assert new['Vol'].tolist()[:2] == [1000, 2000]
+    assert new.index.tolist() == list(range(50))
+    pd.testing.assert_frame_equal(new, old_uvol_build(uvol_rows(50), new.loc[0, 'Time']))
+
+def test_sentiment_df_identical():
+    rows = [ [x, "IBM", x // 10, x % 10, "positive" if x % 3 else "negative", x / 100] for x in range(1, 41) ]
+    rb = row_buffer(1, SEN_COLS)
+    rb.extend(rows)
+    pd.testing.assert_frame_equal(rb.to_df(index=1), concat_build(SEN_COLS, rows, index_from=1))
+
+def test_many_rows():
+    rb = row_buffer(1, SEN_COLS)
+    for x in range(20000):
+        rb.append([x, "IBM", 1, x, "neutral", 0.5])
+    df = rb.to_df()
+    assert len(rb) == 20000 and df.shape == (20000, len(SEN_COLS))
+    assert df['Row'].tolist() == list(range(20000)) and df.iloc[-1].tolist() == [19999, "IBM", 1, 19999, "neutral", 0.5]
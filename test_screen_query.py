@@ -0,0 +1,85 @@
+#! python3
+"""
+Tests for the screen expression language (screen_query.py): parsing, compiled masks over producer frames,
+the deep_logic wide table, the combo_state symbol frame & snapshot history. No network access needed.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from screen_query import screen_query
+from combo_schema import mkt_cap_usd
+
+def caps():
+    """producer style frame. Mkt_cap is in the unit of the M_B scale letter"""
+    return pd.DataFrame({ 'Symbol': [ "AA   ", "BB", "CC", "DD", "EE" ], 'Cur_price': [ 3.0, 5.0, 1.0, 2.0, 40.0 ],
+                          'Pct_change': [ 9.0, 7.0, 12.0, np.nan, 5.5 ], 'Mkt_cap': [ 250.0, 450.0, 1.2, 0.0, 2.5 ],
+                          'M_B': pd.Categorical([ "SM", "SM", "SB", "SZ", "LB" ]), 'Hot': [ "", "*Hot*", "", "", "" ] })
+
+def syms(q, df, source=None):
+    return [ s.strip() for s in screen_query(1, q).run(df, source)['Symbol'] ]
+
+def test_mkt_cap_usd():
+    assert mkt_cap_usd(caps()).tolist()[:3] == [ 250e6, 450e6, 1.2e9 ] and np.isnan(mkt_cap_usd(caps())[3])
+
+def test_filters():
+    df = caps()
+    assert syms("pct_change > 5 and mkt_cap_usd between 300M and 2B", df) == [ "BB", "CC" ]
+    assert syms("not (hot or price >= 5) and pct > 6", df) == [ "AA", "CC" ]
+    assert syms("symbol in (AA, 'EE') or m_b == SB", df) == [ "AA", "CC", "EE" ]
+    assert syms("m_b not in (SM, SB)", df) == [ "DD", "EE" ]
+    assert syms("pct_change != 9", df) == [ "BB", "CC", "EE" ]                   # missing never matches
+    assert syms("hot", df) == [ "BB" ]
+
+def test_order_limit_and_cache():
+    df = caps()
+    assert syms("mkt_cap_usd > 299M order by pct_change desc", df) == [ "CC", "BB", "EE" ]
+    assert syms("price > 0 order by m_b, pct_change desc limit 3", df) == [ "EE", "CC", "AA" ]
+    a = screen_query(1, "pct > 5  order by pct")
+    assert screen_query(2, "pct > 5 order by pct").predicate is a.predicate        # compiled once
+    assert a.columns() == [ 'Pct_change' ]
+
+def test_smallcap_screen_matches_old_filter():
+    from y_smallcaps import smallcap_screen
+    df = caps().assign(M_B=pd.Categorical([ "SM", "SM", "SB", "ST", "SZ" ]))
+    old = pd.concat([ df[df.Mkt_cap > 299], df[df.M_B == "SB"] ]).sort_values(by=['Pct_change'], ascending=False)
+    assert syms(smallcap_screen.screen, df) == [ s.strip() for s in old['Symbol'] ] == [ "CC", "BB" ]
+
+def test_source_membership(wide):
+    df = wide(6).assign(Srcs=[ 1, 2, 4, 6, 8, 32 ])
+    assert syms("source in (smallcap, uvol)", df) == [ "S1", "S2", "S3" ]
+    assert syms("source != gainers and in_te", df) == [ "S5" ]
+    flags = pd.DataFrame({ 'Symbol': [ "A", "B" ], 'in_small_caps_top10': [ True, False ], 'in_uvol_up': [ False, True ] })
+    assert syms("source = smallcap", flags) == [ "A" ]
+    assert syms("source in (uvol)", caps(), source='uvol_up') == [ "AA", "BB", "CC", "DD", "EE" ]
+
+def test_errors():
+    df = caps()
+    for bad, msg in [ ("pct >", "expected a value"), ("(pct > 5", "expected \\)"), ("pct ~ 3", "unexpected character"),
+                      ("pct > 5 6", "unexpected 6"), ("pct > 1 limit 2.5", "whole number"), ("source > 1", "source only") ]:
+        with pytest.raises(ValueError, match=msg):
+            screen_query(1, bad)
+    for bad, msg in [ ("nope > 1", "unknown field"), ("symbol > 5", "is text"), ("pct in (AMD)", "is numeric"),
+                      ("source in (gainers)", "no source info") ]:
+        with pytest.raises(ValueError, match=msg):
+            screen_query(1, bad).mask(df)
+
+def test_snapshot_history(tmp_path):
+    pytest.importorskip("pyarrow")
+    from snapshot_store import snapshot_store
+    store = snapshot_store(1, str(tmp_path))
+    store.write('small_caps', caps())
+    store.write('gainers', caps().assign(Mkt_cap=[ 2.0, 3.0, 4.0, 5.0, 6.0 ], M_B=[ "LB" ] * 5))
+    q = screen_query(1, "source = smallcap and mkt_cap_usd > 299M order by pct_change desc")
+    assert [ s for s in q.run_snapshots(store)['Symbol'] ] == [ "CC", "BB", "EE" ]
+    assert len(screen_query(1, "mkt_cap_usd > 299M").run_snapshots(store, [ 'gainers' ])) == 5
+
+def test_100k_rows(wide):
+    df = wide(100000, seed=3).assign(Mkt_cap=np.random.default_rng(1).uniform(0, 999, 100000),
+                                     Srcs=np.random.default_rng(2).integers(0, 64, 100000).astype('int32'))
+    q = screen_query(1, "pct_change > 5 and mkt_cap_usd between 300M and 2B and source in (smallcap, uvol) "
+                        "order by pct_change desc limit 10")
+    out = q.run(df)
+    best = np.fmax(out['Pct_change_tg'], out['Pct_change_sc'])
+    assert len(out) == 10 and (best > 5).all() and best.is_monotonic_decreasing
+    assert out['Symbol'].tolist() == q.run(df)['Symbol'].tolist()                  # cached predicate, same answer
@@ -0,0 +1,72 @@
+#! python3
+"""
+Tests for the vectorized combo_logic tagging (tag_dupes, tag_uniques, find_hottest, tag_naans).
+Producer frames are built with the real screener DataFrame builder (conftest.py). No network access needed.
+"""
+
+import pytest
+import pandas as pd
+
+def tags(x):
+    return { (s, h, str(i)) for s, h, i in x.combo_df[['Symbol', 'Hot', 'Insights']].itertuples(index=False) }
+
+def test_all_dupe_groups_tagged(combo):
+    x = combo({ "AMD": 12.0, "TSLA": 200.0, "IBM": 150.0 }, { "AMD": 12.5, "TSLA": 199.0, "SMOL": 3.0 }, { "IBM": 150.0, "UVOL": 1.0 })
+    x.tag_dupes()
+    x.tag_uniques()
+    assert tags(x) == {
+        ("AMD", "*Hot*", "L cap + % gainer + ^Un vol"), ("AMD", "*Hot*", "B/S cap + % gainer + ^Un vol"),
+        ("TSLA", "*Hot*", "L cap + % gainer + ^Un vol"), ("TSLA", "*Hot*", "B/S cap + % gainer + ^Un vol"),
+        ("IBM", "*Hot*", "L cap + % gainer + ^Un vol"),              # unusual vol copy (no cap data) is dropped
+        ("SMOL", "", "B/S cap + % gainer"), ("UVOL", "", "^ Un vol only") }
+    assert len(x.combo_df) == 7
+    assert sorted(v[1:] for v in x.min_price.values()) == [ ("AMD", 12.0), ("AMD", 12.5), ("IBM", 150.0), ("TSLA", 199.0), ("TSLA", 200.0) ]
+
+def test_find_hottest_cheapest(combo):
+    x = combo({ "AMD": 12.0, "TSLA": 200.0 }, { "AMD": 12.5, "TSLA": 9.99 }, {})
+    x.tag_dupes()
+    x.find_hottest()
+    row_idx, sym = x.rx
+    assert sym == "TSLA" and x.combo_df.loc[row_idx, 'Cur_price'] == pd.Series([9.99], dtype='float32')[0]
+
+def test_no_hot_stocks(combo):
+    x = combo({ "AMD": 12.0 }, { "SMOL": 3.0 }, { "UVOL": 1.0 })
+    x.tag_dupes()
+    x.find_hottest()
+    assert x.rx == [] and x.min_price == {}
+    assert len(x.tag_naans()) == 1                               # UVOL: no Mkt_cap / M_B
+
+def test_thousands_of_symbols(combo):
+    syms = [ f"S{i}" for i in range(5000) ]
+    x = combo(dict.fromkeys(syms, 10.0), dict.fromkeys(syms[::2], 5.0), dict.fromkeys(syms[::3], 1.0))
+    x.tag_dupes()
+    x.tag_uniques()
+    x.find_hottest()
+    hot = x.combo_df[x.combo_df['Hot'] == "*Hot*"]
+    assert len(x.combo_df) == 7500                               # unusual vol copies of listed symbols dropped
+    assert hot['Symbol'].nunique() == len(set(syms[::2]) | set(syms[::3]))
+    assert x.rx[1] in set(syms[::2])                             # cheapest hot = a $5 small cap copy
+
+def test_polish_stores_cap_in_tag_units(combo, monkeypatch):
+    import shallow_logic
+    from combo_schema import mkt_cap_usd
+    caps = { "BIG": 1200000.0, "MID": 15000.0, "TINY": 30.0, "NANO": 5.0 }      # nasdaq.com mkt_cap, $M
+    asked = []
+    class fake_quote:                                                   # nasdaq.com quote + wrangler, no network
+        quote_json1 = quote_json2 = quote_json3 = None
+        def __init__(self, *a): pass
+        def learn_aclass(self, sym): return "stocks"
+        def get_nquote(self, sym): asked.append(sym)
+        def __getattr__(self, name): return lambda *a: None
+    class fake_wrangler(fake_quote):
+        def build_data_sets(self): self.qd_quote = { 'mkt_cap': caps[asked[-1]] }
+    monkeypatch.setattr(shallow_logic, "nquote", fake_quote)
+    monkeypatch.setattr(shallow_logic, "nq_wrangler", fake_wrangler)
+    x = combo({ "AMD": 12.0 }, {}, dict.fromkeys(caps, 5.0))
+    x.polish_combo_df(1, prepared=True)
+    df = x.combo_df.set_index(x.combo_df['Symbol'].astype(str).str.strip())
+    assert df.loc[[ "BIG", "MID", "TINY" ], 'M_B'].astype(str).tolist() == [ "MT", "LB", "TM" ]
+    assert df.loc[[ "BIG", "MID", "TINY" ], 'Mkt_cap'].tolist() == pytest.approx([ 1.2, 15.0, 30.0 ])
+    usd = dict(zip(df.index, mkt_cap_usd(df)))
+    assert [ usd[s] for s in ("BIG", "MID", "TINY") ] == pytest.approx([ 1.2e12, 1.5e10, 3e7 ])
+    assert df.loc["NANO", 'M_B'] == "UZ" and df.loc["NANO", 'Mkt_cap'] == 5.0        # < $10M. No unit, raw $M kept
@@ -0,0 +1,64 @@
+#! python3
+"""
+Tests for the date/source partitioned Parquet snapshot store (snapshot_store.py).
+Writes into a pytest tmp dir. No network access needed.
+"""
+
+import pytest
+import pandas as pd
+pytest.importorskip("pyarrow")
+from snapshot_store import snapshot_store
+
+day = 86400
+t0 = 1772971200.0               # 2026-03-08 12:00 UTC
+
+def frame(price):
+    return pd.DataFrame({ 'Symbol': [ "AMD   ", "IBM   ", "TSLA  " ], 'Co_name': [ "AMD", "IBM", "Tesla" ],
+                          'Cur_price': [ price, 20.0, 30.0 ], 'Vol': [ 1, 2, 3 ] })
+
+def test_write_partitions_and_tags(tmp_path):
+    s = snapshot_store(1, str(tmp_path))
+    path = s.write('gainers', frame(10.0), ts=t0)
+    assert "source=gainers" in path and "date=2026-03-08" in path
+    df = s.read('gainers')
+    assert df['Symbol'].tolist() == [ "AMD", "IBM", "TSLA" ]              # display padding stripped
+    assert (df['Run_id'] == s.run_id).all() and df['Snap_ts'].iloc[0] == pd.Timestamp(t0, unit='s', tz='UTC')
+    assert s.write('gainers', frame(1.0).iloc[0:0]) is None and s.sources() == [ 'gainers' ]
+
+def test_date_symbol_and_column_pruning(tmp_path):
+    s = snapshot_store(1, str(tmp_path))
+    for i in range(5):
+        s.write('gainers', frame(10.0 + i), ts=t0 + i * day)
+        s.write('losers', frame(1.0), ts=t0 + i * day)
+    assert len(s.files('gainers', '2026-03-09', '2026-03-10')) == 2
+    df = s.read('gainers', start='2026-03-09', end='2026-03-10', symbols=[ "AMD   " ], columns=[ 'Cur_price' ])
+    assert df['Cur_price'].tolist() == [ 11.0, 12.0 ]
+    assert list(df.columns) == [ 'Symbol', 'Run_id', 'Snap_ts', 'Cur_price' ]
+    assert s.read('gainers', start='2027-01-01').empty
+
+def test_past_days_are_compacted(tmp_path):
+    s = snapshot_store(1, str(tmp_path))
+    for i in range(4):
+        s.write('gainers', frame(10.0 + i), ts=t0 + i * 60)
+    s.write('gainers', frame(99.0), ts=t0 + day)                           # new day compacts the previous one
+    old = s.files('gainers', '2026-03-08', '2026-03-08')
+    assert len(old) == 1 and old[0].endswith("compact.parquet")
+    df = s.read('gainers', symbols=[ "AMD" ])
+    assert df['Cur_price'].tolist() == [ 10.0, 11.0, 12.0, 13.0, 99.0 ]
+
+def test_columns_differ_across_files(tmp_path):
+    s = snapshot_store(1, str(tmp_path))
+    s.write('combo', frame(10.0), ts=t0)
+    s.write('combo', frame(11.0).assign(Extra=[ 7, 8, 9 ]), ts=t0 + 60)     # e.g. CLI combo has rank, daemon combo doesnt
+    s.write('combo', frame(12.0), ts=t0 + day)                             # compacts 2026-03-08
+    assert s.files('combo', '2026-03-08', '2026-03-08')[0].endswith("compact.parquet")
+    df = s.read('combo', symbols=[ "AMD" ])
+    assert df['Cur_price'].tolist() == [ 10.0, 11.0, 12.0 ] and df['Extra'].tolist()[1] == 7
+    assert pd.isna(df['Extra'].iloc[0]) and pd.isna(df['Extra'].iloc[2])
+
+def test_type_clash_is_not_compacted(tmp_path):
+    s = snapshot_store(1, str(tmp_path))
+    s.write('combo', frame(10.0), ts=t0)
+    s.write('combo', frame(11.0).assign(Vol=[ "a", "b", "c" ]), ts=t0 + 60)
+    assert s.compact('combo', '2026-03-08') == 0 and len(s.files('combo')) == 2      # inputs kept
+    assert len(s.read('combo')) == 6
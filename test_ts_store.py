@@ -0,0 +1,65 @@
+#! python3
+"""
+Tests for the fixed memory ring buffer time-series store (ts_store.py) used by the -c 10x10x60 cycle.
+No network access needed.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from ts_store import ts_store
+
+def cycle(prices, pcts=None):
+    """1 top 10 style frame. prices = { symbol: price }"""
+    syms = list(prices)
+    pcts = pcts or { s: 10.0 - i for i, s in enumerate(syms) }
+    return pd.DataFrame({ 'Symbol': [ s.ljust(6) for s in syms ], 'Cur_price': [ prices[s] for s in syms ],
+                          'Pct_change': [ pcts[s] for s in syms ], 'Mkt_cap': 1.5 })
+
+def test_window_wraps_and_memory_is_fixed():
+    ts = ts_store(1, window=3, max_symbols=4)
+    size = ts.nbytes()
+    for i in range(10):
+        ts.append(cycle({ "AMD": 10.0 + i, "IBM": 20.0 }), ts=1000.0 + i)
+    assert ts.count == 3 and ts.cycles == 10 and ts.nbytes() == size
+    hist = ts.history("AMD")
+    assert hist['Cur_price'].tolist() == [ 17.0, 18.0, 19.0 ]            # oldest 1st, only the last 3 cycles
+    assert hist['Time'].tolist() == list(pd.to_datetime([ 1007.0, 1008.0, 1009.0 ], unit='s'))
+
+def test_momentum_and_rank_change():
+    ts = ts_store(1, window=5)
+    ts.append(cycle({ "AMD": 10.0, "IBM": 20.0, "TSLA": 5.0 }, { "AMD": 9.0, "IBM": 8.0, "TSLA": 7.0 }))
+    ts.append(cycle({ "AMD": 11.0, "IBM": 19.0 }, { "AMD": 5.0, "IBM": 6.0 }))         # IBM climbs to #1 / TSLA drops out
+    df = ts.summary().set_index('Symbol')
+    assert df.loc["AMD", 'Momentum'] == np.float32(10.0)
+    assert df.loc["IBM", 'Momentum'] == np.float32(-5.0)
+    assert np.isnan(df.loc["TSLA", 'Momentum'])                           # seen once
+    assert df.loc["IBM", 'Rank_chg'] == 1 and df.loc["AMD", 'Rank_chg'] == -1
+    assert df.loc["IBM", 'Rank'] == 1 and df.loc["TSLA", 'Seen'] == 1
+    assert np.isnan(df.loc["TSLA", 'Rank_chg'])
+
+def test_symbol_slots_recycled():
+    ts = ts_store(1, window=4, max_symbols=2)
+    ts.append(cycle({ "AMD": 1.0, "IBM": 2.0 }))
+    ts.append(cycle({ "AMD": 1.1 }))
+    ts.append(cycle({ "AMD": 1.2, "TSLA": 3.0 }))                         # IBM was least recently seen
+    assert set(ts.slots) == { "AMD", "TSLA" }
+    assert ts.history("TSLA")['Cur_price'].isna().sum() == 2
+    assert ts.history("IBM").empty and ts.summary()['Symbol'].tolist()[0] == "AMD"
+
+def test_empty_store():
+    ts = ts_store(1, window=4)
+    assert ts.summary().empty and np.isnan(ts.momentum()).all()
+
+def test_append_cost_flat():
+    """Append cost must not grow with the number of cycles already stored"""
+    ts = ts_store(1, window=100)
+    frame = cycle({ f"S{i}": float(i + 1) for i in range(10) })
+    def cost(n):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            ts.append(frame)
+        return (time.perf_counter() - t0) / n
+    early = cost(200)
+    late = cost(200)
+    assert late < 3 * early
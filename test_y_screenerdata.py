@@ -0,0 +1,91 @@
+#! python3
+"""
+Tests for the shared Yahoo screener data extractor (y_screenerdata.py)
+Uses a small synthetic screener page. No network access needed.
+"""
+
+import json
+from y_screenerdata import y_screenerdata
+
+def make_page(quotes):
+    """Build a fake screener page with the quotes embedded the way SvelteKit ships them"""
+    body = json.dumps({"finance": {"result": [{"count": len(quotes), "quotes": quotes}]}})
+    payload = json.dumps({"status": 200, "statusText": "OK", "headers": {}, "body": body})
+    return ( '<html><head><script type="application/json" data-sveltekit-fetched>{"nav": []}</script></head><body>'
+             f'<script type="application/json" data-sveltekit-fetched data-url="/screener">{payload}</script>'
+             '<table><tbody><tr><td>AAA</td></tr></tbody></table></body></html>' )
+
+QUOTES = [
+    {"symbol": "NVDA", "shortName": "NVIDIA Corp", "regularMarketPrice": {"raw": 120.5, "fmt": "120.50"},
+     "regularMarketChange": {"raw": 6.25}, "regularMarketChangePercent": {"raw": 5.47}, "marketCap": {"raw": 2.95e12}},
+    {"symbol": "ACME", "shortName": "Acme \"Rockets\" Inc.", "regularMarketPrice": 3.1,
+     "regularMarketChange": -0.4, "regularMarketChangePercent": -11.43, "marketCap": 450000000},
+    {"symbol": "ZZZ", "longName": "No Cap Trust", "regularMarketPrice": 9.0,
+     "regularMarketChange": 0.1, "regularMarketChangePercent": 1.12},
+]
+
+def test_json_fast_path():
+    df = y_screenerdata(1, "L").json_df(make_page(QUOTES), "09:30:00")
+    assert list(df.columns) == y_screenerdata.df_cols
+    assert df['Symbol'].tolist() == ["NVDA  ", "ACME  ", "ZZZ   "]
+    assert df.loc[1, 'Co_name'] == "Acme Rockets Inc.".ljust(60)
+    assert df['Cur_price'].tolist() == [120.5, 3.1, 9.0]
+    assert df['Prc_change'].tolist() == [6.25, 0.4, 0.1]
+    assert df['Pct_change'].tolist() == [5.47, 11.43, 1.12]
+    assert df['Mkt_cap'].tolist() == [2.95, 450.0, 0.0]
+    assert df['M_B'].tolist() == ["LT", "LM", "LZ"]
+    assert (df['Time'] == "09:30:00").all()
+
+def test_small_cap_prefix():
+    df = y_screenerdata(1, "S").json_df(make_page(QUOTES), "09:30:00")
+    assert df['M_B'].tolist() == ["ST", "SM", "SZ"]
+
+def test_no_payload_falls_back():
+    page = '<html><body><table><tbody><tr><td>AAA</td></tr></tbody></table></body></html>'
+    assert y_screenerdata(1).json_df(page, "09:30:00") is None
+    assert y_screenerdata(1).json_df(None, "09:30:00") is None
+
+def tbody_rows(rows_html):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup("<table><tbody>" + rows_html + "</tbody></table>", "html.parser").find_all("tr")
+
+def test_table_large_cap_layout():
+    rows = tbody_rows(
+        '<tr><td>NVDA</td><td>NVIDIA "Corp"</td><td><canvas></canvas></td><td>1,120.50</td><td>+6.25</td>'
+        '<td>(+5.47%)</td><td>1.2M</td><td>900k</td><td>2.95T</td><td>N/A</td></tr>'
+        '<tr><td>ACME</td><td>Acme Inc.</td><td><canvas></canvas></td><td>3.10</td><td>-0.40</td>'
+        '<td>-11.43%</td><td>1M</td><td>2M</td><td>N/A</td><td>N/A</td></tr>'
+        '<tr><td>BAD</td><td>Too few cells</td></tr>')
+    df = y_screenerdata(1, "L").table_df(rows, "09:30:00")
+    assert list(df.columns) == y_screenerdata.df_cols
+    assert df['Symbol'].tolist() == ["NVDA  ", "ACME  "]
+    assert df.loc[0, 'Co_name'] == "NVIDIA Corp".ljust(60)
+    assert df['Cur_price'].tolist() == [1120.5, 3.1]
+    assert df['Prc_change'].tolist() == [6.25, 0.4]
+    assert df['Pct_change'].tolist() == [5.47, 11.43]
+    assert df['Mkt_cap'].tolist() == [2.95, 0.0]
+    assert df['M_B'].tolist() == ["LT", "LZ"]
+
+def test_table_small_cap_layout():
+    rows = tbody_rows(
+        '<tr><td>x</td><td>logo SMOL</td><td>Smol Co</td><td><canvas></canvas></td><td>4.10</td>'
+        '<td>+</td><td>0.55</td><td>+</td><td>15.5%</td><td>1M</td><td>2M</td><td>450.1M</td></tr>'
+        '<tr><td>x</td><td>logo TINY</td><td>Tiny Co</td><td><canvas></canvas></td><td>2.00</td>'
+        '<td>+0.25</td><td>+14.3%</td><td>1M</td><td>2M</td><td>1.2B</td></tr>')
+    df = y_screenerdata(1, "S").table_df(rows, "09:30:00")
+    assert df['Symbol'].tolist() == ["SMOL  ", "TINY  "]
+    assert df['Prc_change'].tolist() == [0.55, 0.25]
+    assert df['Pct_change'].tolist() == [15.5, 14.3]
+    assert df['Mkt_cap'].tolist() == [450.1, 1.2]
+    assert df['M_B'].tolist() == ["SM", "SB"]
+
+def test_payload_skips_the_render(monkeypatch):
+    import types
+    import y_topgainers
+    def no_render():
+        raise AssertionError("render hinter used")
+    monkeypatch.setattr(y_topgainers, "get_render_hinter", no_render)
+    tg = y_topgainers.y_topgainers(1)
+    tg.ext_req = types.SimpleNamespace(text=make_page(QUOTES), url="https://finance.yahoo.com/gainers", body_hash="t1")
+    tg.ext_get_data(1, js_render="auto")
+    assert tg.tr_rows == [] and tg.build_tg_df0() == 3 and tg.using_json
@@ -163,7 +163,7 @@ def test_y_topgainers_class():
                 
                 # Test build_tenten60
                 ytg.build_tenten60(1)
-                logger.info(f"Built tenten60 DataFrame with {len(ytg.tg_df2)} rows")
+                logger.info(f"Built tenten60 history with {len(ytg.tg_ts.summary())} symbols")
                 
                 # Print sample data
                 logger.info("Sample data from tg_df1:")
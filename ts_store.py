@@ -0,0 +1,181 @@
+#! python3
+import numpy as np
+import pandas as pd
+import logging
+import time
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class ts_store:
+    """
+    Fixed memory ring buffer time-series store (the -c 10x10x60 cycle history).
+    Preallocated NumPy arrays [ symbol slot, cycle slot ] for price, % change, market cap & rank
+    + 1 timestamp per cycle slot. Memory never grows, whatever the run length.
+    - append() = 1 cycle. O(symbols in the cycle). The oldest cycle is overwritten once the window is full
+    - Symbols absent from a cycle read as NaN (rank = 0) for that cycle
+    - Symbol slots are recycled (least recently seen 1st) once max_symbols is reached
+    - Queries (momentum, rank_change, summary) are vectorized over the whole window
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    window = 60             # cycles kept per symbol
+    max_symbols = 256       # symbol slots
+    head = 0                # next cycle slot to write
+    count = 0               # cycles held (<= window)
+    cycles = 0              # cycles appended since start
+
+    def __init__(self, yti, window=60, max_symbols=256):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.window = int(window)
+        self.max_symbols = int(max_symbols)
+        self.price = np.full((self.max_symbols, self.window), np.nan, dtype='float32')
+        self.pct = np.full((self.max_symbols, self.window), np.nan, dtype='float32')
+        self.mkt_cap = np.full((self.max_symbols, self.window), np.nan, dtype='float32')
+        self.rank = np.zeros((self.max_symbols, self.window), dtype='int16')     # 1 = top of that cycle. 0 = absent
+        self.ts = np.zeros(self.window, dtype='float64')                         # epoch secs of each cycle slot
+        self.last_seen = np.full(self.max_symbols, -1, dtype='int64')             # cycle number a slot was last written
+        self.slots = {}                                                           # { symbol: slot }
+        self.symbols = [ None ] * self.max_symbols                                # slot -> symbol
+        return
+
+######################################################################
+# method 1
+    def append(self, df, ts=None):
+        """
+        Store 1 cycle. df = a screener frame (Symbol, Cur_price, Pct_change, Mkt_cap).
+        Rank = position by Pct_change (highest = 1)
+        """
+        cmi_debug = __name__+"::"+self.append.__name__+".#"+str(self.yti)
+        slot = self.head
+        for arr in (self.price, self.pct, self.mkt_cap):
+            arr[:, slot] = np.nan                                # forget the cycle this slot held before
+        self.rank[:, slot] = 0
+
+        keep = {}                                                # { symbol: 1st frame position } dedupe
+        for i, sym in enumerate(df['Symbol'].tolist()):
+            keep.setdefault(str(sym).strip(), i)
+        pos = np.fromiter(keep.values(), dtype='int64', count=len(keep))
+        rows = np.fromiter((self.slot_for(sym) for sym in keep), dtype='int64', count=len(keep))
+        pct = df['Pct_change'].to_numpy(dtype='float32')[pos]
+        self.price[rows, slot] = df['Cur_price'].to_numpy(dtype='float32')[pos]
+        self.pct[rows, slot] = pct
+        if 'Mkt_cap' in df.columns:
+            self.mkt_cap[rows, slot] = pd.to_numeric(df['Mkt_cap'], errors='coerce').to_numpy(dtype='float32')[pos]
+        self.rank[rows[np.argsort(-pct, kind='stable')], slot] = np.arange(1, len(rows) + 1)
+        self.ts[slot] = time.time() if ts is None else ts
+        self.last_seen[rows] = self.cycles
+
+        self.head = (self.head + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        self.cycles += 1
+        logging.info( f'%s - cycle {self.cycles}: {len(rows)} symbols / {self.count} of {self.window} slots' % cmi_debug )
+        return
+
+######################################################################
+# method 2
+    def slot_for(self, symbol):
+        """Symbol -> its row. New symbols take a free slot, else recycle the least recently seen one"""
+        row = self.slots.get(symbol)
+        if row is not None:
+            return row
+        if len(self.slots) < self.max_symbols:
+            row = len(self.slots)
+        else:
+            row = int(np.argmin(self.last_seen))
+            del self.slots[self.symbols[row]]
+            for arr in (self.price, self.pct, self.mkt_cap):
+                arr[row, :] = np.nan
+            self.rank[row, :] = 0
+        self.slots[symbol] = row
+        self.symbols[row] = symbol
+        self.last_seen[row] = self.cycles
+        return row
+
+######################################################################
+# method 3
+    def ordered(self, arr):
+        """Window of arr (all symbol slots) in time order, oldest cycle 1st. Shape [ symbols, count ]"""
+        return arr[:, (self.head - self.count + np.arange(self.count)) % self.window]
+
+######################################################################
+# method 4
+    def momentum(self, lookback=None):
+        """
+        % price change per symbol slot, from its 1st to its last sighting in the last lookback cycles
+        (None = whole window). NaN if seen in fewer than 2 cycles
+        """
+        px = self.ordered(self.price)
+        if lookback is not None:
+            px = px[:, -lookback:]
+        seen = ~np.isnan(px)
+        n = px.shape[1]
+        rows = np.arange(px.shape[0])
+        first = px[rows, np.argmax(seen, axis=1)] if n else np.full(px.shape[0], np.nan)
+        last = px[rows, n - 1 - np.argmax(seen[:, ::-1], axis=1)] if n else first
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mom = (last - first) / first * 100
+        return np.where(seen.sum(axis=1) >= 2, mom, np.nan)
+
+######################################################################
+# method 5
+    def rank_change(self, lookback=1):
+        """
+        Rank places climbed per symbol slot since lookback cycles ago (+ = moved up the top list).
+        NaN if the symbol is absent in either cycle
+        """
+        rk = self.ordered(self.rank).astype('float32')
+        rk[rk == 0] = np.nan
+        if self.count <= lookback:
+            return np.full(rk.shape[0], np.nan)
+        return rk[:, -1 - lookback] - rk[:, -1]
+
+######################################################################
+# method 6
+    def summary(self, lookback=None):
+        """
+        1 row per tracked symbol: latest price / % change / rank, cycles seen, momentum & rank change.
+        Small & bounded (tracked symbols only). Never the full history
+        """
+        cols = [ 'Symbol', 'Cur_price', 'Pct_change', 'Rank', 'Seen', 'Momentum', 'Rank_chg' ]
+        if self.count == 0:
+            return pd.DataFrame(columns=cols)
+        live = np.array([ s is not None for s in self.symbols ])
+        px = self.ordered(self.price)
+        seen = ~np.isnan(px)
+        last = np.where(seen.any(axis=1), px.shape[1] - 1 - np.argmax(seen[:, ::-1], axis=1), 0)
+        rows = np.arange(self.max_symbols)
+        df = pd.DataFrame({ 'Symbol': self.symbols,
+                            'Cur_price': px[rows, last],
+                            'Pct_change': self.ordered(self.pct)[rows, last],
+                            'Rank': self.ordered(self.rank)[rows, last],
+                            'Seen': seen.sum(axis=1),
+                            'Momentum': self.momentum(lookback),
+                            'Rank_chg': self.rank_change() }, columns=cols)
+        df = df[live & (df['Seen'].to_numpy() > 0)]
+        return df.sort_values(by=['Seen', 'Momentum'], ascending=False, na_position='last', ignore_index=True)
+
+######################################################################
+# method 7
+    def history(self, symbol):
+        """Time series of 1 symbol over the window (oldest 1st). Empty DF if not tracked"""
+        row = self.slots.get(symbol)
+        idx = (self.head - self.count + np.arange(self.count)) % self.window
+        if row is None:
+            return pd.DataFrame(columns=[ 'Time', 'Cur_price', 'Pct_change', 'Mkt_cap', 'Rank' ])
+        return pd.DataFrame({ 'Time': pd.to_datetime(self.ts[idx], unit='s'),
+                              'Cur_price': self.price[row, idx],
+                              'Pct_change': self.pct[row, idx],
+                              'Mkt_cap': self.mkt_cap[row, idx],
+                              'Rank': self.rank[row, idx] })
+
+######################################################################
+# method 8
+    def nbytes(self):
+        """Fixed memory held by the ring arrays"""
+        return sum(a.nbytes for a in (self.price, self.pct, self.mkt_cap, self.rank, self.ts, self.last_seen))
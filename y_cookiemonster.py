@@ -10,6 +10,9 @@ logging.basicConfig(level=logging.INFO)
 
 from requests_html import HTMLSession
 
+from ml_renderhinter import get_render_hinter
+from net_fetcher import get_fetcher
+
 class y_cookiemonster:
     """
     Class to provide 2 utility methos that will...
@@ -64,7 +67,7 @@ class y_cookiemonster:
         logging.info( f"%s - URL: {ht_url}" % cmi_debug )
 
         session = HTMLSession()
-        self.r = session.get(ht_url)
+        self.r = get_fetcher().get(ht_url, session=session)
         logging.info('%s - close url handle' % cmi_debug )
         self.r.close()
         return self.r
@@ -89,7 +92,7 @@ class y_cookiemonster:
         logging.info( f"%s - Init JS_session HTMLsession() setup" % cmi_debug )
 
         js_session = HTMLSession()
-        with js_session.get( js_url ) as self.js_resp0:
+        with get_fetcher().get( js_url, session=js_session ) as self.js_resp0:
         
             logging.info( f"%s - JS_session.get() sucessful !" % cmi_debug )
         
@@ -98,4 +101,24 @@ class y_cookiemonster:
         logging.info( f"%s - Swap in JS reps0 cookies into js_session yahoo_headers" % cmi_debug )
         js_session.cookies.update(self.yahoo_headers)
 
-        return self.js_resp0
\ No newline at end of file
+        return self.js_resp0
+
+    # ----------------- 3 --------------------
+    def get_auto_data(self, auto_url, zones):
+        """
+        Connect to finance.yahoo.com and open a Webpage in ADAPTIVE mode.
+        Plain HTML is tried 1st. The page is only pushed through the Javascript render engine
+        if the expected data zones (CSS selectors e.g. 'tbody') are missing.
+        The outcome is learned per URL pattern, so later opens skip the failed cheap attempt.
+        """
+
+        cmi_debug = __name__+"::"+self.get_auto_data.__name__+".#"+str(self.yti)
+        logging.info('%s - IN' % cmi_debug )
+        auto_url = "https://" + auto_url
+        logging.info( f"%s - URL: {auto_url} / zones: {zones}" % cmi_debug )
+
+        session = HTMLSession()
+        self.r = get_render_hinter().fetch(session, auto_url, zones, headers=self.yahoo_headers, timeout=5)
+        logging.info('%s - close url handle' % cmi_debug )
+        self.r.close()
+        return self.r
@@ -1,6 +1,5 @@
 #! python3
 
-from bs4 import BeautifulSoup
 from requests_html import HTMLSession, HTML  # Added for JavaScript rendering
 import pandas as pd
 import numpy as np
@@ -9,6 +8,12 @@ import logging
 import time
 from rich import print
 
+from render_pool import get_render_pool
+from ml_renderhinter import get_render_hinter
+from y_screenerdata import y_screenerdata
+from net_fetcher import get_fetcher
+from html_backend import get_html_backend
+
 logging.basicConfig(level=logging.INFO)
 
 #####################################################
@@ -59,7 +64,7 @@ class y_daylosers:
         try:
             # Create a requests-html session instead of requests
             session = HTMLSession()
-            self.dummy_resp0 = session.get(self.dummy_url, headers=self.yahoo_headers, timeout=5)
+            self.dummy_resp0 = get_fetcher().get(self.dummy_url, session=session, cache=False, headers=self.yahoo_headers, timeout=5)
             hot_cookies = self.dummy_resp0.cookies.get_dict()
             logging.info(f"Successfully initialized dummy session with requests-html")
             return True
@@ -81,6 +86,8 @@ class y_daylosers:
         Parameters:
             yti: Instance identifier
             js_render: use JAVASCRIPT render engine or not
+                       "auto" = adaptive. Plain HTML 1st, JS render only if <tbody> is missing (learned per URL)
+                                & there is no embedded JSON payload
             
         Returns:
             None, but populates self.tr_rows with requests-html Elements
@@ -93,7 +100,16 @@ class y_daylosers:
         # use preexisting response from managed req (handled by cookie monster) 
         r = self.ext_req
         
-        if js_render:   # should we render page with  JAVASCRIPT engine?
+        if js_render == "auto" and y_screenerdata(self.yti, "L").payload(getattr(r, 'text', None), getattr(r, 'body_hash', None)):
+            logging.info(f"%s     - Embedded JSON payload found / data zones satisfied, no JS render" % cmi_debug)
+            self.tag_tbody = None       # build_df uses the JSON fast path. Nothing rendered, nothing learned
+            self.tr_rows = []
+            self.using_bs4 = False
+            return
+        if js_render == "auto":     # let the render hinter decide (& learn) if JAVASCRIPT engine is needed
+            logging.info(f"%s     - Adaptive render mode..." % cmi_debug)
+            r = get_render_hinter().adapt(r, ['tbody'])
+        elif js_render:   # should we render page with  JAVASCRIPT engine?
             try:
                 # If ext_req is a standard requests Response object, convert to requests-html
                 if not hasattr(r, 'html'):
@@ -106,7 +122,7 @@ class y_daylosers:
                 # Try to render JavaScript if available, but make it optional
                 try:
                     logging.info(f"%s     - Attempt to render JS content..." % cmi_debug)
-                    r.html.render(timeout=20, sleep=1)
+                    get_render_pool().render(r.html, timeout=20, sleep=1)    # borrow a warm page from the shared pool
                     logging.info(f"%s     - JavaScript render successful" % cmi_debug)
                 except Exception as e:
                     logging.warning(f"%s     - JavaScript rendering fail (this is okay): {e}" % cmi_debug)
@@ -128,7 +144,7 @@ class y_daylosers:
             logging.info(f"%s     - Fall back to BeautifulSoup parsing" % cmi_debug)
             
             # Fallback to BeautifulSoup for parsing
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = get_html_backend().soup(r.text, "tbody")          # only build the <tbody> zone
             bs_tbody = soup.find('tbody')
             
             if not bs_tbody:
@@ -165,222 +181,24 @@ class y_daylosers:
         self.tl_df0 = pd.DataFrame()             # new df, but is NULLed
         x = 0
 
+        # FAST PATH : Yahoo ships the screener data set as embedded JSON. Use it if its there
+        json_df = y_screenerdata(self.yti, "L").json_df(getattr(self.ext_req, 'text', None), time_now, getattr(self.ext_req, 'body_hash', None))
+        if json_df is not None:
+            self.using_json = True
+            self.tl_df0 = json_df
+            self.rows_extr = len(json_df)
+            self.rows_tr_rows = len(json_df)
+            logging.info( f'%s - populated new DF0 dataset from embedded JSON: {len(json_df)} rows' % cmi_debug )
+            return len(json_df)
+
+        self.using_json = False         # SLOW PATH : scrape the rendered <tbody> table
         # Update row count calculation for requests-html
         self.rows_extr = int(len(self.tag_tbody.find('tr')))
         self.rows_tr_rows = int(len(self.tr_rows))
         
-        for datarow in self.tr_rows:
-            """
-            # >>>DEBUG<< for whedatarow.stripped_stringsn yahoo.com changes data model...
-            y = 1
-            print ( f"===================== Debug =========================" )
-            #print ( f"Data {y}: {datarow}" )
-            for i in datarow.find_all("td"):
-                print ( f"===================================================" )
-                if i.canvas is not None:
-                    print ( f"Data {y}: Found Canvas, skipping..." )
-                else:
-                    print ( f"Data {y}: {i.text}" )
-                    print ( f"Data g: {next(i.stripped_strings)}" )
-                #logging.info( f'%s - Data: {debug_data.strings}' % cmi_debug )
-                y += 1
-            print ( f"===================== Debug =========================" )
-            # >>>DEBUG<< for when yahoo.com changes data model...
-            """
-            try:
-                # GENERATOR : Data Extractor that works with both requests-html and BeautifulSoup
-                def extr_gen():
-                    if hasattr(self, 'using_bs4') and self.using_bs4:
-                        # BeautifulSoup version
-                        for i in datarow.find_all("td"):
-                            if i.canvas is not None:
-                                yield ("canvas")
-                            else:
-                                yield (f"{next(i.stripped_strings)}")
-                    else:
-                        # requests-html version
-                        for i in datarow.find("td"):
-                            if i.find('canvas', first=True):
-                                yield ("canvas")
-                            else:
-                                # Get text content - requests-html equivalent of stripped_strings
-                                text = i.text.strip() if i.text else ""
-                                
-                                # Handle multi-line text content (common in newer Yahoo Finance format)
-                                if '\n' in text:
-                                    # Split by newline and take the first line (usually the main value)
-                                    lines = text.split('\n')
-                                    logging.info(f"{cmi_debug} GEN - Multi-line text detected: {text}")
-                                    
-                                    # For price, take the first line
-                                    if len(lines) > 0 and all(c.isdigit() or c in '.-,' for c in lines[0].replace(',', '')):
-                                        yield lines[0].strip()
-                                    # For change values with +/- signs
-                                    elif len(lines) > 1 and ('+' in lines[1] or '-' in lines[1]):
-                                        yield lines[1].strip()
-                                    # For percentage values with % sign
-                                    elif len(lines) > 2 and '%' in lines[2]:
-                                        yield lines[2].strip().strip('()')
-                                    else:
-                                        # Default to first line if we can't determine the format
-                                        yield lines[0].strip()
-                                else:
-                                    yield text
-
-                try:
-                    ################################ 1 ####################################
-                    extr_strs = extr_gen()
-                    co_sym = next(extr_strs)             # 1 : ticker symbol info / e.g "NWAU"
-                    co_name = next(extr_strs)            # 2 : company name / e.g "Consumer Automotive Finance, Inc."
-                    mini_chart = next(extr_strs)         # 3 : embeded mini GFX chart
-                    price = next(extr_strs)              # 3 : price (Intraday) / e.g "0.0031"
-                    
-                    logging.info(f"{cmi_debug} : Symbol: {co_sym}, Price: {price}")
-
-                    ################################ 2 ####################################
-                    # Handle change value
-                    change_sign = next(extr_strs)        # 4 : test for dedicated column for +/- indicator
-                    logging.info(f"{cmi_debug} : {co_sym} : Check $ CHANGE dedicated [+-] field...")
-                    
-                    # Clean up change value
-                    change_val = change_sign
-                    if change_val.startswith('+') or change_val.startswith('-'):
-                        logging.info(f"{cmi_debug} : $ CHANGE: {change_val} [+-], stripping...")
-                        change_cl = re.sub(r'[\+\-]', "", change_val)       # remove +/- sign
-                        logging.info(f"{cmi_debug} : $ CHANGE cleaned to: {change_cl}")
-                    else:
-                        logging.info(f"{cmi_debug} : {change_val} : $ CHANGE is NOT signed [+-]")
-                        change_cl = re.sub(r'[\,]', "", change_val)       # remove commas
-                        logging.info(f"{cmi_debug} : $ CHANGE: {change_cl}")
-                    
-                    # Handle percentage value
-                    pct_sign = next(extr_strs)              # 5 : test for dedicated column for +/- indicator
-                    logging.info(f"{cmi_debug} : {co_sym} : Check % CHANGE dedicated [+-] field...")
-                    
-                    # Clean up percentage value
-                    pct_val = pct_sign
-                    if '%' in pct_val:
-                        # Remove parentheses if present
-                        pct_val = pct_val.strip('()')
-                        
-                    if (re.search(r'\+', pct_val)) or (re.search(r'\-', pct_val)) is not None:
-                        logging.info(f"{cmi_debug} : % CHANGE {pct_val} [+-], stripping...")
-                        pct_cl = re.sub(r'[\+\-\%]', "", pct_val)       # remove +/-/% signs
-                        logging.info(f"{cmi_debug} : % CHANGE cleaned to: {pct_cl}")
-                    else:
-                        logging.info(f"{cmi_debug} : {pct_val} : % CHANGE is NOT signed [+-]")
-                        pct_cl = re.sub(r'[\,\%]', "", pct_val)       # remove commas and % sign
-                        logging.info(f"{cmi_debug} : % CHANGE: {pct_cl}")
- 
-                    ################################ 3 ####################################
-                    try:
-                        vol = next(extr_strs)            # 6 : volume with scale indicator/ e.g "70.250k"
-                        avg_vol = next(extr_strs)        # 7 : Avg. vol over 3 months) / e.g "61,447"
-                        mktcap = next(extr_strs)         # 8 : Market cap with scale indicator / e.g "15.753B"
-                        peratio = next(extr_strs)        # 9 : PE ratio TTM (Trailing 12 months) / e.g "N/A"
-                    except StopIteration:
-                        # Handle case where some columns might be missing
-                        logging.warning(f"{cmi_debug} : Not all expected columns found, using defaults for missing values")
-                        vol = "0"
-                        avg_vol = "0"
-                        mktcap = "0"
-                        peratio = "N/A"
-
-                    ################################ 4 ####################################
-                    # now wrangle the data...
-                    co_sym_lj = f"{co_sym:<6}"                                   # left justify TXT in DF & convert to raw string
-                    co_name_lj = np.array2string(np.char.ljust(co_name, 60) )    # left justify TXT in DF & convert to raw string
-                    co_name_lj = (re.sub(r'[\'\"]', '', co_name_lj) )             # remove " ' and strip leading/trailing spaces
-                    
-                    # Clean price and convert to float
-                    price_cl = (re.sub(r'[\,]', '', price))                      # remove commas
-                    try:
-                        price_clean = float(price_cl)
-                    except ValueError:
-                        logging.warning(f"{cmi_debug} : Could not convert price '{price_cl}' to float, using 0.0")
-                        price_clean = 0.0
-                    
-                    # Clean change value and convert to float
-                    try:
-                        change_clean = float(re.sub(r'[\,]', '', change_cl))
-                    except ValueError:
-                        logging.warning(f"{cmi_debug} : Could not convert change '{change_cl}' to float, using 0.0")
-                        change_clean = 0.0
-
-                    # Clean percentage value and convert to float
-                    if pct_val == "N/A":
-                        pct_clean = float(0.0)                               # Bad data. Found a field with N/A instead of real num
-                    else:
-                        try:
-                            pct_clean = float(re.sub(r'[\%\+\-,]', "", pct_val))
-                        except ValueError:
-                            logging.warning(f"{cmi_debug} : Could not convert percentage '{pct_val}' to float, using 0.0")
-                            pct_clean = 0.0
-
-                    ################################ 5 ####################################
-                    # Clean market cap and determine scale (T, B, M)
-                    mktcap = (re.sub(r'[N\/A]', '0', mktcap))               # handle N/A
-                    TRILLIONS = re.search('T', mktcap)
-                    BILLIONS = re.search('B', mktcap)
-                    MILLIONS = re.search('M', mktcap)
-                    mb = "LZ"  # Default to "Zillions" (unknown scale)
-                    
-                    try:
-                        if TRILLIONS:
-                            mktcap_clean = float(re.sub('T', '', mktcap))
-                            mb = "LT"
-                            logging.info(f'%s : #{x} : {co_sym_lj} Mkt Cap: TRILLIONS : T' % cmi_debug)
-                        elif BILLIONS:
-                            mktcap_clean = float(re.sub('B', '', mktcap))
-                            mb = "LB"
-                            logging.info(f'%s : #{x} : {co_sym_lj} Mkt cap: BILLIONS : B' % cmi_debug)
-                        elif MILLIONS:
-                            mktcap_clean = float(re.sub('M', '', mktcap))
-                            mb = "LM"
-                            logging.info(f'%s : #{x} : {co_sym_lj} Mkt cap: MILLIONS : M' % cmi_debug)
-                        else:
-                            # Try to convert directly to float if no scale indicator
-                            try:
-                                mktcap_clean = float(re.sub(r'[\,]', '', mktcap))
-                                mb = "LZ"  # Unknown scale
-                            except ValueError:
-                                mktcap_clean = 0    # error condition - possible bad data
-                                mb = "LZ"           # Zillions
-                                logging.info(f'%s : #{x} : {co_sym_lj} bad mktcap data N/A : Z' % cmi_debug)
-                    except ValueError:
-                        mktcap_clean = 0    # error condition - possible bad data
-                        mb = "LZ"           # Zillions
-                        logging.info(f'%s : #{x} : {co_sym_lj} bad mktcap data, could not convert to float: {mktcap}' % cmi_debug)
-                        
-                except Exception as e:
-                    logging.error(f"{cmi_debug} : Error processing row: {e}")
-                    continue  # Skip this row and move to the next one
-
-                ################################ 6 ####################################
-                # now construct our list for concatinating to the dataframe 
-                logging.info( f"%s ============= Data prepared for DF =============" % cmi_debug )
-
-                self.list_data = [[ \
-                           x, \
-                           re.sub(r'\'', '', co_sym_lj), \
-                           co_name_lj, \
-                           price_clean, \
-                           change_clean, \
-                           pct_clean, \
-                           mktcap_clean, \
-                           mb, \
-                           time_now ]]
-
-                ################################ 7 ####################################
-                self.df_1_row = pd.DataFrame(self.list_data, columns=[ 'Row', 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap', 'M_B', 'Time' ], index=[x] )
-                self.tl_df0 = pd.concat([self.tl_df0, self.df_1_row])  
-                x+=1
-            except StopIteration:
-                logging.error(f"{cmi_debug} : StopIteration error - not enough cells in row")
-                continue
-            except Exception as e:
-                logging.error(f"{cmi_debug} : Error processing row: {e}")
-                continue
+        # 1 pass collects raw cells column-wise, then vectorized clean-up & 1 DataFrame build (no per-row concat)
+        self.tl_df0 = y_screenerdata(self.yti, "L").table_df(self.tr_rows, time_now, getattr(self, 'using_bs4', False))
+        x = len(self.tl_df0)
 
         logging.info('%s - populated new DF0 dataset' % cmi_debug )
         return x        # number of rows inserted into DataFrame (0 = some kind of #FAIL)
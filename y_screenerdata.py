@@ -0,0 +1,295 @@
+#! python3
+import pandas as pd
+import numpy as np
+import re
+import json
+import logging
+
+# logging setup
+logging.basicConfig(level=logging.INFO)
+
+#####################################################
+
+class y_screenerdata:
+    """
+    Shared data extractor for the finance.yahoo.com screener pages
+    (Top gainers, Top losers & Small cap gainers)
+    Yahoo ships the screener data set twice in every page...
+    1. as the rendered <tbody>/<tr>/<td> table
+    2. as an embedded JSON payload inside a <script type="application/json"> block
+    json_df() decodes #2. table_df() scrapes #1 (the fallback). Both build the DataFrame in one vectorized step.
+    """
+
+    # global accessors
+    yti = 0                 # Unique instance identifier
+    cap_prefix = "L"        # M_B scale tag prefix. L = large cap screener / S = small cap screener
+    json_quotes = None      # list of quote dicts decoded from the embedded JSON payload
+    payload_memo = {}       # SHARED { body_hash: quotes } - skip the regex scan + json decode for an unchanged page body
+    df_cols = [ 'Row', 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap', 'M_B', 'Time' ]
+
+    # embedded JSON data blocks (SvelteKit fetched data & friends)
+    script_rx = re.compile(r'<script[^>]*type="application/json"[^>]*>(.*?)</script>', re.S)
+
+    def __init__(self, yti, cap_prefix="L"):
+        cmi_debug = __name__+"::"+self.__init__.__name__
+        logging.info( f'%s - Instantiate.#{yti}' % cmi_debug )
+        self.yti = yti
+        self.cap_prefix = cap_prefix
+        return
+
+#####################################################
+# method #1
+    def find_json_payload(self, page_text):
+        """
+        Scan the raw page text for embedded JSON <script> blocks & decode the 1st one that
+        carries a screener quotes list.
+        Returns: list of quote dicts, or None if the page has no screener payload
+        """
+        cmi_debug = __name__+"::"+self.find_json_payload.__name__+".#"+str(self.yti)
+        logging.info('%s - IN' % cmi_debug )
+        self.json_quotes = None
+        for m in self.script_rx.finditer(page_text):
+            blob = m.group(1)
+            if 'regularMarketPrice' not in blob:     # cheap reject before paying for json.loads()
+                continue
+            try:
+                doc = json.loads(blob)
+            except ValueError:
+                continue
+            quotes = self.walk_quotes(doc, 0)
+            if quotes:
+                logging.info( f'%s - Found JSON screener payload: {len(quotes)} quotes' % cmi_debug )
+                self.json_quotes = quotes
+                return quotes
+
+        logging.info('%s - NO JSON screener payload in page' % cmi_debug )
+        return None
+
+#####################################################
+# method #2
+    def walk_quotes(self, node, depth):
+        """
+        Recursively hunt for the screener quotes list inside a decoded JSON doc.
+        NOTE: SvelteKit wraps the real API response as a JSON *string* in the "body" field,
+              so strings that look like JSON docs get decoded & walked too.
+        """
+        if depth > 12:
+            return None
+        if isinstance(node, str):
+            if node[:1] == "{" and 'regularMarketPrice' in node:
+                try:
+                    return self.walk_quotes(json.loads(node), depth+1)
+                except ValueError:
+                    return None
+            return None
+        if isinstance(node, list):
+            if node and all(isinstance(i, dict) and 'symbol' in i and 'regularMarketPrice' in i for i in node[:3]):
+                return node
+            for i in node:
+                found = self.walk_quotes(i, depth+1)
+                if found:
+                    return found
+            return None
+        if isinstance(node, dict):
+            for v in node.values():
+                found = self.walk_quotes(v, depth+1)
+                if found:
+                    return found
+        return None
+
+#####################################################
+# method #3
+    def build_json_df(self, quotes, time_now):
+        """
+        Build the full screener DataFrame from the decoded JSON quotes in 1 vectorized step.
+        Output matches the table scraper DF exactly (same cols, padding, unsigned changes, M_B codes)
+        NOTE: Yahoo numeric fields are either plain numbers or {"raw": 12.3, "fmt": "12.30"} dicts
+        """
+        cmi_debug = __name__+"::"+self.build_json_df.__name__+".#"+str(self.yti)
+        logging.info( f'%s - IN / {len(quotes)} quotes' % cmi_debug )
+
+        def raw(v):
+            return v.get('raw') if isinstance(v, dict) else v
+
+        sym = pd.Series([q.get('symbol', '') for q in quotes], dtype=object)
+        name = pd.Series([q.get('shortName') or q.get('longName') or '' for q in quotes], dtype=object)
+        price = pd.to_numeric(pd.Series([raw(q.get('regularMarketPrice')) for q in quotes], dtype=object), errors='coerce').fillna(0.0)
+        change = pd.to_numeric(pd.Series([raw(q.get('regularMarketChange')) for q in quotes], dtype=object), errors='coerce').fillna(0.0)
+        pct = pd.to_numeric(pd.Series([raw(q.get('regularMarketChangePercent')) for q in quotes], dtype=object), errors='coerce').fillna(0.0)
+        cap = pd.to_numeric(pd.Series([raw(q.get('marketCap')) for q in quotes], dtype=object), errors='coerce').fillna(0.0).to_numpy()
+
+        # Market cap scale (T, B, M) -> same M_B codes as the table scraper (e.g. LB, SM, LZ)
+        conds = [ cap >= 1e12, cap >= 1e9, cap >= 1e6 ]
+        scale = np.select(conds, [ 1e12, 1e9, 1e6 ], default=1.0)
+        tag = np.select(conds, [ 'T', 'B', 'M' ], default='Z')
+        mkt_cap = np.where(tag == 'Z', 0.0, np.round(cap / scale, 3))
+
+        df = pd.DataFrame({
+                'Row': np.arange(len(quotes)),
+                'Symbol': sym.str.replace("'", "", regex=False).str.ljust(6),
+                'Co_name': name.str.replace(r'[\'\"]', '', regex=True).str.ljust(60),
+                'Cur_price': price.to_numpy(dtype=float),
+                'Prc_change': change.abs().to_numpy(dtype=float),        # table scraper strips the +/- sign
+                'Pct_change': pct.abs().to_numpy(dtype=float),           # table scraper strips the +/-/% signs
+                'Mkt_cap': mkt_cap,
+                'M_B': np.char.add(self.cap_prefix, tag.astype(str)),
+                'Time': time_now }, columns=self.df_cols)
+
+        logging.info( f'%s - JSON DataFrame built: {len(df)} rows' % cmi_debug )
+        return df
+
+#####################################################
+# method #4
+    def json_df(self, page_text, time_now, body_hash=None):
+        """
+        FAST PATH: locate + decode the embedded payload & build the DataFrame.
+        body_hash: page body hash from the shared fetcher. Same hash = same body, so the decoded quotes are reused
+        Returns: DataFrame, or None if the page has no payload (caller falls back to the table scraper)
+        """
+        quotes = self.payload(page_text, body_hash)
+        if not quotes:
+            return None
+        return self.build_json_df(quotes, time_now)
+
+#####################################################
+# method #4.1
+    def payload(self, page_text, body_hash=None):
+        """
+        The embedded quotes list (memoized by body_hash), or None if the page has no payload.
+        Also used BEFORE any JS render: a page with a payload needs no render (the fast path never reads <tbody>)
+        """
+        if not page_text:
+            return None
+        if body_hash is not None and body_hash in self.payload_memo:
+            return self.payload_memo[body_hash]
+        quotes = self.find_json_payload(page_text)
+        if body_hash is not None:
+            if len(self.payload_memo) > 16:
+                self.payload_memo.clear()
+            self.payload_memo[body_hash] = quotes
+        return quotes
+
+#####################################################
+# method #5
+    def cell_text(self, td, using_bs4):
+        """
+        Raw text of 1 table cell. Works with BeautifulSoup & requests-html elements.
+        Mini chart cells return "canvas"
+        """
+        if using_bs4:
+            if td.canvas is not None:
+                return "canvas"
+            return next(td.stripped_strings, "")
+
+        if td.find('canvas', first=True):
+            return "canvas"
+        text = td.text.strip() if td.text else ""
+        if '\n' not in text:
+            return text
+        # multi-line cell (newer Yahoo format) e.g. price / +change / (+pct%)
+        lines = text.split('\n')
+        if all(c.isdigit() or c in '.-,' for c in lines[0].replace(',', '')):
+            return lines[0].strip()
+        if len(lines) > 1 and ('+' in lines[1] or '-' in lines[1]):
+            return lines[1].strip()
+        if len(lines) > 2 and '%' in lines[2]:
+            return lines[2].strip().strip('()')
+        return lines[0].strip()
+
+#####################################################
+# method #6
+    def table_cols(self, tr_rows, using_bs4=True, layout=None):
+        """
+        Single pass over the <tr> rows. Collect the raw cell strings column-wise (no cleaning here)
+        layout: L = large cap table  [sym, name, chart, price, change, pct, vol, avg_vol, mktcap, pe]
+                S = small cap table  [junk, "logo SYM", name, chart, price, (+/-), change, (+/-), pct, vol, avg_vol, mktcap]
+                (the small cap table can carry the +/- sign in a dedicated cell)
+        Returns: dict of column lists. Rows with missing cells are skipped
+        """
+        cmi_debug = __name__+"::"+self.table_cols.__name__+".#"+str(self.yti)
+        layout = self.cap_prefix if layout is None else layout
+        cols = { 'sym': [], 'name': [], 'price': [], 'change': [], 'pct': [], 'mktcap': [] }
+        for datarow in tr_rows:
+            tds = datarow.find_all("td") if using_bs4 else datarow.find("td")
+            try:
+                if layout == "S":
+                    cells = []
+                    for gy, td in enumerate(tds, 1):
+                        if gy == 2 and (td.canvas is None if using_bs4 else not td.find('canvas', first=True)):
+                            cells.append(td.text.split()[-1])           # symbol cell also carries a logo/alt text
+                        else:
+                            cells.append(self.cell_text(td, using_bs4))
+                    c = 4
+                    sym, name, price = cells[1], cells[2], cells[c]
+                    c += 1
+                    if cells[c] in ("+", "-"):                             # dedicated $ change sign cell
+                        c += 1
+                    change = cells[c]
+                    c += 1
+                    if cells[c] in ("+", "-"):                             # dedicated % change sign cell
+                        c += 1
+                    pct = cells[c]
+                    mktcap = cells[c+3]
+                else:
+                    cells = [ self.cell_text(td, using_bs4) for td in tds ]
+                    sym, name, price, change, pct = cells[0], cells[1], cells[3], cells[4], cells[5]
+                    mktcap = cells[8] if len(cells) > 8 else "0"
+            except IndexError:
+                logging.info( f'%s - Not enough cells in row / skipped' % cmi_debug )
+                continue
+            cols['sym'].append(sym)
+            cols['name'].append(name)
+            cols['price'].append(price)
+            cols['change'].append(change)
+            cols['pct'].append(pct)
+            cols['mktcap'].append(mktcap)
+        return cols
+
+#####################################################
+# method #7
+    def build_table_df(self, cols, time_now):
+        """
+        Clean the raw column strings with vectorized pandas string ops & build the DataFrame once.
+        Same output contract as build_json_df() (cols, padding, unsigned changes, M_B codes)
+        """
+        cmi_debug = __name__+"::"+self.build_table_df.__name__+".#"+str(self.yti)
+        logging.info( f'%s - IN / {len(cols["sym"])} rows' % cmi_debug )
+
+        def num(col, strip_rx):
+            s = pd.Series(cols[col], dtype=object).astype(str).str.replace(strip_rx, '', regex=True)
+            return pd.to_numeric(s, errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+        price = num('price', r'[,]')
+        change = num('change', r'[\+\-,]')                      # unsigned
+        pct = num('pct', r'[\(\)\%\+\-,]')                     # unsigned. N/A -> 0.0
+
+        # Market cap e.g. "15.753B" -> 15.753 + scale tag B. No T/B/M scale = bad data -> Z (zillions), 0.0
+        mktcap = pd.Series(cols['mktcap'], dtype=object).astype(str)
+        tag = mktcap.str.extract(r'([TBM])', expand=False).fillna('Z').to_numpy(dtype=str)
+        cap = pd.to_numeric(mktcap.str.replace(r'[TBM,]', '', regex=True), errors='coerce').fillna(0.0).to_numpy(dtype=float)
+        cap = np.where(tag == 'Z', 0.0, cap)
+
+        sym = pd.Series(cols['sym'], dtype=object).astype(str)
+        name = pd.Series(cols['name'], dtype=object).astype(str)
+        df = pd.DataFrame({
+                'Row': np.arange(len(sym)),
+                'Symbol': sym.str.replace("'", "", regex=False).str.ljust(6),
+                'Co_name': name.str.replace(r'[\'\"]', '', regex=True).str.ljust(60),
+                'Cur_price': price,
+                'Prc_change': change,
+                'Pct_change': pct,
+                'Mkt_cap': cap,
+                'M_B': np.char.add(self.cap_prefix, tag),
+                'Time': time_now }, columns=self.df_cols)
+
+        logging.info( f'%s - Table DataFrame built: {len(df)} rows' % cmi_debug )
+        return df
+
+#####################################################
+# method #8
+    def table_df(self, tr_rows, time_now, using_bs4=True, layout=None):
+        """
+        SLOW PATH: scrape the screener <tbody> rows & build the DataFrame
+        Returns: DataFrame (possibly empty)
+        """
+        return self.build_table_df(self.table_cols(tr_rows, using_bs4, layout), time_now)
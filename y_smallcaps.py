@@ -1,6 +1,5 @@
 #! python3
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 import re
@@ -9,6 +8,11 @@ import argparse
 import time
 from rich import print
 
+from y_screenerdata import y_screenerdata
+from screen_query import screen_query
+from net_fetcher import get_fetcher
+from html_backend import get_html_backend
+
 
 # logging setup
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +38,7 @@ class smallcap_screen:
     extr_rows = 0         # number or rows extracted by BS4
     yti = 0
     cycle = 0             # class thread loop counter
+    screen = "mkt_cap_usd > 299M and m_b in (SM, SB) order by pct_change desc"     # screener_logic() filter (screen_query expression)
 
     dummy_url = "https://finance.yahoo.com/screener/predefined/day_gainers"
 
@@ -61,7 +66,7 @@ class smallcap_screen:
         return
 
     def init_dummy_session(self):
-        self.dummy_resp0 = requests.get(self.dummy_url, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 )
+        self.dummy_resp0 = get_fetcher().get(self.dummy_url, cache=False, stream=True, headers=self.yahoo_headers, cookies=self.yahoo_headers, timeout=5 )
         hot_cookies = requests.utils.dict_from_cookiejar(self.dummy_resp0.cookies)
         #self.js_session.cookies.update({'A1': self.js_resp0.cookies['A1']} )    # yahoo cookie hack
         return
@@ -84,8 +89,13 @@ class smallcap_screen:
         # use preexisting resposne from  managed req (handled by cookie monster) 
         r = self.ext_req
         logging.info( f"%s - BS4 stream processing..." % cmi_debug )
-        self.soup = BeautifulSoup(r.text, 'html.parser')
+        self.soup = get_html_backend().soup(r.text, "tbody")          # only build the <tbody> zone
         self.tag_tbody = self.soup.find('tbody')
+        if self.tag_tbody is None:
+            # no rendered table. build_df0() can still use the embedded JSON payload
+            logging.info('%s - NO <tbody> table in page' % cmi_debug )
+            self.tr_rows = []
+            return
         self.tr_rows = self.tag_tbody.find_all("tr")
         #self.all_tag_tr = self.soup.find(attrs={"class": "simpTblRow"})
         logging.info('%s Page processed by BS4 engine' % cmi_debug )
@@ -105,154 +115,23 @@ class smallcap_screen:
         logging.info('%s - Create clean NULL DataFrame' % cmi_debug )
         self.dg1_df0 = pd.DataFrame()             # new df, but is NULLed
         x = 0
+        # FAST PATH : Yahoo ships the screener data set as embedded JSON. Use it if its there
+        json_df = y_screenerdata(self.yti, "S").json_df(getattr(self.ext_req, 'text', None), time_now, getattr(self.ext_req, 'body_hash', None))
+        if json_df is not None:
+            self.using_json = True
+            self.dg1_df0 = json_df
+            self.rows_extr = len(json_df)
+            self.rows_tr_rows = len(json_df)
+            logging.info( f'%s - populated new DF0 dataset from embedded JSON: {len(json_df)} rows' % cmi_debug )
+            return len(json_df)
+
+        self.using_json = False         # SLOW PATH : scrape the rendered <tbody> table
         self.rows_extr = int( len(self.tag_tbody.find_all('tr')) )
         self.rows_tr_rows = int( len(self.tr_rows) )
 
-        for datarow in self.tr_rows:
-
-            """
-            # >>>DEBUG<< for whedatarow.stripped_stringsn yahoo.com changes data model...
-            y = 1
-            print ( f"===================== Debug =========================" )
-            #print ( f"Data {y}: {datarow}" )
-            for i in datarow.find_all("td"):
-                print ( f"===================================================" )
-                if i.canvas is not None:
-                    print ( f"Data {y}: Found Canvas, skipping..." )
-                elif y == 2:
-                    sym_split = i.text.split()
-                    print ( f"Data {y}.txt: {sym_split[1]}" )
-                    #print ( f"Data {y}.gs1: {next(i.stripped_strings)}" )
-                else:
-                    print ( f"Data {y}.txt: {i.text}" )
-                    print ( f"Data {y}.gs1: {next(i.stripped_strings)}" )
-                #logging.info( f'%s - Data: {debug_data.strings}' % cmi_debug )
-                y += 1
-            print ( f"===================== Debug =========================" )
-            # >>>DEBUG<< for when yahoo.com changes data model...
-            """
-
-            # Data Extractor Generator
-            def extr_gen():
-                gy = 1 
-                for i in datarow.find_all("td"):
-                    if i.canvas is not None:
-                        yield ( f"canvas" )
-                    elif gy == 2:
-                        sym_split = i.text.split()
-                        yield ( f"{sym_split[-1]}" )
-                    else:
-                        yield ( f"{next(i.stripped_strings)}" )
-                    gy += 1
-
-            ################################ 1 ####################################
-            extr_strs = extr_gen()
-            junk0 = next(extr_strs)              # 0 : junk field (not used)
-            co_sym = next(extr_strs)             # 1 : ticker symbol info / e.g "NWAU"
-            co_name = next(extr_strs)            # 2 : company name / e.g "Consumer Automotive Finance, Inc."
-            mini_chart = next(extr_strs)         # 3 : embeded mini GFX chart
-            price = next(extr_strs)              # 3 : price (Intraday) / e.g "0.0031"
-            logging.info( f"{cmi_debug} : Company Symbol : {co_sym}" )
-            logging.info( f"{cmi_debug} : Company name :   {co_name}" )
-
-            ################################ 2 ####################################
-
-            change_sign = next(extr_strs)        # 4 : test for dedicated column for +/- indicator
-            logging.info( f"{cmi_debug} : {co_sym} : Check $ CHANGE dedicated [+-] field..." )
-            if change_sign == "+" or change_sign == "-":    # 4 : is $ change sign [+/-] a dedciated field
-                change_val = next(extr_strs)     # 4 : Yes, advance iterator to next field (ignore dedciated sign field)
-            else:
-                change_val = change_sign         # 4 : get $ change, but its possibly +/- signed
-                #if (re.search(r'\+', change_val)) or (re.search(r'\-', change_val)) is True:
-                if (re.search(r'\+', change_val)) or (re.search(r'\-', change_val)) is not None:
-                    logging.info( f"{cmi_debug} : $ CHANGE: {change_val} [+-], stripping..." )
-                    change_cl = re.sub(r'[\+\-]', "", change_val)       # remove +/- sign
-                    logging.info( f"{cmi_debug} : $ CHANGE cleaned to: {change_cl}" )
-                else:
-                    logging.info( f"{cmi_debug} : {change_val} : $ CHANGE is NOT signed [+-]" )
-                    change_cl = re.sub(r'[\,]', "", change_val)       # remove
-                    logging.info( f"{cmi_debug} : $ CHANGE: {change_cl}" )
-
-            pct_sign = next(extr_strs)              # 5 : test for dedicated column for +/- indicator
-            logging.info( f"{cmi_debug} : {co_sym} : Check % CHANGE dedicated [+-] field..." )
-            if pct_sign == "+" or pct_sign == "-":  # 5 : is %_change sign [+/-] a dedciated field
-                pct_val = next(extr_strs)           # 5 : advance iterator to next field (ignore dedciated sign field)
-            else:
-                pct_val = pct_sign                  # 5 get % change, but its possibly +/- signed
-                if (re.search(r'\+', pct_val)) or (re.search(r'\-', pct_val)) is not None:
-                    logging.info( f"{cmi_debug} : % CHANGE {pct_val} [+-], stripping..." )
-                    pct_cl = re.sub(r'[\+\-\%]', "", pct_val)       # remove +/-/% signs
-                    logging.info( f"{cmi_debug} : % CHANGE cleaned to: {pct_cl}" )
-                else:
-                    logging.info( f"{cmi_debug} : {pct_val} : % CHANGE is NOT signed [+-]" )
-                    change_cl = re.sub(r'[\,\%]', "", pct_val)       # remove
-                    logging.info( f"{cmi_debug} : % CHANGE: {pct_val}" )
- 
-            ################################ 3 ####################################
-            vol = next(extr_strs)            # 6 : volume with scale indicator/ e.g "70.250k"
-            avg_vol = next(extr_strs)        # 7 : Avg. vol over 3 months) / e.g "61,447"
-            mktcap = next(extr_strs)         # 8 : Market cap with scale indicator / e.g "15.753B"
-            ############################### 4 ####################################
-            # now wrangle the data...
-            co_sym_lj = f"{co_sym:<6}"                                   # left justify TXT in DF & convert to raw string
-            co_name_lj = np.array2string(np.char.ljust(co_name, 60) )    # left justify TXT in DF & convert to raw string
-            co_name_lj = (re.sub(r'[\'\"]', '', co_name_lj) )             # remove " ' and strip leading/trailing spaces     
-            price_cl = (re.sub(r'\,', '', price))                         # remove ,
-            price_clean = float(price_cl)
-            change_clean = float(change_val)
-
-            if pct_val == "N/A":
-                pct_val = float(0.0)                               # Bad data. FOund a filed with N/A instead of read num
-            else:
-                pct_cl = re.sub(r'[\%\+\-,]', "", pct_val )
-                pct_clean = float(pct_cl)
-
-            ################################ 5 ####################################
-            mktcap = (re.sub(r'[N\/A]', '0', mktcap))               # handle N/A
-            TRILLIONS = re.search('T', mktcap)
-            BILLIONS = re.search('B', mktcap)
-            MILLIONS = re.search('M', mktcap)
-
-            if TRILLIONS:
-                mktcap_clean = float(re.sub('T', '', mktcap))
-                mb = "ST"
-                logging.info( f'%s : #{x} : {co_sym_lj} Mkt Cap: TRILLIONS : T' % cmi_debug )
-
-            if BILLIONS:
-                mktcap_clean = float(re.sub('B', '', mktcap))
-                mb = "SB"
-                logging.info( f'%s : #{x} : {co_sym_lj} Mkt cap: BILLIONS : B' % cmi_debug )
-
-            if MILLIONS:
-                mktcap_clean = float(re.sub('M', '', mktcap))
-                mb = "SM"
-                logging.info( f'%s : #{x} : {co_sym_lj} Mkt cap: MILLIONS : M' % cmi_debug )
-
-            if not TRILLIONS and not BILLIONS and not MILLIONS:
-                mktcap_clean = 0    # error condition - possible bad data
-                mb = "SZ"           # Zillions
-                logging.info( f'%s : #{x} : {co_sym_lj} bad mktcap data N/A : Z' % cmi_debug )
-                # handle bad data in mktcap html page field
- 
-            ################################ 6 ####################################
-            # now construct our list for concatinating to the dataframe 
-            logging.info( f"%s ============= Data prepared for DF =============" % cmi_debug )
-
-            self.list_data = [[ \
-                       x, \
-                       re.sub(r'\'', '', co_sym_lj), \
-                       co_name_lj, \
-                       price_clean, \
-                       change_clean, \
-                       pct_clean, \
-                       mktcap_clean, \
-                       mb, \
-                       time_now ]]
-            
-            ################################ 6 ####################################
-            self.df_1_row = pd.DataFrame(self.list_data, columns=[ 'Row', 'Symbol', 'Co_name', 'Cur_price', 'Prc_change', 'Pct_change', 'Mkt_cap', 'M_B', 'Time' ], index=[x] )
-            self.dg1_df0 = pd.concat([self.dg1_df0, self.df_1_row])
-            x+=1
+        # 1 pass collects raw cells column-wise, then vectorized clean-up & 1 DataFrame build (no per-row concat)
+        self.dg1_df0 = y_screenerdata(self.yti, "S").table_df(self.tr_rows, time_now, True)
+        x = len(self.dg1_df0)
 
         logging.info('%s - populated new DF0 dataset' % cmi_debug )
         return x        # number of rows inserted into DataFrame (0 = some kind of #FAIL)
@@ -326,22 +205,17 @@ class smallcap_screen:
 #####################################################
 # method #8
     def screener_logic(self):
-        """Exectract a list of small cap **GAINERS ONLY** logic"""
-        """ 1. Sort by Cur_price """
-        """ 2. exclude any company with Market Cap > $299M """
-        """ 3. manage company's with Market cap in BILLION's (requires special handeling) """
-        """ 3. exclude any comany with %gain less than 5% """
-        """ 4. SMALL CAP stocks only - Excludes Medium. Large, Mega cap companies!!"""
+        """Exectract a list of small cap **GAINERS ONLY** logic (the screen class attribute)"""
+        """ 1. keep companies with Market Cap > $299M (mkt_cap_usd is normalized to USD, so MILLION's & BILLION's compare directly) """
+        """ 2. SMALL CAP scale tags only (SM, SB) - Excludes Trillion & Zero/unknown cap companies!! """
+        """ 3. sort by %gain, biggest gainer 1st """
 
         cmi_debug = __name__+"::"+self.screener_logic.__name__+".#"+str(self.yti)
         logging.info('%s - IN' % cmi_debug )
         pd.set_option('display.max_rows', None)
         pd.set_option('max_colwidth', 30)
 
-        self.dg1_df1 = self.dg1_df0[self.dg1_df0.Mkt_cap > 299 ]       # limit to greater than $299M
-        self.dg1_df1 =  pd.concat( [ self.dg1_df1, self.dg1_df0[self.dg1_df0.M_B == "SB"] ] )  # now capture all BILLIONS
-        self.dg1_df1 = self.dg1_df1.sort_values(by=['Pct_change'], ascending=False )
-        self.dg1_df1.reset_index(inplace=True, drop=True)    # reset index each time so its guaranteed sequential
+        self.dg1_df1 = screen_query(self.yti, self.screen).run(self.dg1_df0)     # sorted, index reset (guaranteed sequential)
 
         # save some key stats items
         rx = {}
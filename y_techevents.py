@@ -1,11 +1,14 @@
 #! python3
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import logging
 import argparse
 import time
 
+from net_fetcher import get_fetcher
+from row_buffer import row_buffer
+from html_backend import get_html_backend
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 
@@ -40,7 +43,8 @@ class y_techevents:
     def __init__(self, yti):
         cmi_debug = __name__+"::"+self.__init__.__name__
         logging.info( f"{cmi_debug} - Instantiate.#{yti}" )
-        self.te_df0 = pd.DataFrame(columns=[ 'Symbol', 'Today', 'Short', 'Mid', 'Long', 'Bullcount', 'Senti', 'Time' ] )  # init empty DF with preset columns
+        self.te_rows = row_buffer(yti, [ 'Symbol', 'Today', 'Short', 'Mid', 'Long', 'Bullcount', 'Senti', 'Time' ] )   # 1 row per symbol
+        self.te_df0 = self.te_rows.to_df()          # init empty DF with preset columns
         self.yti = yti
         return
 
@@ -86,10 +90,10 @@ class y_techevents:
         """
         cmi_debug = __name__+"::"+self.get_te_zones.__name__+".#"+str(self.yti)+"."+str(me)
         logging.info( f"{cmi_debug} - IN : {self.te_all_url}" )
-        with requests.get( self.te_all_url, stream=True, timeout=5 ) as self.te_resp0:
+        with get_fetcher().get( self.te_all_url, stream=True, timeout=5 ) as self.te_resp0:
             logging.info( f"{cmi_debug} - get() data / storing..." )
-            self.soup = BeautifulSoup(self.te_resp0.text, 'html.parser')
-            logging.info( f"{cmi_debug} - Zone #1 / [Entire page] {len(self.soup)} lines extracted / Done" )
+            self.soup = get_html_backend().soup(self.te_resp0.text, "ul")      # only build the <ul> zones
+            logging.info( f"{cmi_debug} - Zone #1 / [ul zones] {len(self.soup)} lines extracted / Done" )
 
         logging.info( f"{cmi_debug} - Zone #2 / search [ul zones]..." )
         #self.te_zone = self.soup.find_all(attrs={"id": "dropdown-menu"} )
@@ -294,6 +298,7 @@ class y_techevents:
                 print ( f" / ", end="", flush=True )
             self.te_sentiment.clear()
 
+        self.reset_te_df0()                                 # build te_df0 once, from all the buffered rows
         return
 
 ###########################################################################
@@ -345,7 +350,7 @@ class y_techevents:
         # craft final data structure.
         # NOTE: globally accessible and used by quote DF and quote DICT
         logging.info( f"{cmi_debug} - Build Dataframe dataset: {self.symbol}" )        # so we can access it natively if needed, without using pandas
-        data0 = [[ \
+        data0 = [ \
            self.symbol, \
            self.te_sentiment[0][2], \
            self.te_sentiment[1][2], \
@@ -353,14 +358,10 @@ class y_techevents:
            self.te_sentiment[3][2], \
            self.te_sentiment[4], \
            self.te_sentiment[5], \
-           time_now ]]
-        # self.te_df0.drop(self.te_df0.index, inplace=True)        # ensure the DF is empty
-        logging.info( f"{cmi_debug} - Populate DF with Tech Events emphemerial dict data" )
-
-        self.df_1_row = pd.DataFrame(data0, columns=[ 'Symbol', 'Today', 'Short', 'Mid', 'Long', 'Bullcount', 'Senti', 'Time' ] )
-        self.te_df0 = pd.concat([self.te_df0, self.df_1_row])
-        #self.te_df0 = self.te_df0.append(te_temp_df0, ignore_index=True)
-        logging.info( f"{cmi_debug} - Tech Event DF created" )
+           time_now ]
+        logging.info( f"{cmi_debug} - Populate row buffer with Tech Events emphemerial dict data" )
+        self.te_rows.append(data0)                  # te_df0 is built once by reset_te_df0()
+        logging.info( f"{cmi_debug} - Tech Event row added" )
 
         return
 
@@ -368,11 +369,11 @@ class y_techevents:
 # method #7
     def reset_te_df0(self):
         """
-        Reset DataFrame index to be sequential, sarting from 0
+        Build te_df0 from the row buffer. Index is sequential, sarting from 0
         """
         cmi_debug = __name__+"::"+self.reset_te_df0.__name__+".#"+str(self.yti)
         logging.info( f"{cmi_debug} - CALLED" )
-        self.te_df0.reset_index(inplace=True, drop=True)
+        self.te_df0 = self.te_rows.to_df()
         logging.info( f"{cmi_debug} - completed" )
         return
 